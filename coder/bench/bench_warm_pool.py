@@ -0,0 +1,127 @@
+# bench/bench_warm_pool.py
+"""
+run_python 짧은 실행 latency: cold(매번 새 interpreter) vs warm(utils.warm_pool, preload 후 fork)
+p50 / p99 / mean (ms), warm worker 시작 비용은 따로
+
+    python bench/bench_warm_pool.py
+    python bench/bench_warm_pool.py --python /workspace/repo/venv/bin/python --preload torch --repeat 30
+    python bench/bench_warm_pool.py --code "import torch; print(torch.ones(3).sum())" --preload torch --out warm.json
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.warm_pool import WarmPool  # noqa: E402
+
+DEFAULT_PRELOAD = ["asyncio", "json", "email.mime.multipart", "http.client", "unittest", "decimal"]
+
+
+def percentile(values: list[float], p: float) -> float:
+    """nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(latency: list[float]) -> dict:
+    return {
+        "samples": len(latency),
+        "p50_ms": round(percentile(latency, 50), 1),
+        "p99_ms": round(percentile(latency, 99), 1),
+        "mean_ms": round(statistics.mean(latency), 1),
+    }
+
+
+def bench_cold(python: str, code: str, repeat: int) -> list[float]:
+    """기존 run_python: temp 파일 + subprocess.run"""
+    latency = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fd, tmp = tempfile.mkstemp(suffix=".py")
+        os.close(fd)
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(code)
+            res = subprocess.run([python, tmp], capture_output=True, text=True)
+        finally:
+            os.remove(tmp)
+        if res.returncode != 0:
+            raise SystemExit(f"cold run failed: {res.stderr}")
+        latency.append((time.perf_counter() - t0) * 1000)
+    return latency
+
+
+def bench_warm(pool: WarmPool, code: str, repeat: int) -> list[float]:
+    """run_python warm 경로: temp 파일 + pool.run(path=...)"""
+    latency = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fd, tmp = tempfile.mkstemp(suffix=".py")
+        os.close(fd)
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(code)
+            res = pool.run(path=tmp, cwd=os.getcwd())
+        finally:
+            os.remove(tmp)
+        if res["returncode"] != 0:
+            raise SystemExit(f"warm run failed: {res['stderr']}")
+        latency.append((time.perf_counter() - t0) * 1000)
+    return latency
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--python", default=sys.executable)
+    ap.add_argument("--preload", nargs="*", default=DEFAULT_PRELOAD)
+    ap.add_argument("--code", default=None, help="기본: preload 모듈 import 후 print")
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--max-jobs", type=int, default=1000, help="warm worker 교체 주기 (job 수)")
+    ap.add_argument("--out", default=None, help="JSON 저장 경로")
+    args = ap.parse_args()
+
+    code = args.code or "".join(f"import {m}\n" for m in args.preload) + "print('ok')\n"
+
+    t0 = time.perf_counter()
+    pool = WarmPool(args.python, args.preload, size=1, max_jobs=args.max_jobs)
+    bench_warm(pool, "pass\n", 1)   # worker 시작 (preload import) 까지 기다림
+    start_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+    results = {
+        "cold": summarize(bench_cold(args.python, code, args.repeat)),
+        "warm": summarize(bench_warm(pool, code, args.repeat)),
+    }
+    report = {
+        "meta": {
+            "python": args.python,
+            "preload": args.preload,
+            "repeat": args.repeat,
+            "warm_start_ms": start_ms,
+            "recycles": pool.info()["recycles"],
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    print(f"python={args.python} preload={args.preload} repeat={args.repeat} warm_start_ms={start_ms}")
+    print(f"{'mode':>6} {'p50_ms':>10} {'p99_ms':>10} {'mean_ms':>10}")
+    for mode, r in results.items():
+        print(f"{mode:>6} {r['p50_ms']:>10} {r['p99_ms']:>10} {r['mean_ms']:>10}")
+    print(f"speedup p50 x{results['cold']['p50_ms'] / max(results['warm']['p50_ms'], 0.1):.1f}, "
+          f"p99 x{results['cold']['p99_ms'] / max(results['warm']['p99_ms'], 0.1):.1f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
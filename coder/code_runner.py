@@ -2,6 +2,8 @@
 import json
 import logging
 import os
+import inspect
+import itertools
 import sys
 import tempfile
 import threading
@@ -11,18 +13,43 @@ from typing import Any, Dict, Tuple
 from utils.common_metadata import CommonMetadata
 from utils.coder_socket import CoderClient
 from utils.handler_registry import register, registry
+from utils.action_executor import ActionExecutor
+from utils.process_stream import run_streaming
+from utils.warm_pool import pool_stats, run_warm, use_warm
 from utils.file_manager import FileManager
 from utils.web_manager import WebManager
 
 logger = logging.getLogger(__name__)
 
+def _timed_call(handler, kwargs: Dict[str, Any]) -> Tuple[Any, str, int]:
+    """handler 실행 + 시작 시각/소요 시간 측정 (process pool에서도 pickle 가능하도록 모듈 함수)"""
+    t0 = time.perf_counter()
+    started_at = datetime.now(timezone.utc).isoformat()
+    result = handler(**kwargs)
+    return result, started_at, int((time.perf_counter() - t0) * 1000)
+
+
 class CodeRunner:
-    def __init__(self, host: str, port: int, python_executable: str | None = None, timeout: int = 60):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        python_executable: str | None = None,
+        timeout: int = 60,
+        pools: Dict[str, Dict[str, Any]] | None = None,
+        action_pools: Dict[str, str] | None = None,
+        concurrent: bool = False,
+    ):
+        """
+        concurrent=True → action을 worker pool에서 실행 (수신 스레드를 막지 않음)
+        pools/action_pools → utils.action_executor 의 DEFAULT_POOLS / DEFAULT_ACTION_POOLS 형식
+        """
         self.python = python_executable or sys.executable
         self.timeout = timeout
+        self.executor = ActionExecutor(pools, action_pools) if concurrent else None
 
         self.file_manager = FileManager(root="/workspace/")
-        self.web_manager = WebManager()
+        self.web_manager = WebManager(root="/workspace/")
         self.client = CoderClient(host, port)
         self.client.on_message_callback = self._on_message
 
@@ -33,9 +60,15 @@ class CodeRunner:
                 if hasattr(provider, func.__name__):
                     self.action_map[name] = getattr(provider, func.__name__)
                     break
+        self.client.capabilities = sorted(self.action_map)
 
     @register("run_python")
-    def run_python(self, code: str, timeout: int | None = None) -> dict:
+    def run_python(self, code: str, timeout: int | None = None, stream: bool = False, emit=None,
+                   warm: bool | None = None, preload: list | None = None) -> dict:
+        """
+        warm=True (또는 WARM_POOL=1) → preload 모듈을 import 해 둔 warm worker에서 fork 한 child로 실행
+        (utils/warm_pool.py, worker를 못 띄우면 기존처럼 새 interpreter)
+        """
         if not code:
             return {"stdout": None, "stderr": "code is empty"}
         tmp = None
@@ -46,6 +79,20 @@ class CodeRunner:
             with open(tmp, "w", encoding="utf-8") as f:
                 f.write(code)
             import subprocess
+            res = None
+            if use_warm(warm):
+                # cold 실행과 같은 조건: temp 파일을 script로 (__file__, sys.path[0]), coder의 cwd
+                res = run_warm(self.python, preload, emit=emit if stream else None,
+                               path=tmp, cwd=os.getcwd(), timeout=to)
+            if res is None and stream and emit:
+                res = run_streaming([self.python, tmp], timeout=to,
+                                    on_output=lambda name, text: emit({"data": text}, stream=name))
+            if res is not None:
+                if res["timed_out"]:
+                    return {"stdout": None, "stderr": "Execution timed out"}
+                if res["returncode"] != 0:
+                    return {"stdout": res["stdout"], "stderr": res["stderr"] or f"returncode={res['returncode']}"}
+                return {"stdout": res["stdout"], "stderr": None}
             result = subprocess.run([self.python, tmp], capture_output=True, text=True, timeout=to)
             if result.returncode != 0:
                 return {"stdout": result.stdout, "stderr": result.stderr or f"returncode={result.returncode}"}
@@ -62,6 +109,10 @@ class CodeRunner:
                     pass
 
 
+    @register("warm_pool_stats")
+    def warm_pool_stats(self) -> dict:
+        return {"stdout": pool_stats(), "stderr": None}
+
     @staticmethod
     def _normalize_incoming(message: dict):
         if not isinstance(message, dict):
@@ -103,41 +154,101 @@ class CodeRunner:
             **kwargs
         }
         if stdout is not None:
-            return {"command": command, "action": action, "result": "success", "metadata": metadata}
+            return {"command": command, "action": action, "result": "success", "metadata": metadata, **reply_meta}
         elif stdout is None and stderr is not None:
-            return {"command": command, "action": action, "result": "fail", "metadata": metadata}
-        
-        
+            return {"command": command, "action": action, "result": "fail", "metadata": metadata, **reply_meta}
+
+    @staticmethod
+    def _to_handler_result(result: Any) -> Dict[str, Any]:
+        if not isinstance(result, dict) or ("stdout" not in result and "stderr" not in result):
+            return {"stdout": result, "stderr": None}
+        return result
+
+    def _reply(self, command, action, kwargs, reply_meta, handler_result, started_at: str, duration_ms: int):
+        finished_at = datetime.now(timezone.utc).isoformat()
+        payload = self._wrap_payload(command, action, kwargs, reply_meta, handler_result, started_at, finished_at, duration_ms)
+        print(payload)
+        self.client.send_message(payload)
+
+    def _make_emit(self, command, action, reply_meta):
+        """
+        handler가 실행 중에 부분 결과 프레임을 보낼 때 쓰는 콜백.
+        emit(metadata, result="stream", **fields) → {"command", "action", "result", "seq", **fields, "metadata", task_id...}
+        """
+        seq = itertools.count()
+        lock = threading.Lock()
+
+        def emit(metadata: Dict[str, Any], result: str = "stream", **fields):
+            with lock:
+                n = next(seq)
+            self.client.send_message({
+                "command": command, "action": action, "result": result, "seq": n,
+                **fields, "metadata": metadata, **reply_meta,
+            })
+
+        return emit
+
+    def _call_kwargs(self, handler, command, action, kwargs, reply_meta) -> Dict[str, Any]:
+        """handler가 emit 인자를 받으면 부분 결과 콜백 추가 (process pool에서는 전달 불가)"""
+        if "emit" not in inspect.signature(handler).parameters:
+            return kwargs
+        if self.executor is not None and self.executor.is_process(action):
+            return kwargs
+        return {**kwargs, "emit": self._make_emit(command, action, reply_meta)}
+
+    def _cancel_task(self, message: dict):
+        """supervisor의 cancel_task 제어 메시지: 아직 시작 안 한 task 취소 (별도 응답 없음, 취소된 task가 "Cancelled"로 응답)"""
+        task_id = (message.get("metadata") or {}).get("task_id")
+        cancelled = bool(task_id and self.executor is not None and self.executor.cancel(task_id))
+        print(f"[CodeRunner] cancel_task {task_id}: {'cancelled' if cancelled else 'already running or done'}")
+
     def _on_message(self, message: dict):
+        if isinstance(message, dict) and message.get("action") == "cancel_task":
+            self._cancel_task(message)
+            return
         command, action, kwargs, reply_meta = self._normalize_incoming(message)
 
-        t0 = time.perf_counter()
         started_at = datetime.now(timezone.utc).isoformat()
-        if not action:
-            handler_result = {"stdout": None, "stderr": "Missing action"}
-        else:
-            handler = self.action_map.get(action)
-            if not handler:
-                handler_result = {"stdout": None, "stderr": f"Unknown action: {action}"}
-            else:
-                try:
-                    result = handler(**kwargs)
-                    if not isinstance(result, dict) or ("stdout" not in result and "stderr" not in result):
-                        handler_result = {"stdout": result, "stderr": None}
-                    else:
-                        handler_result = result
-                except TypeError as e:
-                    handler_result = {"stdout": None, "stderr": f"Bad kwargs for action '{action}': {e}"}
-                except Exception as e:
-                    logger.exception("handler raised")
-                    handler_result = {"stdout": None, "stderr": str(e)}
-
-        duration_ms = int((time.perf_counter() - t0) * 1000)
-        finished_at = datetime.now(timezone.utc).isoformat()
+        handler = self.action_map.get(action) if action else None
+        if not handler:
+            err = "Missing action" if not action else f"Unknown action: {action}"
+            self._reply(command, action, kwargs, reply_meta, {"stdout": None, "stderr": err}, started_at, 0)
+            return
 
-        payload = self._wrap_payload(command,action, kwargs, reply_meta, handler_result, started_at, finished_at, duration_ms)
-        print(payload)
-        self.client.send_message(payload)
+        call_kwargs = self._call_kwargs(handler, command, action, kwargs, reply_meta)
+        if self.executor is None:
+            # inline 모드: 수신 스레드에서 바로 실행
+            try:
+                result, started_at, duration_ms = _timed_call(handler, call_kwargs)
+                handler_result = self._to_handler_result(result)
+            except Exception as e:
+                handler_result, duration_ms = self._error_result(action, e), 0
+            self._reply(command, action, kwargs, reply_meta, handler_result, started_at, duration_ms)
+            return
+
+        # pool 모드: 결과는 완료 순서대로 (task_id/request_id 로 매칭)
+        task_key = reply_meta.get("task_id") or reply_meta.get("request_id") or reply_meta.get("id")
+        future = self.executor.submit(action, _timed_call, handler, call_kwargs, task_key=task_key)
+
+        def _done(f):
+            if f.cancelled():
+                self._reply(command, action, kwargs, reply_meta, {"stdout": None, "stderr": "Cancelled"}, started_at, 0)
+                return
+            try:
+                result, t_started, duration_ms = f.result()
+                handler_result = self._to_handler_result(result)
+            except Exception as e:
+                handler_result, t_started, duration_ms = self._error_result(action, e), started_at, 0
+            self._reply(command, action, kwargs, reply_meta, handler_result, t_started, duration_ms)
+
+        future.add_done_callback(_done)
+
+    @staticmethod
+    def _error_result(action: str, e: Exception) -> Dict[str, Any]:
+        if isinstance(e, TypeError):
+            return {"stdout": None, "stderr": f"Bad kwargs for action '{action}': {e}"}
+        logger.error("handler raised", exc_info=e)
+        return {"stdout": None, "stderr": str(e)}
 
     def run(self):
         logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(name)s: %(message)s")
@@ -146,7 +257,7 @@ class CodeRunner:
         t.join()
 
 if __name__ == "__main__":
-    runner = CodeRunner(host="172.17.0.1", port=9002)
+    runner = CodeRunner(host="172.17.0.1", port=9002, concurrent=True)
     runner.run()
 
 
@@ -0,0 +1,87 @@
+# utils/action_executor.py
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# pool 이름 → {"kind": "thread" | "process", "max_workers": int}
+DEFAULT_POOLS: Dict[str, Dict[str, Any]] = {
+    "default": {"kind": "thread", "max_workers": 8},   # git/file 같은 가벼운 작업
+    "heavy": {"kind": "thread", "max_workers": 1},     # 학습/설치 같은 긴 작업
+}
+
+# action → pool 이름 (없으면 "default")
+DEFAULT_ACTION_POOLS: Dict[str, str] = {
+    "run_in_venv": "heavy",
+    "run_python": "heavy",
+    "create_venv": "heavy",
+    "pip_install": "heavy",
+    "prewarm_wheelhouse": "heavy",
+    "apt_install": "heavy",
+}
+
+
+class ActionExecutor:
+    """
+    action 별 worker pool 실행기.
+
+    pool마다 max_workers가 곧 그 pool에 묶인 action들의 동시 실행 한도가 된다.
+    (예: heavy=1 → run_in_venv는 한 번에 하나, default=8 → git/file 작업은 8개까지)
+    process pool에는 pickle 가능한 provider(FileManager, WebManager)의 action만 넣어야 한다.
+    """
+
+    def __init__(self, pools: Dict[str, Dict[str, Any]] | None = None, action_pools: Dict[str, str] | None = None):
+        self.pools_config = pools or DEFAULT_POOLS
+        self.action_pools = dict(DEFAULT_ACTION_POOLS if action_pools is None else action_pools)
+        self._executors: Dict[str, Any] = {}
+        for name, cfg in self.pools_config.items():
+            kind = cfg.get("kind", "thread")
+            workers = int(cfg.get("max_workers", 1))
+            if kind == "process":
+                self._executors[name] = ProcessPoolExecutor(max_workers=workers)
+            elif kind == "thread":
+                self._executors[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"action-{name}")
+            else:
+                raise ValueError(f"Unknown pool kind: {kind}")
+        if "default" not in self._executors:
+            raise ValueError("pools must define a 'default' pool")
+
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def pool_for(self, action: str | None) -> str:
+        name = self.action_pools.get(action or "", "default")
+        return name if name in self._executors else "default"
+
+    def is_process(self, action: str | None) -> bool:
+        return isinstance(self._executors[self.pool_for(action)], ProcessPoolExecutor)
+
+    def submit(self, action: str | None, fn: Callable, *args, task_key: str | None = None, **kwargs) -> Future:
+        """fn을 action에 해당하는 pool에서 실행하고 Future 반환"""
+        future = self._executors[self.pool_for(action)].submit(fn, *args, **kwargs)
+        if task_key:
+            with self._lock:
+                self._inflight[task_key] = future
+            future.add_done_callback(lambda _f, k=task_key: self._forget(k))
+        return future
+
+    def cancel(self, task_key: str) -> bool:
+        """아직 시작되지 않은 작업 취소. 이미 실행 중이면 False"""
+        with self._lock:
+            future = self._inflight.get(task_key)
+        return bool(future and future.cancel())
+
+    def _forget(self, task_key: str):
+        with self._lock:
+            self._inflight.pop(task_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {"pools": {k: v.get("max_workers") for k, v in self.pools_config.items()}, "inflight": inflight}
+
+    def shutdown(self, wait: bool = True):
+        for ex in self._executors.values():
+            ex.shutdown(wait=wait, cancel_futures=not wait)
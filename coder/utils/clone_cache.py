@@ -0,0 +1,174 @@
+# utils/clone_cache.py
+import hashlib
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .file_lock import PathLock
+
+MIRROR_DIR = ".git-mirrors"     # workspace root 아래, repo마다 bare mirror 하나
+GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}   # 인증 프롬프트로 멈추지 않게
+
+_RECEIVING = re.compile(r"Receiving objects:\s+100% \((\d+)/\d+\)(?:,\s+([\d.]+)\s+(bytes|KiB|MiB|GiB))?")
+_UNITS = {"bytes": 1, "KiB": 1 << 10, "MiB": 1 << 20, "GiB": 1 << 30}
+
+
+def received(stderr: str) -> Dict[str, int]:
+    """
+    git --progress 출력에서 받은 object 수 / 크기 (작은 전송은 크기가 안 찍혀서 0)
+    100% 줄은 진행 표시와 ", done." 으로 두 번 찍히므로 최댓값 사용 (git 명령 하나 = 전송 한 번)
+    """
+    objects, size = 0, 0
+    for m in _RECEIVING.finditer(stderr or ""):
+        objects = max(objects, int(m.group(1)))
+        if m.group(2):
+            size = max(size, int(float(m.group(2)) * _UNITS[m.group(3)]))
+    return {"objects": objects, "bytes": size}
+
+
+def git(*args: str, cwd: str | Path | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=str(cwd) if cwd else None, capture_output=True, text=True, env=GIT_ENV)
+
+
+class GitError(Exception):
+    pass
+
+
+class CloneCache:
+    """
+    git_url 별 bare mirror 캐시.
+    - 처음: git clone --mirror (network)
+    - 이후: mirror를 --reference 로 쓰고 --dissociate (없는 object만 network) 또는
+            depth/filter 가 있으면 mirror를 fetch로 갱신한 뒤 file://mirror 에서 clone
+    - depth/filter 인데 mirror가 없으면: git_url 에서 바로 shallow/partial clone, mirror는 백그라운드에서 생성
+      (mirror를 먼저 만들면 전체 history를 받느라 depth/filter 가 의미 없어짐)
+    """
+
+    def __init__(self, workspace: str | Path):
+        self.root = Path(workspace) / MIRROR_DIR
+
+    def mirror_path(self, git_url: str) -> Path:
+        name = git_url.rstrip("/").split("/")[-1]
+        if not name.endswith(".git"):
+            name += ".git"
+        digest = hashlib.sha1(git_url.rstrip("/").encode("utf-8")).hexdigest()[:12]
+        return self.root / f"{digest}-{name}"
+
+    def ensure(self, git_url: str, refresh: bool = True) -> Dict[str, Any]:
+        """mirror 준비 (없으면 생성, refresh면 fetch) → {"mirror", "created", "refreshed", "network": {...}}"""
+        mirror = self.mirror_path(git_url)
+        with PathLock(mirror):
+            if not (mirror / "HEAD").exists():
+                self.root.mkdir(parents=True, exist_ok=True)
+                res = git("clone", "--mirror", "--progress", git_url, str(mirror))
+                if res.returncode != 0:
+                    raise GitError(res.stderr.strip() or f"git clone --mirror returncode={res.returncode}")
+                return {"mirror": str(mirror), "created": True, "refreshed": False, "network": received(res.stderr)}
+            if not refresh:
+                return {"mirror": str(mirror), "created": False, "refreshed": False, "network": received("")}
+            res = git("fetch", "--prune", "--progress", "origin", cwd=mirror)
+            if res.returncode != 0:
+                raise GitError(res.stderr.strip() or f"git fetch returncode={res.returncode}")
+            return {"mirror": str(mirror), "created": False, "refreshed": True, "network": received(res.stderr)}
+
+    def refresh_async(self, git_url: str) -> threading.Thread:
+        """clone 뒤에 mirror를 백그라운드에서 갱신 (다음 clone이 더 많이 cache에서 오도록)"""
+        def _run():
+            try:
+                self.ensure(git_url, refresh=True)
+            except GitError:
+                pass
+        t = threading.Thread(target=_run, name="MirrorRefresh", daemon=True)
+        t.start()
+        return t
+
+    def refresh_all(self, git_urls: List[str] | None = None, max_workers: int = 4) -> Dict[str, Any]:
+        """mirror 여러 개를 동시에 fetch (git_urls 없으면 캐시에 있는 전부)"""
+        if git_urls is None:
+            git_urls = []
+            if self.root.exists():
+                for mirror in sorted(self.root.glob("*.git")):
+                    res = git("config", "--get", "remote.origin.url", cwd=mirror)
+                    if res.returncode == 0 and res.stdout.strip():
+                        git_urls.append(res.stdout.strip())
+
+        def _one(url: str) -> Dict[str, Any]:
+            t0 = time.perf_counter()
+            try:
+                out = self.ensure(url, refresh=True)
+            except GitError as e:
+                out = {"error": str(e)}
+            out["elapsed_ms"] = int((time.perf_counter() - t0) * 1000)
+            return out
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="mirror-fetch") as pool:
+            return dict(zip(git_urls, pool.map(_one, git_urls)))
+
+    def clone(self, git_url: str, dest: Path, depth: int | None = None, filter: str | None = None) -> Dict[str, Any]:
+        """mirror를 거쳐 dest에 clone → {"source", "mirror", "network": {...}, "cache_objects"}"""
+        shallow = bool(depth) or bool(filter)
+        if shallow and not (self.mirror_path(git_url) / "HEAD").exists():
+            return self._clone_direct(git_url, dest, depth, filter)
+        mirror_info = self.ensure(git_url, refresh=shallow)
+        mirror = mirror_info["mirror"]
+        network = dict(mirror_info["network"])
+
+        if shallow:
+            # depth/filter 는 local 경로 clone에선 무시됨 → file:// 로
+            args = ["clone", "--progress", "--no-local"]
+            if depth:
+                args += ["--depth", str(depth)]
+            if filter:
+                args += ["--filter", filter]
+            res = git(*args, Path(mirror).resolve().as_uri(), str(dest))
+            if res.returncode != 0:
+                raise GitError(res.stderr.strip() or f"git clone returncode={res.returncode}")
+            git("remote", "set-url", "origin", git_url, cwd=dest)
+            from_cache = received(res.stderr)["objects"]
+        else:
+            res = git("clone", "--progress", "--reference", mirror, "--dissociate", git_url, str(dest))
+            if res.returncode != 0:
+                raise GitError(res.stderr.strip() or f"git clone returncode={res.returncode}")
+            got = received(res.stderr)
+            network = {k: network[k] + got[k] for k in network}
+            from_cache = max(0, self._object_count(dest) - got["objects"])
+            if not mirror_info["created"]:
+                self.refresh_async(git_url)
+
+        return {
+            "source": "cache" if network["objects"] == 0 else ("network" if mirror_info["created"] else "cache+network"),
+            "mirror": mirror,
+            "mirror_created": mirror_info["created"],
+            "network": network,
+            "cache_objects": from_cache,
+        }
+
+    def _clone_direct(self, git_url: str, dest: Path, depth: int | None, filter: str | None) -> Dict[str, Any]:
+        """cold cache 의 shallow/partial clone: network 에서 필요한 만큼만 받고, mirror는 다음 clone을 위해 백그라운드로"""
+        args = ["clone", "--progress"]
+        if depth:
+            args += ["--depth", str(depth)]
+        if filter:
+            args += ["--filter", filter]
+        res = git(*args, git_url, str(dest))
+        if res.returncode != 0:
+            raise GitError(res.stderr.strip() or f"git clone returncode={res.returncode}")
+        self.refresh_async(git_url)
+        return {
+            "source": "network",
+            "mirror": str(self.mirror_path(git_url)),
+            "mirror_created": False,
+            "network": received(res.stderr),
+            "cache_objects": 0,
+        }
+
+    @staticmethod
+    def _object_count(repo: Path) -> int:
+        res = git("count-objects", "-v", cwd=repo)
+        counts = dict(line.split(": ", 1) for line in res.stdout.splitlines() if ": " in line)
+        return int(counts.get("count", 0)) + int(counts.get("in-pack", 0))
@@ -1,19 +1,21 @@
 import socket
-import json
 import threading
-import sys
 import os
 import time
-import queue
-import struct
+from utils.framing import FrameReader, send_frame
+from utils.wire_codec import WireCodec
 
 class CoderClient:
-    def __init__(self, host="172.17.0.3", port=9000):
+    def __init__(self, host="172.17.0.3", port=9000, coder_id: str | None = None):
         self.supervisor_host = host
         self.supervisor_port = port
+        self.coder_id = coder_id or os.environ.get("CODER_ID") or socket.gethostname()   # 기본: 컨테이너 hostname
+        self.capabilities: list[str] = []                   # 지원 action 목록 (hello로 supervisor에 등록)
         self.running = True
         self.sock=None
         self.on_message_callback = None 
+        self._send_lock = threading.Lock()   # worker pool 스레드들이 동시에 결과를 보냄
+        self.codec = WireCodec()
         
     ## 메세지 받기
     def on_message(self, message: str)->None: # callback
@@ -22,31 +24,29 @@ class CoderClient:
     
     ## 결과 전송
     def send_message(self,result ):
-        self.sock.sendall(json.dumps(result).encode())
+        data = self.codec.encode(result)
+        with self._send_lock:
+            send_frame(self.sock, data)
         print("[CoderClient] 결과 전송 완료")
     
     
     def handle_connection(self,):
         """Supervisor와 연결을 유지하며 task를 받고 실행"""
         with self.sock :
+            reader = FrameReader(self.sock)
             while self.running:
                 try:
-                    # 1. Supervisor → Client : task 수신
-                    raw_len = self.sock.recv(4)
-                    if not raw_len:
+                    # 1. Supervisor → Client : task 수신 (length prefix 프레임)
+                    data = reader.read_frame()
+                    if data is None:
                         return None
-                    msg_len = struct.unpack("!I", raw_len)[0]
 
-                    # 2. msg_len만큼 데이터 수신
-                    data = b""
-                    while len(data) < msg_len:
-                        packet = self.sock.recv(msg_len - len(data))
-                        if not packet:
-                            return None
-                        data += packet
-
-                    # 3) JSON 디코딩
-                    message= json.loads(data.decode("utf-8"))
+                    # 2) 디코딩 (legacy JSON / 협상된 코덱 자동 판별)
+                    message= self.codec.decode(data)
+                    if self.codec.is_ack(message):
+                        self.codec.accept(message)
+                        print(f"[CoderClient] codec 협상: {self.codec.codec}/{self.codec.compression}")
+                        continue
                     print("[CoderClient] 받은 task:", message)
                     self.on_message(message)
 
@@ -61,7 +61,10 @@ class CoderClient:
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.sock .connect((self.supervisor_host, self.supervisor_port))
                 print(f"[CoderClient] Supervisor({self.supervisor_host}:{self.supervisor_port}) 연결 성공")
+                self.codec = WireCodec()
+                self.send_message(self.codec.hello(coder_id=self.coder_id, capabilities=self.capabilities))
                 self.handle_connection()
+                print(f"[CoderClient] wire stats: {self.codec.stats.snapshot()}")
 
             except Exception as e:
                 print(f"[CoderClient] 연결 실패, 재시도 중... {e}")
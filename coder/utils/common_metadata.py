@@ -1,5 +1,5 @@
 # utils/common_metadata.py
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel
 
 
@@ -13,12 +13,29 @@ class CommonMetadata(BaseModel):
     dir_path: Optional[str] = None
     git_url: Optional[str] = None
     venv_path: Optional[str] = None
+    repo_path: Optional[str] = None
     venv_name: Optional[str] = None
     requirements: Optional[str] = None
+    requirements_path: Optional[str] = None
     package: Optional[str] = None
     code: Optional[str] = None
     timeout: Optional[int] = None
+    stream: Optional[bool] = None
     target: Optional[List[str]] = None
     message: Optional[str] = None
     user_name: Optional[str] = None
-    user_email: Optional[str] = None
\ No newline at end of file
+    user_email: Optional[str] = None
+    patches: Optional[Dict[str, List[Dict[str, str]]]] = None
+    files: Optional[Dict[str, str]] = None
+    cursor: Optional[str] = None
+    page_bytes: Optional[int] = None
+    max_file_bytes: Optional[int] = None
+    since: Optional[int] = None
+    include_content: Optional[bool] = None
+    depth: Optional[int] = None
+    filter: Optional[str] = None
+    use_cache: Optional[bool] = None
+    git_urls: Optional[List[str]] = None
+    max_workers: Optional[int] = None
+    warm: Optional[bool] = None
+    preload: Optional[List[str]] = None
@@ -0,0 +1,179 @@
+# utils/dist_index.py
+import json
+import os
+import subprocess
+import sys
+import threading
+from email.parser import HeaderParser
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+try:
+    from packaging.markers import default_environment
+    from packaging.requirements import InvalidRequirement, Requirement
+    from packaging.utils import canonicalize_name
+except ImportError:  # 선택 의존성 → pip에 들어 있는 사본
+    from pip._vendor.packaging.markers import default_environment
+    from pip._vendor.packaging.requirements import InvalidRequirement, Requirement
+    from pip._vendor.packaging.utils import canonicalize_name
+
+# site-packages 디렉터리 → (mtime_ns, {name: (version, dist 경로)})
+# 설치/삭제 시 *.dist-info 디렉터리가 생기거나 사라지면서 site-packages mtime이 바뀜 → 다시 읽음
+_index: Dict[str, Tuple[int, Dict[str, Tuple[str, str]]]] = {}
+_index_lock = threading.Lock()
+_envs: Dict[Tuple[str, int], Dict[str, str]] = {}
+
+# packaging.markers.default_environment() 를 대상 interpreter에서 실행
+_ENV_SNIPPET = (
+    "import json,os,platform,sys;"
+    "iv=sys.implementation.version;"
+    "ver=f'{iv.major}.{iv.minor}.{iv.micro}'+(f'{iv.releaselevel[0]}{iv.serial}' if iv.releaselevel!='final' else '');"
+    "print(json.dumps({'implementation_name':sys.implementation.name,'implementation_version':ver,"
+    "'os_name':os.name,'platform_machine':platform.machine(),'platform_release':platform.release(),"
+    "'platform_system':platform.system(),'platform_version':platform.version(),"
+    "'python_full_version':platform.python_version(),'platform_python_implementation':platform.python_implementation(),"
+    "'python_version':'.'.join(platform.python_version_tuple()[:2]),'sys_platform':sys.platform}))"
+)
+
+
+def venv_python(venv: Path) -> Path:
+    return venv / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
+
+
+def site_dirs(venv: Path | None = None) -> List[Path]:
+    """venv의 site-packages (venv 없으면 coder 자신의 sys.path)"""
+    if venv is None:
+        return [Path(p) for p in sys.path if p and os.path.isdir(p)]
+    return sorted(venv.glob("lib/python*/site-packages")) + sorted(venv.glob("Lib/site-packages"))
+
+
+def _read_dir(site: Path) -> Dict[str, Tuple[str, str]]:
+    dists: Dict[str, Tuple[str, str]] = {}
+    with os.scandir(site) as it:
+        for entry in it:
+            if entry.name.endswith(".dist-info"):
+                stem, meta_name = entry.name[: -len(".dist-info")], "METADATA"
+            elif entry.name.endswith(".egg-info"):
+                stem, meta_name = entry.name[: -len(".egg-info")], "PKG-INFO"
+            else:
+                continue
+            # 디렉터리 이름 "name-version" 이면 파일을 열지 않음, 아니면 METADATA의 Name/Version
+            name, _, version = stem.partition("-")
+            if not version or "-" in version:
+                meta_path = Path(entry.path) / meta_name if entry.is_dir() else Path(entry.path)
+                try:
+                    with open(meta_path, "r", encoding="utf-8", errors="ignore") as f:
+                        headers = HeaderParser().parse(f, headersonly=True)
+                except OSError:
+                    continue
+                name, version = headers.get("Name"), headers.get("Version")
+                if not name or not version:
+                    continue
+            dists.setdefault(canonicalize_name(name), (version, entry.path))
+    return dists
+
+
+def installed(venv: Path | None = None) -> Dict[str, Tuple[str, str]]:
+    """설치된 배포판 {canonical name: (version, dist-info 경로)}. 앞쪽 site 디렉터리 우선"""
+    merged: Dict[str, Tuple[str, str]] = {}
+    for site in site_dirs(venv):
+        try:
+            mtime = os.stat(site).st_mtime_ns
+        except OSError:
+            continue
+        key = str(site)
+        with _index_lock:
+            cached = _index.get(key)
+        if cached is None or cached[0] != mtime:
+            try:
+                cached = (mtime, _read_dir(site))
+            except OSError:
+                continue
+            with _index_lock:
+                _index[key] = cached
+        for name, dist in cached[1].items():
+            merged.setdefault(name, dist)
+    return merged
+
+
+def marker_env(python: str) -> Dict[str, str]:
+    """대상 interpreter의 marker 환경 (python_version, sys_platform ...). 실행 파일 mtime 기준 memoize"""
+    try:
+        key = (python, os.stat(python).st_mtime_ns)
+    except OSError:
+        key = (python, 0)
+    if key not in _envs:
+        if os.path.realpath(python) == os.path.realpath(sys.executable):
+            _envs[key] = default_environment()
+        else:
+            _envs[key] = json.loads(subprocess.check_output([python, "-c", _ENV_SNIPPET], text=True, timeout=30))
+    return _envs[key]
+
+
+def _extra_requires(dist_path: str, extras: set, env: Dict[str, str]) -> List[Requirement]:
+    """설치된 배포판 METADATA 의 Requires-Dist 중 요청한 extra에 해당하는 것"""
+    meta = Path(dist_path) / "METADATA"
+    try:
+        with open(meta, "r", encoding="utf-8", errors="ignore") as f:
+            headers = HeaderParser().parse(f, headersonly=True)
+    except OSError:
+        return []
+    out = []
+    for line in headers.get_all("Requires-Dist") or []:
+        try:
+            req = Requirement(line)
+        except InvalidRequirement:
+            continue
+        if req.marker and any(req.marker.evaluate({**env, "extra": e}) for e in extras) \
+                and not req.marker.evaluate({**env, "extra": ""}):
+            out.append(req)
+    return out
+
+
+def check(requirements: List[str], dists: Dict[str, Tuple[str, str]], env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    정규화된 requirements 를 설치 목록과 비교 →
+    {"missing": [...], "mismatched": [{"requirement", "installed"}], "satisfied": [...], "skipped": [...], "options": [...]}
+    - marker가 대상 환경에 안 맞는 줄은 skipped, URL/local/-e 는 확인할 수 없으므로 missing (pip가 판단)
+    - extras 는 설치된 배포판의 Requires-Dist 를 따라 한 번 더 확인
+    """
+    report: Dict[str, Any] = {"missing": [], "mismatched": [], "satisfied": [], "skipped": [], "options": []}
+    seen = set()
+
+    def _check(line: str, req: Requirement | None) -> None:
+        if req is None:
+            try:
+                req = Requirement(line)
+            except InvalidRequirement:
+                report["missing"].append(line)
+                return
+        if req.marker and not req.marker.evaluate({**env, "extra": ""}):
+            report["skipped"].append(line)
+            return
+        if req.url:
+            report["missing"].append(line)
+            return
+        name = canonicalize_name(req.name)
+        if (name, line) in seen:
+            return
+        seen.add((name, line))
+        dist = dists.get(name)
+        if dist is None:
+            report["missing"].append(line)
+        elif req.specifier and not req.specifier.contains(dist[0], prereleases=True):
+            report["mismatched"].append({"requirement": line, "installed": dist[0]})
+        else:
+            report["satisfied"].append(line)
+            if req.extras:
+                for sub in _extra_requires(dist[1], set(req.extras), env):
+                    sub.marker = None   # extra 조건은 이미 확인함
+                    _check(str(sub), sub)
+
+    for line in requirements:
+        if line.startswith("-e") or line.startswith("--editable"):
+            report["missing"].append(line)
+        elif line.startswith("-"):
+            report["options"].append(line)
+        else:
+            _check(line, None)
+    return report
@@ -0,0 +1,37 @@
+# utils/file_lock.py
+import threading
+from pathlib import Path
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:   # Windows: 프로세스 간 잠금 없이 스레드 잠금만
+    fcntl = None
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+class PathLock:
+    """path 하나에 대한 잠금 (같은 프로세스의 스레드 + process pool 의 다른 프로세스 모두). <path>.lock 파일 사용"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path).with_suffix(".lock")
+        with _locks_guard:
+            self._thread_lock = _locks.setdefault(str(self.path), threading.Lock())
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = open(self.path, "w")
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._fd.close()
+            self._fd = None
+        self._thread_lock.release()
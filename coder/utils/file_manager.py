@@ -5,7 +5,23 @@ from typing import List, Dict, Any
 import shutil
 import venv
 from .handler_registry import register
+from .process_stream import run_streaming
+from .patching import PatchError, apply_hunks
+from .manifest import RepoManifest
+from .clone_cache import CloneCache, GitError, git, received
+from .venv_cache import VenvCache, resolve_interpreter
+from .wheelhouse import BOOTSTRAP, Wheelhouse, WheelhouseError
+from .warm_pool import run_warm, use_warm
+import time
+import difflib
 import os, sys
+import bisect
+
+READ_PAGE_BYTES = 1 << 20         # read_py_files 한 페이지 (content 합계)
+READ_MAX_FILE_BYTES = 256 << 10   # 파일 하나 최대 (넘으면 잘라냄)
+READ_SKIP_DIRS = {".venv", "venv", "env", "__pycache__", ".git", "node_modules"}
+MINIFIED_LINE_CHARS = 5000        # 이보다 긴 줄이 있으면 minified/생성 코드로 보고 건너뜀
+MINIFIED_AVG_CHARS = 400
 
 
 class FileManager:
@@ -20,6 +36,18 @@ class FileManager:
     def _err(msg: str) -> Dict[str, Any]:
         return {"stdout": None, "stderr": msg}
 
+    @staticmethod
+    def _unique_bak(orig: Path) -> Path:
+        bak = orig.with_suffix(orig.suffix + ".bak")
+        if not bak.exists():
+            return bak
+        i = 1
+        while True:
+            cand = orig.with_suffix(orig.suffix + f".bak.{i}")
+            if not cand.exists():
+                return cand
+            i += 1
+
     @register("run_in_venv")
     def run_in_venv(
         self,
@@ -27,8 +55,17 @@ class FileManager:
         target: str = "train.py",
         args: List[str] | None = None,
         cwd: str | None = None,
-        timeout: int | float | None = None
+        timeout: int | float | None = None,
+        stream: bool = False,
+        emit=None,
+        warm: bool | None = None,
+        preload: List[str] | None = None
     ) -> Dict[str, Any]:
+        """
+        stream=True → stdout/stderr를 실행 중에 emit({"data"}, stream="stdout"|"stderr") 로 흘려보내고,
+        최종 결과에는 출력의 마지막 부분만 담음
+        warm=True (또는 WARM_POOL=1) → venv별 warm worker(preload import 완료)에서 fork 한 child로 실행
+        """
         try:
             if not venv_path:
                 return self._err("Required: venv_path")
@@ -59,12 +96,36 @@ class FileManager:
             if args:
                 argv.extend([str(a) for a in args])
 
+            to = timeout if isinstance(timeout, (int, float)) else None
+            if use_warm(warm):
+                res = run_warm(str(py), preload, emit=emit if stream else None,
+                               path=str(script), argv=argv[1:], cwd=str(workdir), timeout=to)
+                if res is not None:
+                    if res["timed_out"]:
+                        return self._err("Execution timed out")
+                    if res["returncode"] == 0:
+                        return self._ok(res["stdout"].strip())
+                    return self._err(res["stderr"].strip() or f"returncode={res['returncode']}")
+
+            if stream and emit:
+                res = run_streaming(
+                    [str(py), *argv],
+                    cwd=str(workdir),
+                    timeout=to,
+                    on_output=lambda name, text: emit({"data": text}, stream=name),
+                )
+                if res["timed_out"]:
+                    return self._err("Execution timed out")
+                if res["returncode"] == 0:
+                    return self._ok(res["stdout"].strip())
+                return self._err(res["stderr"].strip() or f"returncode={res['returncode']}")
+
             result = subprocess.run(
                 [str(py), *argv],
                 cwd=str(workdir),
                 capture_output=True,
                 text=True,
-                timeout=timeout if isinstance(timeout, (int, float)) else None
+                timeout=to
             )
 
             if result.returncode == 0:
@@ -93,13 +154,52 @@ class FileManager:
         return self._run(["git", *args], cwd=p)
 
     @register("clone_repo")
-    def clone_repo(self, dir_path: str="/workspace", git_url: str=None) -> Dict[str, Any]:
+    def clone_repo(self, dir_path: str="/workspace", git_url: str=None, depth: int | None = None,
+                   filter: str | None = None, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        git clone (기본: workspace의 mirror 캐시를 거침, utils/clone_cache.py)
+        - depth  → shallow clone (--depth)
+        - filter → partial clone (예: "blob:none")
+        - use_cache=False → 캐시 없이 바로 git clone
+        이미 clone된 디렉터리가 있으면 그대로 사용 (existing=True, source="existing")
+        """
         try:
+            if not git_url:
+                return self._err("Required: git_url")
             work = Path(dir_path)
             work.mkdir(parents=True, exist_ok=True)
-            result = subprocess.run(["git", "clone", git_url], cwd=str(work), capture_output=True, text=True)
             repo_name = git_url.rstrip("/").split("/")[-1]
-            return self._ok({"repo": repo_name, "dir_path": str(work / repo_name)})
+            if repo_name.endswith(".git"):
+                repo_name = repo_name[:-4]
+            dest = work / repo_name
+            if (dest / ".git").exists():
+                return self._ok({"repo": repo_name, "dir_path": str(dest), "existing": True, "source": "existing"})
+
+            t0 = time.perf_counter()
+            if use_cache:
+                info = CloneCache(self.root or work).clone(git_url, dest, depth=depth, filter=filter)
+            else:
+                args = ["clone", "--progress"]
+                if depth:
+                    args += ["--depth", str(depth)]
+                if filter:
+                    args += ["--filter", filter]
+                res = git(*args, git_url, str(dest))
+                if res.returncode != 0:
+                    return self._err(res.stderr.strip() or f"git clone returncode={res.returncode}")
+                info = {"source": "network", "network": received(res.stderr), "cache_objects": 0}
+            info["elapsed_ms"] = int((time.perf_counter() - t0) * 1000)
+            return self._ok({"repo": repo_name, "dir_path": str(dest), "existing": False, **info})
+        except GitError as e:
+            return self._err(str(e))
+        except Exception as e:
+            return self._err(str(e))
+
+    @register("refresh_mirrors")
+    def refresh_mirrors(self, git_urls: List[str] | None = None, max_workers: int = 4) -> Dict[str, Any]:
+        """clone 캐시 mirror들을 동시에 fetch (git_urls 없으면 전부)"""
+        try:
+            return self._ok(CloneCache(self.root).refresh_all(git_urls, max_workers=max_workers))
         except Exception as e:
             return self._err(str(e))
 
@@ -147,31 +247,147 @@ class FileManager:
             return self._err(str(e))
 
     @register("read_py_files")
-    def read_py_files(self, dir_path: str) -> Dict[str, Any]:
+    def read_py_files(
+        self,
+        dir_path: str,
+        cursor: str | None = None,
+        page_bytes: int = READ_PAGE_BYTES,
+        max_file_bytes: int = READ_MAX_FILE_BYTES,
+        stream: bool = False,
+        emit=None
+    ) -> Dict[str, Any]:
+        """
+        dir_path 아래 .py 파일 내용. 파일마다 max_file_bytes 까지만 (넘으면 잘라내고 truncated 표시),
+        binary / minified 파일은 건너뜀 (skipped 에 이유)
+        - 기본               → stdout: [{"path", "content"}, ...] (기존 형식)
+        - cursor 지정 ("" = 처음) → page_bytes 만큼 한 페이지: {"files", "next_cursor", "skipped"}
+        - stream=True + emit → 페이지마다 부분 프레임 emit({"files", "page", "next_cursor"}, stream="page"),
+                               최종 stdout은 요약 {"count", "pages", "bytes", "skipped", "truncated"}
+        """
         try:
             root = self.root / Path(dir_path)
             if not root.exists():
                 return self._err(f"Path not found: {dir_path}")
 
-            out: List[Dict[str, str]] = []
-            if root.is_file() and root.suffix == ".py":
-                if root.name not in {"get-pip.py"}:
-                    out.append({
-                        "path": str(root),
-                        "content": root.read_text(encoding="utf-8", errors="ignore")
-                    })
-            else:
-                for fp in root.rglob("*.py"):
-                    if any(part in {".venv", "venv", "env", "__pycache__"} for part in fp.parts):
-                        continue
-                    if fp.name.startswith("get-pip") or fp.name.startswith("pip-"):
-                        continue
-                    out.append({
-                        "path": str(fp),
-                        "content": fp.read_text(encoding="utf-8", errors="ignore")
-                    })
-
-            return self._ok(out)
+            paged = cursor is not None
+            streaming = stream and emit is not None
+            files: List[Dict[str, Any]] = []
+            skipped: List[Dict[str, str]] = []
+            truncated: List[str] = []
+            page_size, pages, total, count = 0, 0, 0, 0
+            next_cursor = None
+
+            for rel, fp in self._py_file_paths(root, cursor or ""):
+                if (paged or streaming) and files and page_size >= page_bytes:
+                    if not streaming:
+                        next_cursor = files[-1]["rel"]
+                        break
+                    emit({"files": files, "page": pages, "next_cursor": files[-1]["rel"]}, stream="page")
+                    files, page_size, pages = [], 0, pages + 1
+
+                entry, reason = self._read_py_file(fp, max_file_bytes)
+                if entry is None:
+                    skipped.append({"path": str(fp), "reason": reason})
+                    continue
+                entry["rel"] = rel
+                if entry.get("truncated"):
+                    truncated.append(str(fp))
+                files.append(entry)
+                count += 1
+                page_size += len(entry["content"])
+                total += len(entry["content"])
+
+            if streaming:
+                if files:
+                    emit({"files": files, "page": pages, "next_cursor": None}, stream="page")
+                    pages += 1
+                return self._ok({
+                    "count": count,
+                    "pages": pages,
+                    "bytes": total,
+                    "skipped": skipped,
+                    "truncated": truncated,
+                })
+            if paged:
+                return self._ok({"files": files, "next_cursor": next_cursor, "skipped": skipped})
+            return self._ok(files)
+        except Exception as e:
+            return self._err(str(e))
+
+    @staticmethod
+    def _py_file_paths(root: Path, start_after: str = ""):
+        """(root 기준 상대경로, Path) 를 상대경로 정렬 순으로. start_after 다음 파일부터 (cursor)"""
+        if root.is_file():
+            if root.suffix == ".py" and root.name not in {"get-pip.py"} and not start_after:
+                yield root.name, root
+            return
+        rels = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in READ_SKIP_DIRS]
+            for name in filenames:
+                if not name.endswith(".py") or name.startswith("get-pip") or name.startswith("pip-"):
+                    continue
+                rels.append(Path(dirpath, name).relative_to(root).as_posix())
+        rels.sort()
+        for rel in rels[bisect.bisect_right(rels, start_after) if start_after else 0:]:
+            yield rel, root / rel
+
+    @staticmethod
+    def _read_py_file(fp: Path, max_bytes: int):
+        """→ (entry, None) 또는 (None, 건너뛴 이유)"""
+        size = fp.stat().st_size
+        with open(fp, "rb") as f:
+            raw = f.read(max_bytes)
+        if b"\0" in raw[:8192]:
+            return None, "binary"
+        text = raw.decode("utf-8", errors="ignore")
+        lines = text.splitlines() or [""]
+        longest = max(len(line) for line in lines)
+        if longest > MINIFIED_LINE_CHARS or (len(text) > 4096 and len(text) / len(lines) > MINIFIED_AVG_CHARS):
+            return None, "minified"
+
+        entry: Dict[str, Any] = {"path": str(fp), "content": text}
+        if size > max_bytes:
+            cut = text.rfind("\n")
+            shown = text[:cut + 1] if cut > 0 else text
+            entry["content"] = shown + f"# ... [truncated: showing {len(shown)} of {size} bytes]\n"
+            entry["truncated"] = True
+            entry["size"] = size
+        return entry, None
+
+    @register("scan_changes")
+    def scan_changes(self, dir_path: str, since: int | None = None, include_content: bool = True,
+                     max_file_bytes: int = READ_MAX_FILE_BYTES) -> Dict[str, Any]:
+        """
+        repo manifest(utils/manifest.py)를 디스크와 맞춘 뒤 since 버전 이후 바뀐 파일만
+        stdout: {"version", "full", "added": [...], "modified": [...], "deleted": [rel, ...]}
+          added/modified 항목: {"path", "rel", "size", "mtime_ns", "sha1"} (+ .py면 "content", read_py_files와 같은 cap)
+        since=None(처음) 또는 너무 오래된 버전 → full=True 로 전체 목록
+        """
+        try:
+            root = self.root / Path(dir_path)
+            if not root.is_dir():
+                return self._err(f"Path not found: {dir_path}")
+            manifest = RepoManifest(root, self.root)
+            manifest.scan()
+            delta = manifest.delta(since)
+
+            def _entry(rel: str) -> Dict[str, Any]:
+                fp = root / rel
+                item: Dict[str, Any] = {"path": str(fp), "rel": rel, **manifest.meta(rel)}
+                if include_content and rel.endswith(".py"):
+                    entry, reason = self._read_py_file(fp, max_file_bytes)
+                    if entry is None:
+                        item["skipped"] = reason
+                    else:
+                        item["content"] = entry["content"]
+                        if entry.get("truncated"):
+                            item["truncated"] = True
+                return item
+
+            delta["added"] = [_entry(rel) for rel in delta["added"]]
+            delta["modified"] = [_entry(rel) for rel in delta["modified"]]
+            return self._ok(delta)
         except Exception as e:
             return self._err(str(e))
 
@@ -182,7 +398,6 @@ class FileManager:
         - target: list of file paths to write (e.g., ["AI_Agent_Model/model.py"])
         - files: dictionary mapping (filename or absolute path) → content
         """
-        self.root = "/workspace/"
         try:
             if not isinstance(target, list):
                 return self._err("target must be a list of paths")
@@ -190,17 +405,6 @@ class FileManager:
             changes: List[Dict[str, Any]] = []
             errors: List[str] = []
 
-            def _unique_bak(orig: Path) -> Path:
-                bak = orig.with_suffix(orig.suffix + ".bak")
-                if not bak.exists():
-                    return bak
-                i = 1
-                while True:
-                    cand = orig.with_suffix(orig.suffix + f".bak.{i}")
-                    if not cand.exists():
-                        return cand
-                    i += 1
-
             for path_str in target:
                 fp = Path(self.root) / path_str
 
@@ -216,7 +420,7 @@ class FileManager:
                     fp.parent.mkdir(parents=True, exist_ok=True)
                     bak_path: str | None = None
                     if fp.exists():
-                        bak = _unique_bak(fp)
+                        bak = self._unique_bak(fp)
                         shutil.copy2(fp, bak)
                         bak_path = str(bak)
                     # ✅ value (content)만 write
@@ -233,6 +437,77 @@ class FileManager:
         except Exception as e:
             return self._err(str(e))
 
+    @register("apply_patch")
+    def apply_patch(self, patches: Dict[str, List[Dict[str, str]]] | None = None,
+                    files: Dict[str, str] | None = None, target: List[str] | None = None) -> Dict[str, Any]:
+        """
+        부분 수정 적용 (edit처럼 파일 전체를 받지 않음)
+        - patches: {path: [{"search": "...", "replace": "..."}]}  → fuzzy context 매칭으로 적용
+        - files: {path: content}  → patch로 못 만든 파일의 전체 재작성 (fallback)
+        - target: 적용할 path 목록 (없으면 patches/files 전체)
+        파일 단위로 적용/실패. 실패한 파일은 원본 그대로 두고 failed 에 이유를 담음
+        """
+        try:
+            patches, files = patches or {}, files or {}
+            if not patches and not files:
+                return self._err("Required: patches or files")
+
+            changes: List[Dict[str, Any]] = []
+            failed: Dict[str, str] = {}
+            diffs: List[str] = []
+
+            paths = list(patches) + [p for p in files if p not in patches]
+            if target:
+                paths = [p for p in paths if p in target]
+            root = Path(self.root)
+            for path_str in paths:
+                fp = root / path_str
+                try:
+                    old = fp.read_text(encoding="utf-8") if fp.exists() else ""
+                    if path_str in patches:
+                        new, report = apply_hunks(old, patches[path_str])
+                        mode = "patch"
+                    else:
+                        new, report, mode = files[path_str], {}, "rewrite"
+                except PatchError as e:
+                    failed[path_str] = str(e)
+                    continue
+                except OSError as e:
+                    failed[path_str] = str(e)
+                    continue
+
+                if new == old:
+                    changes.append({"file": str(fp), "bak": None, "mode": mode, "unchanged": True, **report})
+                    continue
+                try:
+                    fp.parent.mkdir(parents=True, exist_ok=True)
+                    bak_path: str | None = None
+                    if fp.exists():
+                        bak = self._unique_bak(fp)
+                        shutil.copy2(fp, bak)
+                        bak_path = str(bak)
+                    fp.write_text(new, encoding="utf-8")
+                except OSError as e:
+                    failed[path_str] = str(e)
+                    continue
+                changes.append({"file": str(fp), "bak": bak_path, "mode": mode, **report})
+                diffs.append("".join(difflib.unified_diff(
+                    old.splitlines(keepends=True), new.splitlines(keepends=True),
+                    fromfile=f"a/{fp.name}", tofile=f"b/{fp.name}",
+                )))
+
+            result = {
+                "message": f"patched {len(changes)} files",
+                "changes": changes,
+                "failed": failed,
+                "diff": "\n".join(diffs),
+            }
+            if failed:
+                return {"stdout": result, "stderr": "\n".join(f"{p}: {e}" for p, e in failed.items())}
+            return self._ok(result)
+        except Exception as e:
+            return self._err(str(e))
+
     @register("create_venv")
     def create_venv(
         self,
@@ -241,8 +516,13 @@ class FileManager:
         requirements: str | None = None,
         upgrade_deps: bool = True,
         python_version: str | None = None,
-        interpreter: str | None = None
+        interpreter: str | None = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
+        """
+        use_cache → requirements + interpreter 가 같은 venv를 이미 만든 적 있으면
+                    pip install 없이 캐시(utils/venv_cache.py)에서 hardlink로 구성
+        """
         try:
             project_dir = Path(dir_path).expanduser()
             if project_dir.is_absolute():
@@ -254,15 +534,7 @@ class FileManager:
             venv_path = project_dir / venv_name
 
             if venv_path.exists():
-                if os.name == "nt":
-                    py = venv_path / "Scripts" / "python.exe"
-                    pip = venv_path / "Scripts" / "pip.exe"
-                    activate = venv_path / "Scripts" / "activate.bat"
-                else:
-                    py = venv_path / "bin" / "python"
-                    pip = venv_path / "bin" / "pip"
-                    activate = venv_path / "bin" / "activate"
-
+                py, pip, activate = self._venv_paths(venv_path)
                 return self._ok({
                     "message": f"venv already exists: {venv_path}",
                     "venv": str(venv_path),
@@ -274,66 +546,26 @@ class FileManager:
                     "interpreter_cmd": None,
                 })
 
-            def _resolve_interpreter(version: str | None, explicit: str | None) -> list[str]:
-                if explicit:
-                    return explicit.split()
-                if not version:
-                    return [sys.executable]
-                candidates: list[list[str]] = []
-                if os.name == "nt":
-                    candidates += [["py", f"-{version}"]]
-                    candidates += [[f"python{version}"], [f"python{version.replace('.', '')}"]]
-                else:
-                    candidates += [[f"python{version}"], [f"python{version.split('.')[0]}"]]
-                for cmd in candidates:
-                    exe = shutil.which(cmd[0])
-                    if not exe:
-                        continue
-                    try:
-                        out = subprocess.check_output(
-                            cmd + ["-c", "import sys;print(f'{sys.version_info[0]}.{sys.version_info[1]}')"],
-                            text=True
-                        ).strip()
-                        if out == version or out.startswith(version):
-                            cmd[0] = exe
-                            return cmd
-                    except Exception:
-                        continue
-                raise FileNotFoundError(f"Python {version} interpreter not found on PATH.")
-
-            interp_cmd = _resolve_interpreter(python_version, interpreter)
-
-            subprocess.check_call([*interp_cmd, "-m", "venv", str(venv_path)])
-
-            if os.name == "nt":
-                py = venv_path / "Scripts" / "python.exe"
-                pip = venv_path / "Scripts" / "pip.exe"
-                activate = venv_path / "Scripts" / "activate.bat"
-            else:
-                py = venv_path / "bin" / "python"
-                pip = venv_path / "bin" / "pip"
-                activate = venv_path / "bin" / "activate"
-
-            def _ensure_pip():
-                if not pip.exists():
-                    url = "https://bootstrap.pypa.io/get-pip.py"
-                    get_pip = project_dir / "get-pip.py"
-                    subprocess.check_call(["wget", "-O", str(get_pip), url])
-                    subprocess.check_call([str(py), str(get_pip)])
-
-            _ensure_pip()
-
-            if upgrade_deps:
-                subprocess.check_call([str(py), "-m", "pip", "install", "-U", "pip", "setuptools", "wheel"])
+            interp_cmd = resolve_interpreter(python_version, interpreter)
 
+            req_path = None
             if requirements:
                 req_path = Path(requirements)
                 if not req_path.is_absolute():
                     req_path = project_dir / req_path
                 if not req_path.exists():
                     return self._err(f"requirements not found: {req_path}")
-                subprocess.check_call([str(pip), "install", "-r", str(req_path)])
 
+            def _build(target: Path):
+                self._build_venv(interp_cmd, target, project_dir, req_path, upgrade_deps)
+
+            cache = None
+            if use_cache:
+                cache = VenvCache(self.root).materialize(interp_cmd, req_path, upgrade_deps, venv_path, _build)
+            else:
+                _build(venv_path)
+
+            py, pip, activate = self._venv_paths(venv_path)
             return self._ok({
                 "venv": str(venv_path),
                 "python": str(py),
@@ -342,10 +574,87 @@ class FileManager:
                 "installed": bool(requirements),
                 "upgraded": upgrade_deps,
                 "interpreter_cmd": interp_cmd,
+                "cache": cache,
             })
 
         except subprocess.CalledProcessError as cpe:
-            return self._err(f"venv/pip failed (returncode={cpe.returncode})")
+            detail = (cpe.stderr or "").strip()[-2000:]
+            return self._err(f"venv/pip failed (returncode={cpe.returncode})" + (f"\n{detail}" if detail else ""))
+        except Exception as e:
+            return self._err(str(e))
+
+    @staticmethod
+    def _venv_paths(venv_path: Path):
+        """(python, pip, activate)"""
+        if os.name == "nt":
+            return venv_path / "Scripts" / "python.exe", venv_path / "Scripts" / "pip.exe", venv_path / "Scripts" / "activate.bat"
+        return venv_path / "bin" / "python", venv_path / "bin" / "pip", venv_path / "bin" / "activate"
+
+    def _build_venv(self, interp_cmd: List[str], venv_path: Path, project_dir: Path,
+                    req_path: Path | None, upgrade_deps: bool) -> None:
+        """
+        venv 생성 + pip 준비 + (upgrade) + requirements 설치. 실패 시 CalledProcessError
+        pip 설치는 wheelhouse(utils/wheelhouse.py) 기준 --no-index (없는 wheel은 먼저 병렬로 받아 둠)
+        """
+        try:
+            subprocess.check_call([*interp_cmd, "-m", "venv", str(venv_path)])
+        except subprocess.CalledProcessError:
+            # ensurepip 없는 interpreter → pip 없이 만들고 아래에서 wheelhouse로 설치
+            shutil.rmtree(venv_path, ignore_errors=True)
+            subprocess.check_call([*interp_cmd, "-m", "venv", "--without-pip", str(venv_path)])
+        py, pip, _ = self._venv_paths(venv_path)
+        wheelhouse = Wheelhouse(self.root)
+
+        if not pip.exists():
+            try:
+                wheelhouse.bootstrap_pip(py)
+            except WheelhouseError:
+                url = "https://bootstrap.pypa.io/get-pip.py"
+                get_pip = project_dir / "get-pip.py"
+                subprocess.check_call(["wget", "-O", str(get_pip), url])
+                subprocess.check_call([str(py), str(get_pip)])
+
+        if upgrade_deps:
+            wheelhouse.install([str(py)], packages=BOOTSTRAP, upgrade=True)
+
+        if req_path:
+            wheelhouse.install([str(py)], req_path=req_path)
+
+    @register("venv_cache_stats")
+    def venv_cache_stats(self) -> Dict[str, Any]:
+        try:
+            return self._ok(VenvCache(self.root).stats())
+        except Exception as e:
+            return self._err(str(e))
+
+    @register("prewarm_wheelhouse")
+    def prewarm_wheelhouse(
+        self,
+        dir_path: str | None = None,
+        requirements: str = "requirements.txt",
+        python_version: str | None = None,
+        interpreter: str | None = None,
+        max_workers: int | None = None
+    ) -> Dict[str, Any]:
+        """requirements 의 wheel을 미리 wheelhouse에 받아 둠 (이후 create_venv / pip_install 은 offline 설치)"""
+        try:
+            req_path = Path(requirements)
+            if not req_path.is_absolute():
+                req_path = self.root / (dir_path or "") / req_path
+            if not req_path.exists():
+                return self._ok({"message": f"requirements not found: {req_path}", "skipped": True})
+            interp_cmd = resolve_interpreter(python_version, interpreter)
+            report = Wheelhouse(self.root).prewarm(interp_cmd, req_path=req_path, max_workers=max_workers)
+            if report["failed"]:
+                return {"stdout": report, "stderr": f"{len(report['failed'])} wheel(s) failed"}
+            return self._ok(report)
+        except Exception as e:
+            return self._err(str(e))
+
+    @register("wheelhouse_stats")
+    def wheelhouse_stats(self) -> Dict[str, Any]:
+        try:
+            return self._ok(Wheelhouse(self.root).stats())
         except Exception as e:
             return self._err(str(e))
 
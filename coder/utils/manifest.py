@@ -0,0 +1,143 @@
+# utils/manifest.py
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+MANIFEST_DIR = ".manifests"     # workspace root 아래
+SKIP_DIRS = {".venv", "venv", "env", "__pycache__", ".git", "node_modules"}
+KEEP_VERSIONS = 50              # 삭제 기록(tombstone)을 유지하는 버전 수 → 이보다 오래된 since는 전체 목록
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def file_hash(fp: Path) -> str:
+    h = hashlib.sha1()
+    with open(fp, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class RepoManifest:
+    """
+    repo 하나의 파일 목록 {rel: size, mtime_ns, sha1, created, changed} + version.
+    scan() 은 stat만 보고 size/mtime이 바뀐 파일만 다시 hash → 변경 없으면 파일을 읽지 않음
+    파일이 바뀔 때마다 version+1, 각 파일은 마지막으로 바뀐 version(changed)을 기억
+    삭제된 파일은 tombstone {rel: {deleted, created}} 으로 KEEP_VERSIONS 동안 보관
+    """
+
+    def __init__(self, repo_root: Path, workspace: Path):
+        self.repo_root = Path(repo_root).resolve()
+        workspace = Path(workspace).resolve()
+        key = self.repo_root.relative_to(workspace) if self.repo_root.is_relative_to(workspace) else self.repo_root
+        self.path = workspace / MANIFEST_DIR / (key.as_posix().strip("/").replace("/", "__") + ".json")
+        self._lock = _lock_for(str(self.path))
+        self.version = 0
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.deleted: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.version = data["version"]
+            self.files = data["files"]
+            self.deleted = data.get("deleted", {})
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "files": self.files, "deleted": self.deleted}, f)
+        os.replace(tmp, self.path)
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        out = {}
+        for dirpath, dirnames, filenames in os.walk(self.repo_root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                fp = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(fp)
+                except OSError:
+                    continue
+                out[os.path.relpath(fp, self.repo_root).replace(os.sep, "/")] = st
+        return out
+
+    def scan(self) -> int:
+        """디스크와 비교해서 manifest 갱신 → 현재 version"""
+        with self._lock:
+            self._load()
+            seen = self._walk()
+            changed: List[Tuple[str, os.stat_result, str]] = []
+            touched = False
+            for rel, st in seen.items():
+                old = self.files.get(rel)
+                if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                    continue
+                try:
+                    digest = file_hash(self.repo_root / rel)
+                except OSError:
+                    continue
+                if old and old["sha1"] == digest:
+                    # 내용은 같고 mtime만 바뀜 (touch 등) → stat만 갱신
+                    old["size"], old["mtime_ns"] = st.st_size, st.st_mtime_ns
+                    touched = True
+                    continue
+                changed.append((rel, st, digest))
+            removed = [rel for rel in self.files if rel not in seen]
+
+            if changed or removed:
+                self.version += 1
+                for rel, st, digest in changed:
+                    created = self.files[rel]["created"] if rel in self.files else self.version
+                    self.files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": digest,
+                                       "created": created, "changed": self.version}
+                    self.deleted.pop(rel, None)
+                for rel in removed:
+                    self.deleted[rel] = {"deleted": self.version, "created": self.files.pop(rel)["created"]}
+                horizon = self.version - KEEP_VERSIONS
+                self.deleted = {r: d for r, d in self.deleted.items() if d["deleted"] > horizon}
+            if changed or removed or touched or not self.path.exists():
+                self._save()
+            return self.version
+
+    def delta(self, since: int | None) -> Dict[str, Any]:
+        """
+        since 이후 바뀐 것 → {"version", "full", "added", "modified", "deleted"}
+        since가 None / 미래 / KEEP_VERSIONS보다 오래됨 → full=True, 전체가 added
+        """
+        with self._lock:
+            full = since is None or since > self.version or since < self.version - KEEP_VERSIONS
+            base = 0 if full else since
+            added, modified = [], []
+            for rel, meta in self.files.items():
+                if meta["changed"] <= base:
+                    continue
+                (added if meta["created"] > base else modified).append(rel)
+            deleted = [] if full else [
+                rel for rel, d in self.deleted.items() if d["deleted"] > base and d["created"] <= base
+            ]
+            return {
+                "version": self.version,
+                "full": full,
+                "added": sorted(added),
+                "modified": sorted(modified),
+                "deleted": sorted(deleted),
+            }
+
+    def meta(self, rel: str) -> Dict[str, Any]:
+        m = self.files[rel]
+        return {"size": m["size"], "mtime_ns": m["mtime_ns"], "sha1": m["sha1"]}
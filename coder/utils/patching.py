@@ -0,0 +1,125 @@
+# utils/patching.py
+# supervisor/utils/patch.py 도 이 파일을 그대로 로드해서 dry-run 함 → 표준 라이브러리만 사용
+import difflib
+from functools import reduce
+from math import gcd
+from typing import Dict, List, Tuple
+
+FUZZY_RATIO = 0.8   # 이 유사도 이상이면 같은 위치로 봄
+
+
+class PatchError(Exception):
+    pass
+
+
+def _strip_blank_edges(lines: List[str]) -> List[str]:
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return lines[start:end]
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _unit(lines: List[str]) -> int:
+    """들여쓰기 단위 (0이 아닌 들여쓰기 폭의 최대공약수, 없으면 0)"""
+    return reduce(gcd, (len(_indent(line)) for line in lines if line.strip()), 0)
+
+
+def _reindent(search: List[str], matched: List[str], replace: List[str], lines: List[str]) -> List[str]:
+    """
+    search 와 실제로 찾은 구간(matched)의 들여쓰기 차이를 한 번 계산해 replace 모든 줄에 적용
+    file 들여쓰기 = f0 + (search 들여쓰기 - s0) * scale  (2칸 → 4칸처럼 단위가 달라도 맞춤)
+    scale 은 서로 다른 깊이의 줄 두 개로, 없으면 양쪽 들여쓰기 단위(lines 전체 / search+replace) 비율로
+    """
+    pairs = sorted({(len(_indent(s)), len(_indent(m))) for s, m in zip(search, matched) if s.strip() and m.strip()})
+    if not pairs:
+        return replace
+    s0, f0 = pairs[0]
+    scale = None
+    for s1, f1 in pairs[1:]:
+        if s1 != s0:
+            scale = (f1 - f0) / (s1 - s0)
+            break
+    if scale is None:
+        file_unit, patch_unit = _unit(lines), _unit(search + replace)
+        scale = file_unit / patch_unit if file_unit and patch_unit else 1.0
+    if scale <= 0 or any(f != round(f0 + (s - s0) * scale) for s, f in pairs):
+        scale = 1.0   # 줄마다 차이가 제각각 → 첫 줄 기준 offset만
+    if scale == 1.0 and s0 == f0:
+        return replace
+    char = next((_indent(m)[0] for m in matched if _indent(m)), " ")
+    out = []
+    for r in replace:
+        if not r.strip():
+            out.append(r)
+            continue
+        width = max(0, round(f0 + (len(_indent(r)) - s0) * scale))
+        out.append(char * width + r.lstrip())
+    return out
+
+
+def locate(lines: List[str], search: List[str]) -> Tuple[int, int, str]:
+    """
+    search 블록이 lines 어디에 있는지 찾음 → (start, end, how)
+    1) exact  2) 줄 앞뒤 공백 무시  3) difflib 유사도 FUZZY_RATIO 이상인 가장 비슷한 구간
+    여러 군데 같은 점수로 걸리면 모호하다고 실패
+    """
+    n = len(search)
+    if n == 0:
+        return len(lines), len(lines), "append"
+
+    for how, norm in (("exact", lambda s: s.rstrip()), ("whitespace", lambda s: s.strip())):
+        target = [norm(s) for s in search]
+        hits = [i for i in range(len(lines) - n + 1) if [norm(s) for s in lines[i:i + n]] == target]
+        if len(hits) == 1:
+            return hits[0], hits[0] + n, how
+        if len(hits) > 1:
+            raise PatchError(f"search block matches {len(hits)} places: {search[0].strip()!r}")
+
+    best, best_i, ties = 0.0, -1, 0
+    joined = "\n".join(s.strip() for s in search)
+    for i in range(len(lines) - n + 1):
+        window = "\n".join(s.strip() for s in lines[i:i + n])
+        ratio = difflib.SequenceMatcher(None, joined, window).ratio()
+        if ratio > best:
+            best, best_i, ties = ratio, i, 1
+        elif ratio == best:
+            ties += 1
+    if best < FUZZY_RATIO:
+        raise PatchError(f"search block not found (best ratio {best:.2f}): {search[0].strip()!r}")
+    if ties > 1:
+        raise PatchError(f"search block is ambiguous: {search[0].strip()!r}")
+    return best_i, best_i + n, "fuzzy"
+
+
+def apply_hunks(text: str, hunks: List[Dict[str, str]]) -> Tuple[str, Dict[str, int]]:
+    """
+    hunks: [{"search": "...", "replace": "..."}] 를 순서대로 적용
+    return: (새 내용, {"exact": n, "whitespace": n, "fuzzy": n, "append": n})
+    "context": False 인 hunk (context 없는 unified diff, "+" 줄만) 는 위치를 알 수 없으므로 실패 (append 아님)
+    """
+    lines = text.splitlines()
+    report = {"exact": 0, "whitespace": 0, "fuzzy": 0, "append": 0}
+    for h in hunks:
+        if h.get("context") is False:
+            raise PatchError(f"diff hunk has no context lines: {h.get('replace', '').strip()[:60]!r}")
+        search = _strip_blank_edges(h.get("search", "").splitlines())
+        replace = h.get("replace", "").splitlines()
+        start, end, how = locate(lines, search)
+
+        # 공백 무시/유사도로 찾았으면 들여쓰기 차이만큼 replace 전체를 맞춤
+        if how != "exact" and search:
+            replace = _reindent(search, lines[start:end], replace, lines)
+
+        lines[start:end] = replace
+        report[how] += 1
+
+    new_text = "\n".join(lines)
+    if text.endswith("\n") or not text:
+        new_text += "\n"
+    return new_text, report
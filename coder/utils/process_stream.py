@@ -0,0 +1,141 @@
+# utils/process_stream.py
+import codecs
+import os
+import select
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List
+
+# on_output(stream_name, text) — "stdout" / "stderr" 청크가 읽히는 즉시 호출
+OutputCallback = Callable[[str, str], None]
+
+DEFAULT_TAIL_BYTES = 64 * 1024
+DEFAULT_FLUSH_INTERVAL = 0.05   # 이 간격 안에 나온 출력은 한 청크로 묶어서 전달
+_READ_SIZE = 64 * 1024
+_CAN_SELECT = os.name != "nt"   # Windows 파이프는 select 불가 → 읽은 즉시 전달
+
+
+class _Tail:
+    """마지막 max_chars 문자만 유지하는 버퍼 (메모리 상한)"""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._parts: deque = deque()
+        self._size = 0
+        self.truncated = False
+
+    def append(self, text: str):
+        self._parts.append(text)
+        self._size += len(text)
+        while self._size > self.max_chars and len(self._parts) > 1:
+            self._size -= len(self._parts.popleft())
+            self.truncated = True
+
+    def value(self) -> str:
+        text = "".join(self._parts)
+        if len(text) > self.max_chars:
+            self.truncated = True
+            text = text[-self.max_chars:]
+        return text
+
+
+def run_streaming(
+    cmd: List[str],
+    cwd: str | None = None,
+    timeout: float | None = None,
+    on_output: OutputCallback | None = None,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+    env: Dict[str, str] | None = None,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+) -> Dict[str, object]:
+    """
+    프로세스를 실행하며 stdout/stderr를 청크 단위로 on_output에 흘려보냄.
+    (조용하다가 처음 나온 출력은 바로, 연달아 나오는 출력은 flush_interval 단위로 묶어서)
+    전체 출력은 보관하지 않고 마지막 tail_bytes 만큼만 결과로 반환.
+    return: {"returncode", "stdout", "stderr", "timed_out", "truncated"}
+    """
+    run_env = dict(os.environ if env is None else env)
+    run_env.setdefault("PYTHONUNBUFFERED", "1")   # 파이프로 연결돼도 print가 바로 나오도록
+
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=run_env)
+    return stream_process(proc, timeout, on_output, tail_bytes, flush_interval)
+
+
+def stream_process(
+    proc,
+    timeout: float | None = None,
+    on_output: OutputCallback | None = None,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+) -> Dict[str, object]:
+    """
+    이미 실행 중인 proc 의 stdout/stderr 를 읽어 run_streaming 과 같은 결과로 반환
+    proc 은 Popen 처럼 .stdout/.stderr(읽기 파일), .wait(timeout), .kill(), .returncode 만 있으면 됨
+    """
+    tails = {"stdout": _Tail(tail_bytes), "stderr": _Tail(tail_bytes)}
+
+    def _pump(name: str, pipe):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        fd = pipe.fileno()
+        pending: List[str] = []
+        last_flush = 0.0
+
+        def _flush():
+            nonlocal last_flush
+            last_flush = time.monotonic()
+            if not pending:
+                return
+            text = "".join(pending)
+            pending.clear()
+            if on_output:
+                try:
+                    on_output(name, text)
+                except Exception:
+                    pass   # 전송 실패가 프로세스 실행을 막지 않도록
+
+        while True:
+            if pending and _CAN_SELECT:
+                wait = max(0.0, last_flush + flush_interval - time.monotonic())
+                readable, _, _ = select.select([fd], [], [], wait)
+                if not readable:
+                    _flush()
+                    continue
+            chunk = os.read(fd, _READ_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                tails[name].append(text)
+                pending.append(text)
+            if not chunk:
+                _flush()
+                break
+            if not _CAN_SELECT or time.monotonic() - last_flush >= flush_interval:
+                _flush()
+        pipe.close()
+
+    pumps = [
+        threading.Thread(target=_pump, args=("stdout", proc.stdout), daemon=True),
+        threading.Thread(target=_pump, args=("stderr", proc.stderr), daemon=True),
+    ]
+    for t in pumps:
+        t.start()
+
+    timed_out = False
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        proc.kill()
+        proc.wait()
+    deadline = time.monotonic() + 5
+    for t in pumps:
+        t.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    return {
+        "returncode": proc.returncode,
+        "stdout": tails["stdout"].value(),
+        "stderr": tails["stderr"].value(),
+        "timed_out": timed_out,
+        "truncated": tails["stdout"].truncated or tails["stderr"].truncated,
+    }
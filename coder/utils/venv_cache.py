@@ -0,0 +1,300 @@
+# utils/venv_cache.py
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .file_lock import PathLock
+
+VENV_CACHE_DIR = ".venv-cache"     # workspace root 아래
+DEFAULT_BUDGET = int(os.environ.get("VENV_CACHE_MAX_BYTES", 20 << 30))
+
+_NAME = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$")
+
+
+# ---------- interpreter ----------
+@functools.lru_cache(maxsize=64)
+def _probe(cmd: tuple, mtime_ns: int) -> str | None:
+    """interpreter 정보 "3.11.7|CPython|x86_64|/usr" (실행 파일이 바뀌면 mtime이 달라져 다시 실행)"""
+    try:
+        return subprocess.check_output(
+            [*cmd, "-c", "import sys,platform;print('|'.join([platform.python_version(),"
+                         "platform.python_implementation(),platform.machine(),sys.base_prefix]))"],
+            text=True, timeout=30,
+        ).strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def interpreter_info(cmd: List[str]) -> str | None:
+    exe = shutil.which(cmd[0]) or cmd[0]
+    try:
+        mtime = os.stat(exe).st_mtime_ns
+    except OSError:
+        return None
+    return _probe((exe, *cmd[1:]), mtime)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve(version: str | None, explicit: str | None, path_env: str) -> tuple:
+    if explicit:
+        return tuple(explicit.split())
+    if not version:
+        return (sys.executable,)
+    candidates: list[list[str]] = []
+    if os.name == "nt":
+        candidates += [["py", f"-{version}"]]
+        candidates += [[f"python{version}"], [f"python{version.replace('.', '')}"]]
+    else:
+        candidates += [[f"python{version}"], [f"python{version.split('.')[0]}"]]
+    for cmd in candidates:
+        exe = shutil.which(cmd[0], path=path_env)
+        if not exe:
+            continue
+        info = interpreter_info([exe, *cmd[1:]])
+        if info and info.split("|")[0].startswith(version):
+            return (exe, *cmd[1:])
+    raise FileNotFoundError(f"Python {version} interpreter not found on PATH.")
+
+
+def resolve_interpreter(version: str | None, explicit: str | None = None) -> list[str]:
+    """python_version / interpreter → 실행 명령. 결과와 버전 확인은 memoize (PATH가 바뀌면 다시 찾음)"""
+    return list(_resolve(version, explicit, os.environ.get("PATH", "")))
+
+
+# ---------- requirements ----------
+def normalize_requirements(req_path: Path | None, _seen: set | None = None) -> List[str]:
+    """주석/빈 줄 제거, 패키지명 소문자 + PEP 503 정규화, -r 포함 파일 펼침, 정렬"""
+    if req_path is None:
+        return []
+    seen = _seen if _seen is not None else set()
+    req_path = Path(req_path).resolve()
+    if req_path in seen:
+        return []
+    seen.add(req_path)
+    out = []
+    for raw in req_path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        line = raw.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith(("-r ", "--requirement ")):
+            out += normalize_requirements(req_path.parent / line.split(None, 1)[1], seen)
+            continue
+        m = _NAME.match(line)
+        if m and not line.startswith("-"):
+            name = re.sub(r"[-_.]+", "-", m.group(1)).lower()
+            spec, sep, marker = m.group(2).partition(";")
+            line = name + re.sub(r"\s+", "", spec) + (sep + " " + " ".join(marker.split()) if sep else "")
+        out.append(line)
+    return sorted(set(out))
+
+
+def cacheable(requirements: List[str]) -> bool:
+    """local 경로 / editable 설치는 내용이 key에 안 들어가므로 캐시하지 않음"""
+    return not any(
+        line.startswith(("-e", "--editable", ".", "/", "file:")) or " @ file:" in line
+        for line in requirements
+    )
+
+
+# ---------- venv 파일 ----------
+def _bin(venv: Path) -> Path:
+    return venv / ("Scripts" if os.name == "nt" else "bin")
+
+
+def _site_packages(venv: Path) -> Path | None:
+    found = list(venv.glob("lib/python*/site-packages")) + list(venv.glob("Lib/site-packages"))
+    return found[0] if found else None
+
+
+def _link_tree(src: Path, dst: Path) -> int:
+    """src 아래 파일을 dst에 hardlink (다른 파일시스템이면 copy). 반환: 파일 수"""
+    n = 0
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        target = dst / rel
+        target.mkdir(parents=True, exist_ok=True)
+        for name in filenames:
+            s, d = os.path.join(dirpath, name), target / name
+            if d.exists() or d.is_symlink():
+                continue
+            if os.path.islink(s):
+                os.symlink(os.readlink(s), d)
+            else:
+                try:
+                    os.link(s, d)
+                except OSError:
+                    shutil.copy2(s, d)
+            n += 1
+    return n
+
+
+def _copy_scripts(src_venv: Path, dst_venv: Path) -> None:
+    """bin/ 의 console script 복사 (shebang의 template 경로 → 새 venv 경로). venv가 만든 파일은 그대로 둠"""
+    src_bin, dst_bin = _bin(src_venv), _bin(dst_venv)
+    old, new = str(src_venv).encode(), str(dst_venv).encode()
+    for fp in src_bin.iterdir():
+        d = dst_bin / fp.name
+        if d.exists() or d.is_symlink() or fp.is_dir():
+            continue
+        if fp.is_symlink():
+            os.symlink(os.readlink(fp), d)
+            continue
+        data = fp.read_bytes()
+        if data.startswith(b"#!") or old in data[:4096]:
+            d.write_bytes(data.replace(old, new))
+        else:
+            d.write_bytes(data)
+        shutil.copymode(fp, d)
+
+
+def _du(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class VenvCache:
+    """
+    venv template 캐시. key = hash(정규화한 requirements, interpreter 버전/구현/arch/base, upgrade_deps)
+    - miss : template을 한 번 빌드 (venv + pip upgrade + requirements 설치)
+    - hit  : python -m venv --without-pip 로 빈 venv를 만든 뒤 template의 site-packages를 hardlink,
+             console script는 shebang만 바꿔 복사 → pip install 없이 수 초 안에 준비
+    - disk budget을 넘으면 마지막 사용이 오래된 template부터 삭제 (LRU)
+    hardlink라서 설치된 파일을 제자리에서 고치면 template도 바뀜 (pip install/upgrade는 새 파일로 바꾸므로 괜찮음)
+    """
+
+    def __init__(self, workspace: str | Path, budget: int = DEFAULT_BUDGET):
+        self.root = Path(workspace) / VENV_CACHE_DIR
+        self.budget = budget
+
+    def key(self, interp_cmd: List[str], requirements: List[str], upgrade_deps: bool) -> str:
+        info = interpreter_info(interp_cmd) or " ".join(interp_cmd)
+        h = hashlib.sha256()
+        for part in [info, f"upgrade={upgrade_deps}", *requirements]:
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()[:24]
+
+    def materialize(self, interp_cmd: List[str], req_path: Path | None, upgrade_deps: bool, dest: Path,
+                    build: Callable[[Path], None]) -> Dict[str, Any]:
+        """dest에 venv 준비 (캐시에 없으면 build(template) 로 만들어 넣음) → {"hit", "key", "build_ms", "materialize_ms"}"""
+        requirements = normalize_requirements(req_path)
+        if not cacheable(requirements):
+            t0 = time.perf_counter()
+            build(dest)
+            return {"hit": False, "key": None, "cacheable": False, "build_ms": int((time.perf_counter() - t0) * 1000)}
+        key = self.key(interp_cmd, requirements, upgrade_deps)
+        entry = self.root / key
+        template = entry / "venv"
+        hit, build_ms = True, 0
+
+        with PathLock(entry):
+            if not (entry / "meta.json").exists():
+                hit = False
+                shutil.rmtree(entry, ignore_errors=True)
+                entry.mkdir(parents=True)
+                t0 = time.perf_counter()
+                try:
+                    build(template)
+                except BaseException:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    raise
+                build_ms = int((time.perf_counter() - t0) * 1000)
+                self._write_meta(entry, {
+                    "key": key, "interpreter": interpreter_info(interp_cmd), "requirements": requirements,
+                    "upgrade_deps": upgrade_deps, "size": _du(template), "created": time.time(),
+                    "last_used": time.time(), "hits": 0, "build_ms": build_ms,
+                })
+
+            t0 = time.perf_counter()
+            subprocess.check_call([*interp_cmd, "-m", "venv", "--without-pip", str(dest)])
+            src_site, dst_site = _site_packages(template), _site_packages(dest)
+            files = _link_tree(src_site, dst_site) if src_site and dst_site else 0
+            _copy_scripts(template, dest)
+            materialize_ms = int((time.perf_counter() - t0) * 1000)
+
+            meta = self._read_meta(entry)
+            meta["last_used"] = time.time()
+            meta["hits"] = meta.get("hits", 0) + (1 if hit else 0)
+            self._write_meta(entry, meta)
+
+        self._count("hits" if hit else "misses")
+        evicted = self.evict(keep=key)
+        return {"hit": hit, "key": key, "files": files, "build_ms": build_ms,
+                "materialize_ms": materialize_ms, "evicted": evicted}
+
+    # ---------- LRU ----------
+    def entries(self) -> List[Dict[str, Any]]:
+        out = []
+        if self.root.exists():
+            for entry in self.root.iterdir():
+                meta = self._read_meta(entry)
+                if meta:
+                    out.append(meta)
+        return out
+
+    def evict(self, keep: str | None = None) -> List[str]:
+        """전체 크기가 budget을 넘으면 last_used 오래된 것부터 삭제"""
+        entries = sorted(self.entries(), key=lambda m: m.get("last_used", 0))
+        total = sum(m.get("size", 0) for m in entries)
+        evicted = []
+        for meta in entries:
+            if total <= self.budget:
+                break
+            if meta["key"] == keep:
+                continue
+            with PathLock(self.root / meta["key"]):
+                shutil.rmtree(self.root / meta["key"], ignore_errors=True)
+            total -= meta.get("size", 0)
+            evicted.append(meta["key"])
+        if evicted:
+            self._count("evictions", len(evicted))
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.entries()
+        counts = self._read_json(self.root / "stats.json")
+        return {**{"hits": 0, "misses": 0, "evictions": 0}, **counts,
+                "entries": len(entries), "bytes": sum(m.get("size", 0) for m in entries), "budget": self.budget}
+
+    # ---------- meta ----------
+    @staticmethod
+    def _read_json(path: Path) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_meta(self, entry: Path) -> Dict[str, Any]:
+        return self._read_json(entry / "meta.json")
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def _write_meta(self, entry: Path, meta: Dict[str, Any]) -> None:
+        self._write_json(entry / "meta.json", meta)
+
+    def _count(self, name: str, n: int = 1) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with PathLock(self.root / "stats"):
+            counts = self._read_json(self.root / "stats.json")
+            counts[name] = counts.get(name, 0) + n
+            self._write_json(self.root / "stats.json", counts)
@@ -0,0 +1,316 @@
+# utils/warm_pool.py
+import json
+import os
+import queue
+import select
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .process_stream import DEFAULT_FLUSH_INTERVAL, DEFAULT_TAIL_BYTES, OutputCallback, stream_process
+
+# 스크립트로 실행하면 coder/utils 가 sys.path[0] 이 되어 utils/types.py 가 표준 types 를 가림 → -c 로 소스 전달
+ZYGOTE = Path(__file__).with_name("warm_zygote.py").read_text(encoding="utf-8")
+SUPPORTED = hasattr(os, "fork") and hasattr(os, "mkfifo")   # Windows → 항상 cold 실행
+
+# 환경 변수 기본값 (run_python / run_in_venv 의 warm / preload 인자가 없을 때)
+ENABLED = os.environ.get("WARM_POOL") == "1"
+DEFAULT_PRELOAD = [m for m in os.environ.get("WARM_PRELOAD", "").split(",") if m]
+DEFAULT_SIZE = int(os.environ.get("WARM_POOL_SIZE", 1))
+MAX_JOBS = int(os.environ.get("WARM_MAX_JOBS", 100))              # 이만큼 job을 받으면 worker 교체
+MAX_RSS_GROWTH = float(os.environ.get("WARM_MAX_RSS_GROWTH", 0.5))  # 시작 대비 RSS가 50% 넘게 늘면 교체
+START_TIMEOUT = 300   # preload (import torch 등) 대기 상한
+FULL_OUTPUT_BYTES = 64 << 20   # stream 아닐 때 (cold 실행의 capture_output 처럼 전체 출력)
+
+
+class WarmPoolError(Exception):
+    """job을 보내기 전 실패 (worker 시작/연결) → cold 실행으로 넘어가도 됨"""
+
+
+class WarmJobError(Exception):
+    """job을 보낸 뒤 실패 → child가 이미 돌고 있을 수 있으므로 cold로 다시 실행하면 안 됨"""
+
+
+def _rss(pid: int) -> int:
+    """resident memory (bytes). /proc 없는 OS면 0 → 메모리 기준 교체 안 함"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _close_fds(fds: List[int]) -> None:
+    while fds:
+        try:
+            os.close(fds.pop())
+        except OSError:
+            pass
+
+
+class _ForkedJob:
+    """zygote가 fork 한 child 하나. stream_process 가 쓰는 Popen 흉내 (stdout/stderr, wait, kill, returncode)"""
+
+    def __init__(self, worker: "WarmWorker", stdout, stderr, holders: List[int], pid: int):
+        self.worker = worker
+        self.stdout, self.stderr = stdout, stderr
+        self.holders = holders
+        self.pid = pid
+        self.returncode = None
+
+    def wait(self, timeout: float | None = None) -> int:
+        if self.returncode is None:
+            reply = self.worker._read_reply(timeout)
+            if reply is None:
+                raise subprocess.TimeoutExpired(f"warm job {self.pid}", timeout)
+            self.returncode = reply.get("returncode", -1)
+            _close_fds(self.holders)   # child가 끝났으니 EOF가 오도록
+        return self.returncode
+
+    def kill(self) -> None:
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class WarmWorker:
+    """
+    대상 interpreter로 띄운 zygote 하나 (preload 모듈 import 가 끝난 상태로 대기).
+    job마다 zygote가 fork → child는 깨끗한 상태에서 실행 (job끼리는 격리, import 비용만 공유)
+    """
+
+    def __init__(self, python: str, preload: List[str]):
+        self.python = python
+        self.preload = list(preload)
+        self.jobs = 0
+        self.broken = False   # reply 순서가 어긋났을 수 있음 → 다시 쓰지 않음
+        t0 = time.perf_counter()
+        self.proc = subprocess.Popen(
+            [python, "-u", "-c", ZYGOTE, json.dumps(self.preload)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd="/", start_new_session=True,
+        )
+        self._buf = b""
+        ready = self._read_reply(START_TIMEOUT)
+        if not ready or not ready.get("ready"):
+            self.close()
+            raise WarmPoolError(f"warm worker failed to start: {python}")
+        self.start_ms = int((time.perf_counter() - t0) * 1000)
+        self.preloaded = ready.get("preloaded", [])
+        self.failed = ready.get("failed", {})
+        self.start_rss = _rss(self.proc.pid)
+
+    def _read_reply(self, timeout: float | None) -> Dict[str, Any] | None:
+        """zygote stdout 에서 JSON 한 줄 (timeout 이면 None, zygote가 죽었으면 returncode -1)"""
+        fd = self.proc.stdout.fileno()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b"\n" not in self._buf:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([fd], [], [], wait)
+            if not readable:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return {"returncode": -1, "error": "warm worker exited"}
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return json.loads(line)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def rss(self) -> int:
+        return _rss(self.proc.pid)
+
+    def should_recycle(self, max_jobs: int, max_rss_growth: float) -> bool:
+        if self.broken or not self.alive() or self.jobs >= max_jobs:
+            return True
+        return bool(self.start_rss) and self.rss() > self.start_rss * (1 + max_rss_growth)
+
+    def run(self, path: str, argv: List[str] | None = None,
+            cwd: str | None = None, env: Dict[str, str] | None = None, timeout: float | None = None,
+            on_output: OutputCallback | None = None, tail_bytes: int = DEFAULT_TAIL_BYTES,
+            flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> Dict[str, object]:
+        """
+        script path 실행 → run_streaming 과 같은 결과 {"returncode", "stdout", "stderr", "timed_out", "truncated"}
+        job을 보낸 뒤의 실패는 WarmJobError (worker는 broken 으로 표시되어 교체됨)
+        """
+        fifo_dir = tempfile.mkdtemp(prefix="warm-job-")
+        readers, holders = {}, []
+        try:
+            fifos = {}
+            for name in ("stdout", "stderr"):
+                fifos[name] = os.path.join(fifo_dir, name)
+                os.mkfifo(fifos[name])
+            # 읽는 쪽을 먼저 열어 둬야 child의 O_WRONLY open 이 막히지 않음
+            # 쓰는 쪽도 하나 잡아 둠 → child가 열기 전에 EOF로 끝나지 않게 (job이 끝나면 닫음)
+            readers = {name: os.fdopen(os.open(p, os.O_RDONLY | os.O_NONBLOCK), "rb", buffering=0)
+                       for name, p in fifos.items()}
+            holders = [os.open(p, os.O_WRONLY) for p in fifos.values()]
+            for r in readers.values():
+                os.set_blocking(r.fileno(), True)
+
+            job = {"path": path, "argv": [str(a) for a in argv or []], "cwd": cwd,
+                   "env": {"PYTHONUNBUFFERED": "1", **(env or {})}, **fifos}
+            self.jobs += 1
+            try:
+                self.proc.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+                self.proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self.broken = True
+                raise WarmPoolError(f"warm worker is gone: {e}")
+
+            job_proc = None
+            try:
+                started = self._read_reply(30)
+                if not started or "pid" not in started:
+                    raise WarmJobError(f"warm worker did not fork: {started}")
+                job_proc = _ForkedJob(self, readers["stdout"], readers["stderr"], holders, started["pid"])
+                readers = {}   # 이제 stream_process 가 닫음
+                return stream_process(job_proc, timeout, on_output, tail_bytes, flush_interval)
+            except BaseException as e:
+                self.broken = True
+                if job_proc is not None:
+                    job_proc.kill()
+                if isinstance(e, WarmJobError):
+                    raise
+                raise WarmJobError(f"warm job failed: {e}") from e
+        finally:
+            for r in readers.values():
+                r.close()
+            _close_fds(holders)
+            shutil.rmtree(fifo_dir, ignore_errors=True)
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+            self.proc.wait()
+
+
+class WarmPool:
+    """
+    interpreter + preload 조합 하나에 대한 warm worker 묶음 (size개, 한 worker = 동시에 job 하나)
+    job 수 / RSS 증가가 한도를 넘거나 zygote가 죽으면 반납할 때 교체하고, 새 worker는 백그라운드에서 미리 띄움
+    """
+
+    def __init__(self, python: str, preload: List[str], size: int = DEFAULT_SIZE,
+                 max_jobs: int = MAX_JOBS, max_rss_growth: float = MAX_RSS_GROWTH):
+        self.python = python
+        self.preload = list(preload)
+        self.size = max(1, size)
+        self.max_jobs = max_jobs
+        self.max_rss_growth = max_rss_growth
+        self._idle: "queue.Queue[WarmWorker | None]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self.stats = {"jobs": 0, "starts": 0, "recycles": 0, "start_ms": 0}
+
+    def prestart(self) -> None:
+        """worker size개를 백그라운드에서 띄움 (한 번만)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            self._spawn_async()
+
+    def _spawn(self) -> None:
+        try:
+            worker = WarmWorker(self.python, self.preload)
+        except (WarmPoolError, OSError):
+            worker = None   # acquire 쪽에서 다시 시도
+        else:
+            with self._lock:
+                self.stats["starts"] += 1
+                self.stats["start_ms"] += worker.start_ms
+        self._idle.put(worker)
+
+    def _spawn_async(self) -> None:
+        threading.Thread(target=self._spawn, name="WarmWorkerStart", daemon=True).start()
+
+    def run(self, **job) -> Dict[str, object]:
+        """빈 worker 하나로 job 실행 (모두 사용 중이면 기다림)"""
+        self.prestart()
+        worker = self._idle.get()
+        if worker is None or not worker.alive():
+            if worker is not None:
+                worker.close()
+            try:
+                worker = WarmWorker(self.python, self.preload)
+            except (WarmPoolError, OSError):
+                self._idle.put(None)   # 자리는 돌려놓고, 호출한 쪽이 cold 실행
+                raise
+            with self._lock:
+                self.stats["starts"] += 1
+                self.stats["start_ms"] += worker.start_ms
+        try:
+            return worker.run(**job)
+        finally:
+            with self._lock:
+                self.stats["jobs"] += 1
+            if worker.should_recycle(self.max_jobs, self.max_rss_growth):
+                worker.close()
+                with self._lock:
+                    self.stats["recycles"] += 1
+                self._spawn_async()
+            else:
+                self._idle.put(worker)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"python": self.python, "preload": self.preload, "size": self.size, **self.stats}
+
+
+_pools: Dict[Tuple[str, Tuple[str, ...]], WarmPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(python: str, preload: List[str] | None = None) -> WarmPool:
+    """interpreter(venv python) + preload 별 pool (처음 부를 때 생성)"""
+    modules = tuple(DEFAULT_PRELOAD if preload is None else preload)
+    key = (os.path.abspath(python), modules)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = WarmPool(key[0], list(modules))
+        return _pools[key]
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [p.info() for p in pools]
+
+
+def use_warm(warm: bool | None) -> bool:
+    """warm 인자가 없으면 WARM_POOL=1 일 때만 (opt-in)"""
+    return (ENABLED if warm is None else bool(warm)) and SUPPORTED
+
+
+def run_warm(python: str, preload: List[str] | None = None, emit=None, **job) -> Dict[str, object] | None:
+    """
+    warm worker로 실행 → run_streaming 과 같은 결과. job을 보내기 전에 실패하면 None (호출한 쪽이 cold 실행)
+    job을 보낸 뒤 실패하면 returncode -1 결과 (같은 코드를 cold로 한 번 더 돌리지 않도록)
+    emit 이 있으면 출력을 emit({"data"}, stream=name) 로 흘리고 마지막 부분만, 없으면 전체 출력
+    """
+    try:
+        return get_pool(python, preload).run(
+            on_output=(lambda name, text: emit({"data": text}, stream=name)) if emit else None,
+            tail_bytes=DEFAULT_TAIL_BYTES if emit else FULL_OUTPUT_BYTES,
+            **job,
+        )
+    except WarmJobError as e:
+        return {"returncode": -1, "stdout": "", "stderr": str(e), "timed_out": False, "truncated": False}
+    except (WarmPoolError, OSError):
+        return None
@@ -0,0 +1,90 @@
+# utils/warm_zygote.py
+# warm worker (forkserver 방식) — 대상 interpreter(venv python 포함)로 단독 실행되므로 표준 라이브러리만 사용
+#
+#   python -c "<이 파일 내용>" '["torch", "numpy"]'   (utils/warm_pool.py 가 실행, cwd="/")
+#
+# 시작 시 preload 모듈을 import 한 뒤 stdout에 {"ready", "pid", "preloaded", "failed"} 한 줄
+# 이후 stdin 한 줄 = job {"path", "argv", "cwd", "env", "stdout", "stderr"(FIFO 경로)}
+#   → fork 한 child에서 실행, stdout에 {"pid"} 한 줄, child 종료 후 {"pid", "returncode"} 한 줄
+# job은 매번 새 child에서 돌므로 job 사이에 상태가 남지 않음 (zygote 자신은 job 코드를 실행하지 않음)
+import json
+import os
+import sys
+import traceback
+
+
+def _reply(obj):
+    sys.stdout.write(json.dumps(obj) + "\n")
+    sys.stdout.flush()
+
+
+def _exit_code(status):
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return 1
+
+
+def _child(job):
+    os.setsid()   # 새 process group → timeout 시 child가 띄운 process까지 한 번에 kill
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.dup2(os.open(job["stdout"], os.O_WRONLY), 1)
+    os.dup2(os.open(job["stderr"], os.O_WRONLY), 2)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", buffering=1, closefd=False)
+    sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+    os.environ.update(job.get("env") or {})
+    if job.get("cwd"):
+        os.chdir(job["cwd"])
+    code = 0
+    try:
+        # python <path> 와 같게: sys.argv, sys.path[0] = script 디렉터리, __file__
+        import runpy
+        sys.argv = [job["path"], *job.get("argv", [])]
+        sys.path.insert(0, os.path.dirname(os.path.abspath(job["path"])))
+        runpy.run_path(job["path"], run_name="__main__")
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        if not isinstance(e.code, (int, type(None))):
+            print(e.code, file=sys.stderr)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def main():
+    del sys.path[0]   # -c 의 "" (cwd) 가 job 코드의 import 경로에 섞이지 않게 (job마다 child에서 다시 넣음)
+    preloaded, failed = [], {}
+    for name in json.loads(sys.argv[1]) if len(sys.argv) > 1 else []:
+        try:
+            __import__(name)
+            preloaded.append(name)
+        except BaseException as e:
+            failed[name] = f"{type(e).__name__}: {e}"
+    _reply({"ready": True, "pid": os.getpid(), "preloaded": preloaded, "failed": failed})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            _child(job)
+        _reply({"pid": pid})
+        _, status = os.waitpid(pid, 0)
+        _reply({"pid": pid, "returncode": _exit_code(status)})
+
+
+if __name__ == "__main__":
+    main()
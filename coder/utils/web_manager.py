@@ -1,35 +1,52 @@
-import importlib.util
+import os
 import subprocess
+import sys
+from pathlib import Path
 
+from utils.dist_index import check, installed, marker_env, venv_python
 from utils.handler_registry import register
+from utils.venv_cache import normalize_requirements
+from utils.wheelhouse import Wheelhouse
 
 
 class WebManager:
-    def __init__(self):
-        pass
+    def __init__(self, root: str = "/workspace/"):
+        self.root = Path(root)
+        self.wheelhouse = Wheelhouse(root)
 
     @register("pip_install")
-    def pip_install(self, requirements_path: str) -> dict:
+    def pip_install(self, requirements_path: str, venv_path: str | None = None) -> dict:
+        """
+        requirements 중 대상 환경(venv_path, 없으면 coder 자신)에 없거나 버전이 안 맞는 것만 설치
+        설치 여부는 site-packages 의 *.dist-info 로 판단 (utils/dist_index.py, site-packages mtime이 바뀌면 다시 읽음)
+        """
         try:
             if not requirements_path:
                 return {"stdout": None, "stderr": "requirements_path is empty"}
-            to_install = []
-            with open(requirements_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    s = line.strip()
-                    if s and not s.startswith("#"):
-                        to_install.append(s)
-            missing = []
-            for pkg in to_install:
-                import_name = pkg.split("==")[0].split(">=")[0].split("<=")[0].split(">")[0].split("<")[0]
-                if importlib.util.find_spec(import_name) is None:
-                    missing.append(pkg)
-            if not missing:
+            venv = None
+            python = sys.executable
+            if venv_path:
+                venv = Path(venv_path) if Path(venv_path).is_absolute() else self.root / venv_path
+                python = str(venv_python(venv))
+                if not os.path.exists(python):
+                    return {"stdout": None, "stderr": f"venv python not found: {python}"}
+
+            requirements = normalize_requirements(Path(requirements_path))
+            report = check(requirements, installed(venv), marker_env(python))
+            to_install = report["missing"] + [m["requirement"] for m in report["mismatched"]]
+            if not to_install:
                 return {"stdout": "All packages already installed", "stderr": None}
-            result = subprocess.run(["pip", "install", *missing], capture_output=True, text=True)
-            if result.returncode != 0:
-                return {"stdout": result.stdout, "stderr": result.stderr}
-            return {"stdout": result.stdout, "stderr": None}
+
+            # wheelhouse 기준 --no-index 설치 (처음 보는 묶음은 wheel을 병렬로 받아 둔 뒤)
+            res = self.wheelhouse.install([python], packages=to_install, options=report["options"])
+            summary = (
+                f"[pip_install] missing {len(report['missing'])}, mismatched {len(report['mismatched'])}, "
+                f"satisfied {len(report['satisfied'])}, skipped(marker) {len(report['skipped'])}\n"
+                f"[wheelhouse] {res['mode']} install {res['install_ms']}ms (saved ~{res['saved_ms']}ms)"
+            )
+            return {"stdout": f"{res['stdout']}{summary}\n", "stderr": None}
+        except subprocess.CalledProcessError as cpe:
+            return {"stdout": cpe.output, "stderr": cpe.stderr}
         except Exception as e:
             return {"stdout": None, "stderr": str(e)}
 
@@ -0,0 +1,272 @@
+# utils/wheelhouse.py
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .file_lock import PathLock
+from .venv_cache import interpreter_info, normalize_requirements
+
+WHEELHOUSE_DIR = ".wheelhouse"     # workspace root 아래
+BOOTSTRAP = ["pip", "setuptools", "wheel"]
+OFFLINE = os.environ.get("WHEELHOUSE_OFFLINE") == "1"   # air-gapped: network 없이 wheelhouse만 사용
+DEFAULT_WORKERS = 8
+
+_INDEX_OPTS = ("-i ", "--index-url", "--extra-index-url", "-f ", "--find-links", "--trusted-host", "--pre")
+
+
+class WheelhouseError(Exception):
+    pass
+
+
+def canonical(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def index_options(requirements: List[str]) -> List[str]:
+    """requirements 안의 index 관련 옵션 (패키지별 pip wheel에도 그대로 넘김)"""
+    opts = []
+    for line in requirements:
+        if line.startswith(_INDEX_OPTS):
+            opts += line.split(None, 1)
+    return opts
+
+
+def _run(cmd: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True)
+
+
+class Wheelhouse:
+    """
+    coder 로컬 wheel 저장소 (<workspace>/.wheelhouse/wheels).
+    - prewarm : pip install --dry-run --report 로 한 번 resolve → 고정된 버전마다 pip wheel --no-deps 를 병렬 실행
+    - install : pip install --no-index --find-links wheels (wheelhouse에 없으면 prewarm 후, 그래도 실패하면 일반 설치)
+    prewarm 한 requirements 묶음은 index.json 에 기록 (key = requirements + interpreter)
+    saved_ms 는 offline 설치마다 그 묶음의 prewarm(resolve + download/build) 시간을 더한 추정치
+    """
+
+    def __init__(self, workspace: str | Path, max_workers: int = DEFAULT_WORKERS):
+        self.root = Path(workspace) / WHEELHOUSE_DIR
+        self.wheels = self.root / "wheels"
+        self.max_workers = max_workers
+
+    def key(self, python: List[str], requirements: List[str]) -> str:
+        h = hashlib.sha256()
+        for part in [interpreter_info(python) or " ".join(python), *requirements]:
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()[:24]
+
+    # ---------- prewarm ----------
+    def prewarm(self, python: List[str], req_path: Path | None = None, packages: List[str] | None = None,
+                max_workers: int | None = None, options: List[str] | None = None) -> Dict[str, Any]:
+        """
+        requirements 를 resolve 해서 필요한 wheel을 병렬로 받아 둠 → {"key", "pins", "fetched", "cached", "failed", "prewarm_ms"}
+        options → packages 와 같이 쓸 requirements 옵션 줄 (예: "--index-url https://..."), 패키지 이름과 섞지 않음
+        """
+        if OFFLINE:
+            raise WheelhouseError("WHEELHOUSE_OFFLINE=1: prewarm needs network")
+        requirements = self._requirements(req_path, packages, options)
+        key = self.key(python, requirements)
+        opts = index_options(requirements)
+        self.wheels.mkdir(parents=True, exist_ok=True)
+
+        t0 = time.perf_counter()
+        with PathLock(self.root / "prewarm"):
+            pins = self._resolve(python, req_path, packages, opts)
+            if pins is None:
+                # --report 없는 오래된 pip → 한 번에 serial download
+                args = ["-r", str(req_path)] if req_path else [*opts, *(packages or [])]
+                res = _run([*python, "-m", "pip", "download", "-d", str(self.wheels), *args, *BOOTSTRAP])
+                if res.returncode != 0:
+                    raise WheelhouseError(res.stderr.strip() or f"pip download returncode={res.returncode}")
+                pins, fetched, cached, failed = [], [], 0, {}
+            else:
+                have = self._have()
+                todo = [spec for spec in pins + BOOTSTRAP if not self._cached(spec, have)]
+                cached = len(pins) + len(BOOTSTRAP) - len(todo)
+                workers = max(1, min(max_workers or self.max_workers, len(todo) or 1))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wheel-fetch") as pool:
+                    results = list(pool.map(lambda spec: self._fetch(python, spec, opts), todo))
+                fetched = [spec for spec, err in zip(todo, results) if err is None]
+                failed = {spec: err for spec, err in zip(todo, results) if err is not None}
+        prewarm_ms = int((time.perf_counter() - t0) * 1000)
+
+        if not failed:
+            with PathLock(self.root / "index"):
+                index = self._read_json(self.root / "index.json")
+                # 이미 받아 둔 묶음을 다시 prewarm 하면 빨리 끝남 → 처음(cold) 시간 유지
+                cold_ms = max(prewarm_ms, index.get(key, {}).get("prewarm_ms", 0))
+                index[key] = {"requirements": requirements, "pins": pins, "prewarm_ms": cold_ms,
+                              "created": time.time()}
+                self._write_json(self.root / "index.json", index)
+        self._count(prewarms=1, prewarm_ms=prewarm_ms)
+        return {"key": key, "pins": len(pins), "fetched": fetched, "cached": cached,
+                "failed": failed, "prewarm_ms": prewarm_ms}
+
+    def _resolve(self, python: List[str], req_path: Path | None, packages: List[str] | None,
+                 opts: List[str]) -> List[str] | None:
+        """pip 로 전체 의존성 resolve → 고정 spec 목록 ("name==ver" / "name @ url"). --report 미지원이면 None"""
+        fd, report = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            args = ["-r", str(req_path)] if req_path else [*opts, *(packages or [])]
+            res = _run([*python, "-m", "pip", "install", "--dry-run", "--ignore-installed", "--quiet",
+                        "--report", report, *args])
+            if res.returncode != 0:
+                if "no such option: --report" in res.stderr or "no such option: --dry-run" in res.stderr:
+                    return None
+                raise WheelhouseError(res.stderr.strip() or f"pip resolve returncode={res.returncode}")
+            with open(report, "r", encoding="utf-8") as f:
+                items = json.load(f).get("install", [])
+        finally:
+            os.remove(report)
+
+        pins = []
+        for item in items:
+            name, version = item["metadata"]["name"], item["metadata"]["version"]
+            info = item.get("download_info", {})
+            url = info.get("url", "")
+            if not item.get("is_direct"):
+                pins.append(f"{name}=={version}")
+            elif url.startswith("file:"):
+                continue   # local 프로젝트는 설치할 때 매번 build (wheel로 굳혀 두면 수정이 반영 안 됨)
+            elif "vcs_info" in info:
+                pins.append(f"{name} @ {info['vcs_info']['vcs']}+{url}@{info['vcs_info']['commit_id']}")
+            else:
+                pins.append(f"{name} @ {url}")
+        return pins
+
+    def _fetch(self, python: List[str], spec: str, opts: List[str]) -> str | None:
+        """spec 하나를 wheel로 (PyPI에 wheel이 있으면 download, 없으면 build). 실패 시 에러 메시지"""
+        res = _run([*python, "-m", "pip", "wheel", "--no-deps", "--quiet", "-w", str(self.wheels), *opts, spec])
+        if res.returncode != 0:
+            return res.stderr.strip()[-2000:] or f"pip wheel returncode={res.returncode}"
+        return None
+
+    def _have(self) -> Dict[str, set]:
+        """wheelhouse 안의 {name: {version, ...}}"""
+        have: Dict[str, set] = {}
+        if self.wheels.exists():
+            for fp in self.wheels.iterdir():
+                parts = fp.name.split("-")
+                if fp.suffix in (".whl", ".gz", ".zip") and len(parts) >= 2:
+                    version = parts[1].removesuffix(".tar.gz").removesuffix(".zip")
+                    have.setdefault(canonical(parts[0]), set()).add(version)
+        return have
+
+    @staticmethod
+    def _cached(spec: str, have: Dict[str, set]) -> bool:
+        if " @ " in spec:
+            return False
+        name, _, version = spec.partition("==")
+        versions = have.get(canonical(name), set())
+        return bool(versions) if not version else version in versions
+
+    # ---------- install ----------
+    def install(self, python: List[str], req_path: Path | None = None, packages: List[str] | None = None,
+                upgrade: bool = False, options: List[str] | None = None) -> Dict[str, Any]:
+        """
+        wheelhouse 기준 설치 → {"mode": "offline" | "online", "install_ms", "saved_ms", "prewarm", "stdout"}
+        options → prewarm 과 같음 (index 옵션은 online 설치에만 넘김). 실패 시 CalledProcessError
+        """
+        requirements = self._requirements(req_path, packages, options)
+        key = self.key(python, requirements)
+        args = (["-U"] if upgrade else []) + (["-r", str(req_path)] if req_path else list(packages or []))
+
+        prewarm = None
+        entry = self._read_json(self.root / "index.json").get(key)
+        if entry is None and not OFFLINE:
+            try:
+                prewarm = self.prewarm(python, req_path, packages, options=options)
+            except (WheelhouseError, OSError) as e:
+                prewarm = {"error": str(e)}
+            entry = self._read_json(self.root / "index.json").get(key)
+
+        t0 = time.perf_counter()
+        mode = "offline"
+        cmd = [*python, "-m", "pip", "install", "--no-index", "--find-links", str(self.wheels), *args]
+        res = _run(cmd)
+        if res.returncode != 0 and not OFFLINE:
+            mode = "online"
+            cmd = [*python, "-m", "pip", "install", *index_options(options or []), *args]
+            res = _run(cmd)
+        install_ms = int((time.perf_counter() - t0) * 1000)
+        if res.returncode != 0:
+            raise subprocess.CalledProcessError(res.returncode, cmd, res.stdout, res.stderr)
+
+        # 방금 prewarm 했으면 그 시간은 이번 설치에서 아낀 게 아님
+        saved_ms = entry["prewarm_ms"] if mode == "offline" and entry and prewarm is None else 0
+        self._count(**{f"{mode}_installs": 1, "install_ms": install_ms, "saved_ms": saved_ms})
+        return {"mode": mode, "install_ms": install_ms, "saved_ms": saved_ms, "prewarm": prewarm,
+                "stdout": res.stdout}
+
+    def bootstrap_pip(self, py: Path) -> None:
+        """pip 없는 venv (ensurepip 없는 Debian python 등)에 wheelhouse의 pip wheel로 pip 설치 (get-pip.py 대신)"""
+        wheel = self._find_wheel("pip")
+        if wheel is None and not OFFLINE:
+            self.prewarm([sys.executable], packages=["pip"])
+            wheel = self._find_wheel("pip")
+        if wheel is None:
+            raise WheelhouseError(f"no pip wheel in {self.wheels}")
+        # pip wheel은 zip 안의 pip 패키지를 그대로 실행할 수 있음
+        subprocess.check_call([str(py), str(wheel / "pip"), "install", "--no-index",
+                               "--find-links", str(self.wheels), "pip"])
+
+    def _find_wheel(self, name: str) -> Path | None:
+        found = sorted(self.wheels.glob(f"{name}-*-py3-none-any.whl")) if self.wheels.exists() else []
+        return found[-1] if found else None
+
+    # ---------- report ----------
+    def stats(self) -> Dict[str, Any]:
+        counts = self._read_json(self.root / "stats.json")
+        wheels = list(self.wheels.iterdir()) if self.wheels.exists() else []
+        return {
+            **{"prewarms": 0, "prewarm_ms": 0, "offline_installs": 0, "online_installs": 0,
+               "install_ms": 0, "saved_ms": 0},
+            **counts,
+            "sets": len(self._read_json(self.root / "index.json")),
+            "wheels": len(wheels),
+            "bytes": sum(fp.stat().st_size for fp in wheels),
+            "offline": OFFLINE,
+        }
+
+    # ---------- 내부 ----------
+    @staticmethod
+    def _requirements(req_path: Path | None, packages: List[str] | None, options: List[str] | None = None) -> List[str]:
+        """key 용 requirements. 패키지 이름만 정규화/정렬, 옵션 줄은 순서 그대로 뒤에 붙임"""
+        if req_path:
+            return normalize_requirements(req_path)
+        names = sorted({canonical(p) if re.fullmatch(r"[A-Za-z0-9._-]+", p) else p for p in packages or []})
+        return names + list(options or [])
+
+    @staticmethod
+    def _read_json(path: Path) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def _count(self, **fields: int) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with PathLock(self.root / "stats"):
+            counts = self._read_json(self.root / "stats.json")
+            for name, n in fields.items():
+                counts[name] = counts.get(name, 0) + n
+            self._write_json(self.root / "stats.json", counts)
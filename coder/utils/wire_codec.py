@@ -0,0 +1,201 @@
+# wire_codec.py
+# Supervisor ↔ Coder 메시지 직렬화/압축 코덱 (프레이밍 위의 payload 형식)
+# supervisor/utils/network/wire_codec.py 와 동일한 내용을 유지해야 함
+#
+# payload 형식
+#   - legacy : UTF-8 JSON 그대로 (첫 바이트가 '{', '[', '"' 등)
+#   - codec  : MAGIC(1) + codec id(1) + compression id(1) + body
+# 수신 측은 첫 바이트로 자동 판별하므로 협상 전/후, 구버전 상대와도 호환됨.
+import json
+import threading
+import time
+import zlib
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+MAGIC = 0xA7   # JSON 텍스트의 첫 바이트로 나올 수 없는 값
+HELLO_TYPE = "codec_hello"
+ACK_TYPE = "codec_ack"
+
+CODEC_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSION_IDS = {"none": 0, "zlib": 1, "zstd": 2}
+_CODEC_NAMES = {v: k for k, v in CODEC_IDS.items()}
+_COMPRESSION_NAMES = {v: k for k, v in COMPRESSION_IDS.items()}
+
+# 협상 시 선호 순서 (앞쪽 우선)
+CODEC_PREFERENCE = ["orjson", "msgpack", "json"]
+COMPRESSION_PREFERENCE = ["zstd", "zlib", "none"]
+DEFAULT_THRESHOLD = 8 * 1024   # 이 크기 이상 body만 압축
+
+
+def available_codecs() -> List[str]:
+    out = ["json"]
+    if orjson is not None:
+        out.append("orjson")
+    if msgpack is not None:
+        out.append("msgpack")
+    return out
+
+
+def available_compressions() -> List[str]:
+    out = ["none", "zlib"]
+    if zstandard is not None:
+        out.append("zstd")
+    return out
+
+
+def _serialize(codec: str, obj: Any) -> bytes:
+    if codec == "orjson":
+        return orjson.dumps(obj)
+    if codec == "msgpack":
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _deserialize(codec: str, body) -> Any:
+    if codec == "orjson":
+        return orjson.loads(body)
+    if codec == "msgpack":
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(bytes(body) if isinstance(body, memoryview) else body)
+
+
+def _compress(compression: str, body: bytes) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if compression == "zlib":
+        return zlib.compress(body, 6)
+    return body
+
+
+def _decompress(compression: str, body) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(bytes(body))
+    if compression == "zlib":
+        return zlib.decompress(body)
+    return body
+
+
+class WireStats:
+    """프레임 단위 바이트/지연 카운터 (raw = 직렬화 결과, wire = 실제 전송 크기)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._c = {
+                "frames_out": 0, "raw_bytes_out": 0, "wire_bytes_out": 0, "encode_ms": 0.0, "compressed_frames_out": 0,
+                "frames_in": 0, "raw_bytes_in": 0, "wire_bytes_in": 0, "decode_ms": 0.0, "compressed_frames_in": 0,
+            }
+
+    def record(self, direction: str, raw: int, wire: int, seconds: float, compressed: bool = False):
+        with self._lock:
+            self._c[f"frames_{direction}"] += 1
+            self._c[f"raw_bytes_{direction}"] += raw
+            self._c[f"wire_bytes_{direction}"] += wire
+            self._c["encode_ms" if direction == "out" else "decode_ms"] += seconds * 1000
+            if compressed:
+                self._c[f"compressed_frames_{direction}"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self._c)
+        for d in ("out", "in"):
+            c[f"ratio_{d}"] = round(c[f"raw_bytes_{d}"] / c[f"wire_bytes_{d}"], 3) if c[f"wire_bytes_{d}"] else None
+        return c
+
+
+class WireCodec:
+    """
+    연결 하나의 인코딩 상태.
+    협상 전(negotiated=False)에는 legacy JSON으로 보내고, decode는 항상 두 형식 모두 처리.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD):
+        self.codec = "json"
+        self.compression = "none"
+        self.threshold = threshold
+        self.negotiated = False
+        self.stats = WireStats()
+
+    # ---------- handshake ----------
+    @staticmethod
+    def hello(**extra) -> Dict[str, Any]:
+        return {"type": HELLO_TYPE, "codecs": available_codecs(), "compression": available_compressions(), **extra}
+
+    @staticmethod
+    def is_hello(msg: Any) -> bool:
+        return isinstance(msg, dict) and msg.get("type") == HELLO_TYPE
+
+    @staticmethod
+    def is_ack(msg: Any) -> bool:
+        return isinstance(msg, dict) and msg.get("type") == ACK_TYPE
+
+    def negotiate(self, hello: Dict[str, Any]) -> Dict[str, Any]:
+        """(server) 상대 hello를 보고 양쪽 모두 지원하는 코덱 선택, ack 메시지 반환"""
+        codec = _pick(CODEC_PREFERENCE, available_codecs(), hello.get("codecs") or ["json"])
+        compression = _pick(COMPRESSION_PREFERENCE, available_compressions(), hello.get("compression") or ["none"])
+        return {"type": ACK_TYPE, "codec": codec, "compression": compression, "threshold": self.threshold}
+
+    def accept(self, ack: Dict[str, Any]) -> None:
+        """ack 내용으로 인코딩 전환 (server는 ack 전송 직후, client는 ack 수신 시)"""
+        codec, compression = ack.get("codec", "json"), ack.get("compression", "none")
+        if codec not in available_codecs() or compression not in available_compressions():
+            return
+        self.codec, self.compression = codec, compression
+        self.threshold = int(ack.get("threshold", self.threshold))
+        self.negotiated = True
+
+    # ---------- encode / decode ----------
+    def encode(self, obj: Any) -> bytes:
+        t0 = time.perf_counter()
+        body = _serialize(self.codec, obj)
+        raw_len = len(body)
+        if not self.negotiated:
+            self.stats.record("out", raw_len, raw_len, time.perf_counter() - t0)
+            return body
+
+        compression = self.compression if raw_len >= self.threshold else "none"
+        if compression != "none":
+            body = _compress(compression, body)
+        data = bytes((MAGIC, CODEC_IDS[self.codec], COMPRESSION_IDS[compression])) + body
+        self.stats.record("out", raw_len, len(data), time.perf_counter() - t0, compression != "none")
+        return data
+
+    def decode(self, data) -> Any:
+        t0 = time.perf_counter()
+        if not data or data[0] != MAGIC:
+            obj = json.loads(data)
+            self.stats.record("in", len(data), len(data), time.perf_counter() - t0)
+            return obj
+
+        codec, compression = _CODEC_NAMES.get(data[1]), _COMPRESSION_NAMES.get(data[2])
+        if codec is None or compression is None:
+            raise ValueError(f"unknown codec header: {bytes(data[:3])!r}")
+        body = _decompress(compression, memoryview(data)[3:])
+        obj = _deserialize(codec, body)
+        self.stats.record("in", len(body), len(data), time.perf_counter() - t0, compression != "none")
+        return obj
+
+
+def _pick(preference: List[str], mine: List[str], theirs: List[str]) -> str:
+    for name in preference:
+        if name in mine and name in theirs:
+            return name
+    return preference[-1]
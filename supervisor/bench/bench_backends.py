@@ -0,0 +1,93 @@
+# bench/bench_backends.py
+"""
+LLM backend 별 tokens/s, time-to-first-token, peak RSS (backend마다 별도 프로세스에서 측정)
+
+    python bench/bench_backends.py
+    python bench/bench_backends.py --backends cpu-fp32 cpu-int8 --threads 8 --tokens 64
+"""
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from llm.backends import BACKENDS, get_backend  # noqa: E402
+
+MODEL_NAME = "Qwen/Qwen2.5-1.5B-Instruct"   # supervisor.py MODEL_NAME 과 동일
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Explain what a Python virtual environment is and why it is useful."},
+]
+
+
+def child(backend: str, model: str, threads: int | None, tokens: int, repeat: int) -> dict:
+    """한 backend 측정 (이 프로세스의 peak RSS가 곧 backend의 메모리)"""
+    from llm.llm_manager import LLMManager
+
+    t0 = time.perf_counter()
+    llm = LLMManager(model, max_batch=0, prefix_cache_size=0, backend=get_backend(backend, threads))
+    llm.load_model()
+    load_s = time.perf_counter() - t0
+
+    llm.generate(MESSAGES, max_new_tokens=4)   # warm-up (compile 포함)
+
+    ttft = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        llm.generate(MESSAGES, max_new_tokens=1)
+        ttft.append((time.perf_counter() - t) * 1000)
+
+    tps = []
+    for _ in range(repeat):
+        input_ids, _ = llm._prepare(MESSAGES, use_prefix_cache=False)
+        t = time.perf_counter()
+        out = llm.model.generate(input_ids=input_ids, max_new_tokens=tokens, min_new_tokens=tokens)
+        elapsed = time.perf_counter() - t
+        tps.append((out.shape[1] - input_ids.shape[1]) / elapsed)
+
+    return {
+        "backend": backend,
+        "load_s": round(load_s, 1),
+        "ttft_ms": round(statistics.median(ttft), 1),
+        "tokens_per_s": round(statistics.median(tps), 2),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--backends", nargs="+", default=[b for b in BACKENDS if b != "auto"])
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--tokens", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.model, args.threads, args.tokens, args.repeat)))
+        return
+
+    print(f"model={args.model} threads={args.threads or 'default'} tokens={args.tokens}")
+    print(f"{'backend':>18} {'load_s':>7} {'ttft_ms':>8} {'tok/s':>7} {'peak_rss_mb':>12}")
+    for name in args.backends:
+        cmd = [sys.executable, __file__, "--child", name, "--model", args.model,
+               "--tokens", str(args.tokens), "--repeat", str(args.repeat)]
+        if args.threads:
+            cmd += ["--threads", str(args.threads)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"{name:>18} failed: {proc.stderr.strip().splitlines()[-1:] or proc.returncode}")
+            continue
+        r = json.loads(lines[-1])
+        print(f"{name:>18} {r['load_s']:>7} {r['ttft_ms']:>8} {r['tokens_per_s']:>7} {r['peak_rss_mb']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# bench/bench_framing.py
+"""
+프레이밍 수신 처리량(MB/s) 측정: 기존 구현(before) vs utils.network.framing(after)
+
+    python bench/bench_framing.py
+    python bench/bench_framing.py --sizes 1K 1M 50M --total-mb 100
+"""
+import argparse
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.network.framing import FrameReader, send_frame  # noqa: E402
+
+
+def legacy_coder_recv(sock, count):
+    """이전 CoderClient.handle_connection: data += packet"""
+    for _ in range(count):
+        raw_len = sock.recv(4)
+        msg_len = struct.unpack("!I", raw_len)[0]
+        data = b""
+        while len(data) < msg_len:
+            packet = sock.recv(msg_len - len(data))
+            if not packet:
+                return
+            data += packet
+
+
+def legacy_server_recv(sock, count):
+    """이전 SupervisorServer.handle_client: 4096 chunk + buffer 재슬라이싱"""
+    buffer = b""
+    expected_len = None
+    got = 0
+    while got < count:
+        chunk = sock.recv(4096)
+        if not chunk:
+            return
+        buffer += chunk
+        while True:
+            if expected_len is None:
+                if len(buffer) >= 4:
+                    expected_len = struct.unpack("!I", buffer[:4])[0]
+                    buffer = buffer[4:]
+                else:
+                    break
+            if expected_len is not None and len(buffer) >= expected_len:
+                buffer = buffer[expected_len:]
+                expected_len = None
+                got += 1
+            else:
+                break
+
+
+def framing_recv(sock, count):
+    reader = FrameReader(sock)
+    for _ in range(count):
+        if reader.read_frame() is None:
+            return
+
+
+def run_case(recv_fn, size: int, count: int) -> float:
+    a, b = socket.socketpair()
+    payload = b"x" * size
+
+    def _send():
+        for _ in range(count):
+            send_frame(a, payload)
+
+    t = threading.Thread(target=_send, daemon=True)
+    t0 = time.perf_counter()
+    t.start()
+    recv_fn(b, count)
+    elapsed = time.perf_counter() - t0
+    t.join()
+    a.close()
+    b.close()
+    return (size * count) / (1024 * 1024) / elapsed
+
+
+def parse_size(s: str) -> int:
+    units = {"K": 1024, "M": 1024 * 1024}
+    s = s.upper()
+    if s[-1] in units:
+        return int(float(s[:-1]) * units[s[-1]])
+    return int(s)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", nargs="+", default=["1K", "64K", "1M", "10M", "50M"])
+    ap.add_argument("--total-mb", type=float, default=200, help="케이스당 전송량(대략)")
+    ap.add_argument("--legacy-max-mb", type=float, default=10,
+                    help="기존 구현은 이 크기를 넘는 프레임에서 2차 시간이 걸려 생략")
+    args = ap.parse_args()
+
+    impls = [
+        ("before: coder", legacy_coder_recv, True),
+        ("before: server", legacy_server_recv, True),
+        ("after: framing", framing_recv, False),
+    ]
+    print(f"{'frame':>8} | " + " | ".join(f"{name:>16}" for name, _, _ in impls) + "   (MB/s)")
+    for label in args.sizes:
+        size = parse_size(label)
+        count = max(1, int(args.total_mb * 1024 * 1024 / size))
+        cols = []
+        for _name, fn, legacy in impls:
+            if legacy and size > args.legacy_max_mb * 1024 * 1024:
+                cols.append(f"{'skipped':>16}")
+                continue
+            n = min(count, 3) if legacy and size >= 1024 * 1024 else count
+            cols.append(f"{run_case(fn, size, n):>16.1f}")
+        print(f"{label:>8} | " + " | ".join(cols))
+
+
+if __name__ == "__main__":
+    main()
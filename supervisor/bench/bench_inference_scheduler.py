@@ -0,0 +1,65 @@
+# bench/bench_inference_scheduler.py
+"""
+동시 요청 처리량: InferenceScheduler max_batch 별 requests/s
+
+    python bench/bench_inference_scheduler.py
+    python bench/bench_inference_scheduler.py --clients 16 --batches 1 4 8 16 --tokens 32
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from llm.inference_scheduler import InferenceScheduler  # noqa: E402
+from llm.llm_manager import LLMManager  # noqa: E402
+
+
+def run(llm: LLMManager, max_batch: int, clients: int, requests: int, tokens: int) -> dict:
+    llm.scheduler = InferenceScheduler(llm, max_batch=max_batch, window_ms=5.0)
+    barrier = threading.Barrier(clients + 1)
+
+    def client(i):
+        barrier.wait()
+        for j in range(requests):
+            messages = [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": f"Give me fact #{i * requests + j} about Python."},
+            ]
+            llm.generate(messages, max_new_tokens=tokens, use_prefix_cache=False)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"elapsed": elapsed, "rps": clients * requests / elapsed, **llm.scheduler.snapshot()}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="Qwen/Qwen2.5-1.5B-Instruct")
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=4, help="client당 요청 수")
+    ap.add_argument("--tokens", type=int, default=32)
+    ap.add_argument("--batches", nargs="+", type=int, default=[1, 2, 4, 8])
+    args = ap.parse_args()
+
+    llm = LLMManager(args.model, max_batch=0)
+    llm.load_model()
+    llm.generate([{"role": "user", "content": "hi"}], max_new_tokens=4)   # warm-up
+
+    print(f"clients={args.clients} requests/client={args.requests} max_new_tokens={args.tokens}")
+    print(f"{'max_batch':>9} {'elapsed_s':>10} {'req/s':>8} {'avg_batch':>10}")
+    for b in args.batches:
+        r = run(llm, b, args.clients, args.requests, args.tokens)
+        print(f"{b:>9} {r['elapsed']:>10.2f} {r['rps']:>8.2f} {r['avg_batch']:>10}")
+
+
+if __name__ == "__main__":
+    main()
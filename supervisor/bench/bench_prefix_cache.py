@@ -0,0 +1,68 @@
+# bench/bench_prefix_cache.py
+"""
+prompts.yaml 의 system prompt별 time-to-first-token: prefix KV cache 없이 vs 있을 때
+
+    python bench/bench_prefix_cache.py
+    python bench/bench_prefix_cache.py --model Qwen/Qwen2.5-1.5B-Instruct --keys classifier edit --repeat 5
+
+TTFT = generate(max_new_tokens=1) 소요 시간 (prefill + 첫 토큰)
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from llm.llm_manager import LLMManager  # noqa: E402
+
+DEFAULT_KEYS = ["classifier", "intent_classifier", "summarize_experiment", "edit"]
+USER_TEXT = "https://github.com/example/project 이 프로젝트 실행해줘"
+
+
+def ttft_ms(llm: LLMManager, messages, use_cache: bool, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        llm.generate(messages, max_new_tokens=1, use_prefix_cache=use_cache)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="Qwen/Qwen2.5-1.5B-Instruct")
+    ap.add_argument("--keys", nargs="+", default=DEFAULT_KEYS)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    prompts_path = Path(__file__).resolve().parents[1] / "config" / "prompts.yaml"
+    with open(prompts_path, "r", encoding="utf-8") as f:
+        prompts = yaml.safe_load(f)
+
+    llm = LLMManager(args.model)
+    llm.load_model()
+
+    print(f"{'prompt':>22} {'prefix_tok':>10} {'no_cache_ms':>12} {'cache_ms':>10} {'speedup':>8}")
+    for key in args.keys:
+        messages = [
+            {"role": "system", "content": prompts[key]},
+            {"role": "user", "content": USER_TEXT},
+        ]
+        prefix_text = llm.tokenizer.apply_chat_template(messages[:1], tokenize=False)
+        prefix_tok = len(llm.tokenizer(prefix_text).input_ids)
+
+        llm.generate(messages, max_new_tokens=1, use_prefix_cache=False)   # warm-up
+        cold = ttft_ms(llm, messages, use_cache=False, repeat=args.repeat)
+        llm.generate(messages, max_new_tokens=1, use_prefix_cache=True)    # prefix prefill
+        warm = ttft_ms(llm, messages, use_cache=True, repeat=args.repeat)
+        print(f"{key:>22} {prefix_tok:>10} {cold:>12.1f} {warm:>10.1f} {cold / warm:>7.1f}x")
+
+    print("prefix cache:", llm.prefix_stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# bench/bench_prompts.py
+"""
+config/prompts.yaml 의 실제 prompt로 LLMManager 측정 (prompt key 별)
+prompt tokens, time-to-first-token, decode tokens/s, peak memory, end-to-end latency p50/p90/p99
+
+    python bench/bench_prompts.py --out base.json
+    python bench/bench_prompts.py --backend cpu-int8 --threads 8 --out int8.json
+    python bench/bench_prompts.py --model Qwen/Qwen2.5-0.5B-Instruct --repeat 1 --max-tokens 32   # CI용 작은 모델
+    python bench/bench_prompts.py --compare base.json int8.json --threshold 0.1                  # 회귀 있으면 exit 1
+"""
+import argparse
+import json
+import math
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench.prompt_cases import CASES  # noqa: E402
+from llm.backends import get_backend  # noqa: E402
+from utils.intent import IntentClassifier  # noqa: E402
+from utils.router import CommandRouter  # noqa: E402
+
+MODEL_NAME = "Qwen/Qwen2.5-1.5B-Instruct"   # supervisor.py MODEL_NAME 과 동일
+PROMPTS_PATH = Path(__file__).resolve().parents[1] / "config" / "prompts.yaml"
+LABELS = {"classifier": CommandRouter.LABELS, "intent_classifier": IntentClassifier.LABELS}
+
+# 비교할 지표: (이름, 클수록 나쁜지)
+METRICS = [
+    ("prompt_tokens", True),
+    ("ttft_ms", True),
+    ("decode_tok_s", False),
+    ("latency_p50_ms", True),
+    ("latency_p90_ms", True),
+    ("latency_p99_ms", True),
+    ("peak_rss_mb", True),
+    ("peak_cuda_mb", True),
+]
+
+
+class TokenTimer:
+    """model.generate streamer: 첫 put은 prompt, 이후 put마다 새 토큰 시각 기록"""
+
+    def __init__(self):
+        self.prompt_seen = False
+        self.times: list[float] = []
+
+    def put(self, value):
+        if not self.prompt_seen:
+            self.prompt_seen = True
+            return
+        self.times.append(time.perf_counter())
+
+    def end(self):
+        pass
+
+
+def percentile(values: list[float], p: float) -> float:
+    """nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _peak_cuda_reset():
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.reset_peak_memory_stats()
+    except ImportError:
+        pass
+
+
+def _peak_cuda_mb() -> float:
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return round(torch.cuda.max_memory_allocated() / 2**20, 1)
+    except ImportError:
+        pass
+    return 0.0
+
+
+def bench_key(llm, key: str, system: str, repeat: int, max_tokens: int | None) -> dict:
+    kind, new_tokens, inputs = CASES[key]
+    if max_tokens:
+        new_tokens = min(new_tokens, max_tokens)
+
+    prompt_tokens, latency, ttft, decode = [], [], [], []
+    generated = 0
+    _peak_cuda_reset()
+    for _ in range(repeat):
+        for content in inputs:
+            messages = [{"role": "system", "content": system}, {"role": "user", "content": content}]
+            input_ids, _ = llm._prepare(messages, use_prefix_cache=False)
+            prompt_tokens.append(input_ids.shape[1])
+
+            t0 = time.perf_counter()
+            if kind == "classify":
+                llm.classify(messages, LABELS[key])
+                latency.append((time.perf_counter() - t0) * 1000)
+                continue
+
+            timer = TokenTimer()
+            llm._generate(messages, new_tokens, use_prefix_cache=True, streamer=timer)
+            end = time.perf_counter()
+            latency.append((end - t0) * 1000)
+            if timer.times:
+                ttft.append((timer.times[0] - t0) * 1000)
+                generated += len(timer.times)
+                if len(timer.times) > 1:
+                    decode.append((len(timer.times) - 1) / (timer.times[-1] - timer.times[0]))
+
+    return {
+        "kind": kind,
+        "samples": len(latency),
+        "prompt_tokens": round(statistics.mean(prompt_tokens), 1),
+        "new_tokens": round(generated / len(latency), 1) if kind == "generate" else 0,
+        "ttft_ms": round(statistics.median(ttft), 1) if ttft else round(statistics.median(latency), 1),
+        "decode_tok_s": round(statistics.median(decode), 2) if decode else 0.0,
+        "latency_p50_ms": round(percentile(latency, 50), 1),
+        "latency_p90_ms": round(percentile(latency, 90), 1),
+        "latency_p99_ms": round(percentile(latency, 99), 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_cuda_mb": _peak_cuda_mb(),
+    }
+
+
+def run(args) -> dict:
+    from llm.llm_manager import LLMManager
+
+    with open(PROMPTS_PATH, "r", encoding="utf-8") as f:
+        prompts = yaml.safe_load(f)
+
+    t0 = time.perf_counter()
+    llm = LLMManager(args.model, max_batch=0, backend=get_backend(args.backend, args.threads))
+    llm.load_model()
+    load_s = time.perf_counter() - t0
+    llm.generate([{"role": "user", "content": "hi"}], max_new_tokens=4)   # warm-up
+
+    results = {}
+    for key in args.keys:
+        results[key] = bench_key(llm, key, prompts[key], args.repeat, args.max_tokens)
+        print(f"[bench] {key}: {results[key]}", file=sys.stderr)
+    return {
+        "meta": {
+            "model": args.model,
+            "backend": llm.backend.name,
+            "threads": args.threads,
+            "repeat": args.repeat,
+            "max_tokens": args.max_tokens,
+            "load_s": round(load_s, 1),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def print_table(report: dict) -> None:
+    meta = report["meta"]
+    print(f"model={meta['model']} backend={meta['backend']} load_s={meta['load_s']} repeat={meta['repeat']}")
+    cols = ["prompt_tokens", "new_tokens", "ttft_ms", "decode_tok_s",
+            "latency_p50_ms", "latency_p90_ms", "latency_p99_ms", "peak_rss_mb"]
+    print(f"{'key':>20} " + " ".join(f"{c:>14}" for c in cols))
+    for key, r in report["results"].items():
+        print(f"{key:>20} " + " ".join(f"{r[c]:>14}" for c in cols))
+
+
+def compare(base: dict, new: dict, threshold: float) -> int:
+    """두 run 비교표 출력, threshold(비율)보다 나빠진 지표 수 반환"""
+    print(f"base: {base['meta']['model']} / {base['meta']['backend']} ({base['meta']['created']})")
+    print(f"new : {new['meta']['model']} / {new['meta']['backend']} ({new['meta']['created']})")
+    print(f"{'key':>20} {'metric':>15} {'base':>10} {'new':>10} {'change':>8}")
+    regressions = 0
+    for key, b in base["results"].items():
+        n = new["results"].get(key)
+        if n is None:
+            print(f"{key:>20} {'(missing)':>15}")
+            continue
+        for metric, higher_is_worse in METRICS:
+            old_v, new_v = b.get(metric, 0), n.get(metric, 0)
+            if not old_v:
+                continue
+            change = (new_v - old_v) / old_v
+            worse = change > threshold if higher_is_worse else change < -threshold
+            regressions += worse
+            mark = "  REGRESSION" if worse else ""
+            print(f"{key:>20} {metric:>15} {old_v:>10} {new_v:>10} {change:>+8.1%}{mark}")
+    print(f"{regressions} regression(s) (threshold {threshold:.0%})")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default=MODEL_NAME)
+    ap.add_argument("--backend", default="auto")
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--keys", nargs="+", default=list(CASES), choices=list(CASES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--max-tokens", type=int, default=None, help="prompt별 max_new_tokens 상한 (CI에서 짧게)")
+    ap.add_argument("--out", default=None, help="JSON 저장 경로")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), default=None)
+    ap.add_argument("--threshold", type=float, default=0.1)
+    args = ap.parse_args()
+
+    if args.compare:
+        runs = []
+        for path in args.compare:
+            with open(path, "r", encoding="utf-8") as f:
+                runs.append(json.load(f))
+        sys.exit(1 if compare(*runs, args.threshold) else 0)
+
+    report = run(args)
+    print_table(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# bench/bench_supervisor_server.py
+"""
+N개의 가상 coder가 동시에 프레임을 보낼 때 SupervisorServer(thread) vs AsyncSupervisorServer(asyncio) 비교
+
+    python bench/bench_supervisor_server.py
+    python bench/bench_supervisor_server.py --coders 10 100 500 --frames 200 --size 4K --handler-ms 2
+
+측정값
+- send_s    : 모든 coder가 전송을 마친 시간 (서버가 소켓을 늦게 읽으면 coder 쪽 send가 막힘)
+- handled_s : 모든 coder_message 핸들러가 끝난 시간
+- frames/s  : 처리량 (handled 기준)
+- threads   : 실행 중 최대 스레드 수
+"""
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.network.framing import send_frame  # noqa: E402
+from utils.network.supervisor_socket import SupervisorServer  # noqa: E402
+from utils.network.async_supervisor_socket import AsyncSupervisorServer  # noqa: E402
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1024, "M": 1024 * 1024}
+    text = text.upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_case(mode: str, coders: int, frames: int, size: int, handler_ms: float, workers: int) -> dict:
+    port = _free_port()
+    if mode == "asyncio":
+        server = AsyncSupervisorServer("127.0.0.1", port, dispatch_workers=workers)
+    else:
+        server = SupervisorServer("127.0.0.1", port)
+
+    total = coders * frames
+    handled = 0
+    lock = threading.Lock()
+    done = threading.Event()
+    peak_threads = threading.active_count()
+
+    def on_message(msg):
+        nonlocal handled, peak_threads
+        if handler_ms:
+            time.sleep(handler_ms / 1000)   # LLM 호출 같은 느린 핸들러 흉내
+        with lock:
+            handled += 1
+            peak_threads = max(peak_threads, threading.active_count())
+            if handled == total:
+                done.set()
+
+    server.emitter.on("coder_message", on_message)
+    server.run_main()
+    time.sleep(0.2)
+
+    payload = json.dumps({"command": "bench", "action": "noop", "result": "success",
+                          "data": "x" * max(0, size - 80)}).encode()
+    socks = [socket.create_connection(("127.0.0.1", port)) for _ in range(coders)]
+    time.sleep(0.2)
+
+    barrier = threading.Barrier(coders + 1)
+
+    def coder(sock):
+        barrier.wait()
+        for _ in range(frames):
+            send_frame(sock, payload)
+
+    senders = [threading.Thread(target=coder, args=(s,), daemon=True) for s in socks]
+    for t in senders:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in senders:
+        t.join()
+    send_s = time.perf_counter() - start
+    finished = done.wait(timeout=300)
+    handled_s = time.perf_counter() - start
+
+    for s in socks:
+        s.close()
+    if mode != "asyncio":
+        server.server_socket.close()
+    return {
+        "mode": mode,
+        "coders": coders,
+        "send_s": send_s,
+        "handled_s": handled_s if finished else float("nan"),
+        "fps": total / handled_s if finished else 0.0,
+        "threads": peak_threads,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--coders", nargs="+", type=int, default=[10, 100, 300])
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--size", default="4K")
+    ap.add_argument("--handler-ms", type=float, default=0.0)
+    ap.add_argument("--workers", type=int, default=4, help="asyncio dispatch executor 크기")
+    args = ap.parse_args()
+    size = parse_size(args.size)
+
+    print(f"frames/coder={args.frames} size={args.size} handler={args.handler_ms}ms workers={args.workers}")
+    print(f"{'mode':>8} {'coders':>7} {'send_s':>8} {'handled_s':>10} {'frames/s':>10} {'threads':>8}")
+    for n in args.coders:
+        for mode in ("thread", "asyncio"):
+            r = run_case(mode, n, args.frames, size, args.handler_ms, args.workers)
+            print(f"{r['mode']:>8} {r['coders']:>7} {r['send_s']:>8.3f} {r['handled_s']:>10.3f} "
+                  f"{r['fps']:>10.0f} {r['threads']:>8}")
+
+
+if __name__ == "__main__":
+    main()
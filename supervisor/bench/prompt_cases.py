@@ -0,0 +1,105 @@
+# bench/prompt_cases.py
+"""
+bench_prompts.py 가 재생하는 대표 입력 (prompt key → user content 목록)
+실제 handler가 만드는 user 메시지 형식을 그대로 따름
+"""
+
+MODEL_PY = '''import torch.nn as nn
+
+
+class Net(nn.Module):
+    def __init__(self, num_classes: int = 10):
+        super().__init__()
+        self.features = nn.Sequential(
+            nn.Conv2d(1, 32, 3, padding=1), nn.ReLU(), nn.MaxPool2d(2),
+            nn.Conv2d(32, 64, 3, padding=1), nn.ReLU(), nn.MaxPool2d(2),
+        )
+        self.classifier = nn.Sequential(
+            nn.Flatten(), nn.Linear(64 * 7 * 7, 128), nn.ReLU(), nn.Linear(128, num_classes),
+        )
+
+    def forward(self, x):
+        return self.classifier(self.features(x))
+'''
+
+TRAIN_PY = '''import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+from torchvision import datasets, transforms
+
+from model import Net
+
+batch_size = 64
+learning_rate = 0.01
+epochs = 5
+
+
+def main():
+    transform = transforms.Compose([transforms.ToTensor(), transforms.Normalize((0.1307,), (0.3081,))])
+    train_set = datasets.MNIST("./data", train=True, download=True, transform=transform)
+    test_set = datasets.MNIST("./data", train=False, transform=transform)
+    train_loader = DataLoader(train_set, batch_size=batch_size, shuffle=True)
+    test_loader = DataLoader(test_set, batch_size=1000)
+
+    model = Net()
+    optimizer = torch.optim.SGD(model.parameters(), lr=learning_rate, momentum=0.9)
+    criterion = nn.CrossEntropyLoss()
+
+    for epoch in range(epochs):
+        model.train()
+        for x, y in train_loader:
+            optimizer.zero_grad()
+            loss = criterion(model(x), y)
+            loss.backward()
+            optimizer.step()
+        print(f"epoch {epoch + 1} loss {loss.item():.4f}")
+
+    model.eval()
+    correct = 0
+    with torch.no_grad():
+        for x, y in test_loader:
+            correct += (model(x).argmax(1) == y).sum().item()
+    print(f"Test accuracy: {correct / len(test_set):.4f}")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+README = '''# MNIST CNN
+A minimal PyTorch example that trains a two-layer convolutional network on MNIST.
+
+## Usage
+pip install -r requirements.txt
+python train.py
+
+## Files
+- model.py: the CNN definition
+- train.py: data loading, training loop and evaluation
+
+Reaches about 99% test accuracy after 5 epochs on CPU.
+'''
+
+FILES = [("model.py", MODEL_PY), ("train.py", TRAIN_PY)]
+MERGED_CODE = "\n\n".join(f"### {name}\n{content}" for name, content in FILES)
+EDIT_REQUEST = "learning rate를 0.001로 바꾸고 epochs를 10으로 늘려줘"
+
+
+# (prompt key, 실제 호출 종류, max_new_tokens, user content 목록)
+#   classify → llm.classify(labels) / generate → llm._generate
+CASES = {
+    "classifier": ("classify", 0, [
+        "https://github.com/pytorch/examples 이 프로젝트 실행해줘",
+        "write a function that reverses a linked list",
+        "오늘 날씨 어때?",
+    ]),
+    "intent_classifier": ("classify", 0, [
+        "Q: Shall we proceed with training using this modification?\nA: 네",
+        "Q: Shall we proceed with training using this modification?\nA: 취소해",
+        "Q: Would you like to make modifications, or proceed as is?\nA: layer 하나만 더 추가해줘",
+    ]),
+    "git": ("generate", 512, [README]),
+    "summarize_experiment": ("generate", 2048, [MERGED_CODE]),
+    "edit": ("generate", 2048, [f"User request: {EDIT_REQUEST}\n\n" + "\n\n".join(f"{n}\n{c}" for n, c in FILES)]),
+    "edit_patch": ("generate", 1024, [f"User request: {EDIT_REQUEST}\n\n{MERGED_CODE}"]),
+}
@@ -1,5 +1,5 @@
 # core/bridge_client.py
-import asyncio, json, logging, threading
+import asyncio, json, logging, threading, time, uuid
 import websockets
 from typing import Optional, Dict, Any
 
@@ -8,6 +8,7 @@ logger = logging.getLogger(__name__)
 BRIDGE_PING_INTERVAL = 20
 BRIDGE_PING_TIMEOUT = 20
 BRIDGE_RECONNECT_MAX_BACKOFF = 10
+STREAM_FLUSH_MS = 100
 
 class BridgeClient:
     def __init__(self, url: str, on_incoming: callable):
@@ -114,3 +115,38 @@ class BridgeClient:
                 await t
             except asyncio.CancelledError:
                 pass
+
+
+class BridgeStream:
+    """
+    LLM 토큰 delta → {"type": "stream", "id", "delta"} 프레임.
+    flush_ms 안에 들어온 delta는 한 프레임으로 묶음, close() 시 남은 것 전송 + {"type": "stream_end", "id"}
+    """
+
+    def __init__(self, bridge: Optional[BridgeClient], flush_ms: int = STREAM_FLUSH_MS, stream_id: str | None = None):
+        self.bridge = bridge
+        self.id = stream_id or uuid.uuid4().hex
+        self.interval = flush_ms / 1000
+        self._buf: list[str] = []
+        self._last = 0.0
+        self.frames = 0
+
+    def __call__(self, delta: str):
+        self._buf.append(delta)
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self.flush(now)
+
+    def flush(self, now: float | None = None):
+        self._last = now if now is not None else time.monotonic()
+        if not self._buf or self.bridge is None:
+            return
+        delta = "".join(self._buf)
+        self._buf.clear()
+        self.bridge.send({"type": "stream", "id": self.id, "delta": delta})
+        self.frames += 1
+
+    def close(self):
+        self.flush()
+        if self.bridge is not None:
+            self.bridge.send({"type": "stream_end", "id": self.id})
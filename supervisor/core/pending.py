@@ -14,7 +14,8 @@ class PendingActionManager:
         action_id = str(uuid.uuid4())
         item = {"id": action_id, "type": action_type, "msg": msg}
         self.queue.append(item)
-        self.emitter.emit("pending_added", item)
+        if not self.emitter.emit("pending_added", item):
+            print(f"[Pending] pending_added 큐가 가득 참 → 알림 거절됨 (queue에는 남아 있음): {action_type} {action_id}")
         
         return action_id
 
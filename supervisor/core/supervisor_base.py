@@ -1,8 +1,9 @@
 import yaml
-from utils.network import supervisor_socket
+from utils.network import supervisor_socket, async_supervisor_socket
 from utils.db.db import DBManager
 from utils.router import CommandRouter
-from core.bridge_client import BridgeClient
+from utils.message_builder import build_task
+from core.bridge_client import BridgeClient, BridgeStream
 import logging
 from utils.intent import IntentClassifier
 from handlers.git_handler import GitHandler
@@ -19,12 +20,19 @@ GREEN = "\033[92m"
 YELLOW = "\033[93m"
 RESET = "\033[0m"
 
+# 모델 로드 직후 warm-up 할 prompt key
+WARMUP_PROMPT_KEYS = ["classifier", "intent_classifier", "git", "summarize_experiment", "edit_patch"]
+
 class Supervisor:
-    def __init__(self, model_name: str, host: str, port: int):
+    def __init__(self, model_name: str, host: str, port: int, server_mode: str = "thread", llm_backend=None):
         # Core components
-        self.llm = LLMManager(model_name)
+        self.llm = LLMManager(model_name, backend=llm_backend)
         #self.db = DBManager()
-        self.socket = supervisor_socket.SupervisorServer(host, port)
+        # server_mode: "thread" (연결당 스레드) | "asyncio" (이벤트 루프 + bounded dispatch)
+        if server_mode == "asyncio":
+            self.socket = async_supervisor_socket.AsyncSupervisorServer(host, port)
+        else:
+            self.socket = supervisor_socket.SupervisorServer(host, port)
         self.prompts = self.load_prompts()
         self.emitter = self.socket.emitter
         self.dispatcher = EventDispatcher()
@@ -40,6 +48,19 @@ class Supervisor:
         self.intent_cls = IntentClassifier(self.llm, self.prompts)
         self.git_handler = GitHandler(self.llm, self.prompts)
 
+        # 이벤트별 큐/worker (emit한 소켓·브릿지·run 루프 스레드를 막지 않도록)
+        # user_message 는 worker 1개 → 입력 순서 유지 (동시에 들어온 모델 호출은 LLMManager scheduler가 묶어서 처리)
+        # coder_message
+        #  - asyncio 모드: 서버의 bounded inbox + dispatch executor에서 바로 실행 (emitter 큐 없음)
+        #  - thread 모드: bounded 큐 + session/coder 별 lane. 가득 차면 수신 스레드가 emit에서 기다림(backpressure)
+        #    wait_all 이 deadlock 되지 않는 이유: future로 기다리는 응답은 pool.complete 가 수신 스레드에서 emit 전에 처리하고,
+        #    수신 스레드가 멈추는 건 그 coder의 lane에 응답이 아닌 메시지가 가득 찼을 때뿐 → 그때도 wait_all 은 timeout(TASK_TIMEOUT)으로 끝남
+        if server_mode != "asyncio":
+            self.emitter.configure("coder_message", workers=4, maxsize=1024, policy="block", key=self._session_key)
+        self.emitter.configure("user_message", workers=1, maxsize=100, policy="block", key=self._session_key)
+        # pending 알림은 버리지 않음: 가득 차면 거절하고 로그 (PendingActionManager.add)
+        self.emitter.configure("pending_added", workers=1, maxsize=100, policy="reject")
+
         # 이벤트 연결
         self.emitter.on("coder_message", self.handle_event)
         self.emitter.on("user_message", self.handle_event)
@@ -50,6 +71,7 @@ class Supervisor:
         # dir이름
         self.last_git_url : str | None = None
         self.last_dir_name : str | None = None
+        self.manifest_version : int | None = None   # coder repo manifest (scan_changes) 기준 버전
 
     def load_prompts(self, path="/config/prompts.yaml") -> dict:
         """system prompt yaml 로드"""
@@ -58,6 +80,13 @@ class Supervisor:
         with open(prompts_path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f)
 
+    @staticmethod
+    def _session_key(msg: dict):
+        """순서를 보장할 단위 (session id → coder id 순)"""
+        if not isinstance(msg, dict):
+            return None
+        return msg.get("session_id") or msg.get("coder_id")
+
     def handle_event(self, msg: dict):
         """이벤트 분배"""
         result = self.dispatcher.dispatch(msg)
@@ -89,13 +118,17 @@ class Supervisor:
                     })
                 else:
                     # 일반 입력
-                    self.emitter.emit("coder_message", {
+                    self.socket.dispatch({
                         "command": None,
                         "action": "user_input_normal",
                         "text": text,
                     })
                 return
 
+            if mtype == "status":
+                self._send_llm_status()
+                return
+
             if mtype == "reset":
                 self.llm.reset_memory()
                 self._send_to_bridge("LLM memory reset")
@@ -106,11 +139,31 @@ class Supervisor:
             self.logger.exception("[Supervisor] _on_bridge_message error: %s", e)
             self._send_to_bridge({"type": "error", "text": f"_on_bridge_message: {e}"})
 
+    def _on_llm_state(self, state: str, info: dict):
+        print(f"{GREEN}[Supervisor] LLM {state} {info or ''}{RESET}")
+        self._send_llm_status(**info)
+
+    def _send_llm_status(self, **info):
+        """모델 준비 상태를 브릿지에 알림 (준비 전에는 router/intent가 규칙 기반으로 동작)"""
+        self._send_to_bridge({"type": "status", "llm": self.llm.state, "model": self.llm.model_name, **info})
+
     def _send_to_bridge(self, message: Dict[str, Any] | str):
         """브릿지로 메시지 전송"""
         if self.bridge:
             self.bridge.send(message)
 
+    def request(self, command: str, action: str, target=None, metadata: Optional[Dict[str, Any]] = None, timeout: float | None = None):
+        """
+        coder에 task를 보내고 응답 TaskFuture 반환 (응답은 dispatcher로 가지 않고 future로만 옴)
+        여러 개를 보낸 뒤 wait_all(...)로 한꺼번에 기다릴 수 있음 (asyncio 서버 모드의 handler에서)
+        """
+        task = build_task(command, action, target=target, metadata=metadata)
+        return self.socket.send_supervisor_response(task, timeout=timeout, dispatch=False)
+
+    def bridge_stream(self) -> BridgeStream:
+        """LLM 토큰 스트림을 브릿지로 보내는 on_delta 콜백 (다 쓰면 close())"""
+        return BridgeStream(self.bridge)
+
     def enqueue_user_input(self, text: str):
         """외부에서 온 user input 큐에 저장"""
         self.user_q.put(text)
@@ -126,8 +179,12 @@ class Supervisor:
     def run(self):
         print("🔥 Supervisor run loop 진입")
         """Supervisor 메인 실행 루프"""
-        self.llm.load_model()
+        # coder 연결부터 받고, 모델은 백그라운드에서 로드 + warm-up
         self.socket.run_main()
+        self.llm.on_state(self._on_llm_state)
+        self.llm.load_model_async(
+            warmup_prompts={k: self.prompts[k] for k in WARMUP_PROMPT_KEYS if k in self.prompts}
+        )
         
         while True:
             try:
@@ -147,7 +204,7 @@ class Supervisor:
                     "action": "user_input_normal",
                     "text": text,
                 }
-                self.emitter.emit("coder_message", msg)
+                self.socket.dispatch(msg)
 
             except StopIteration:
                 continue
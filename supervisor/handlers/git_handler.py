@@ -1,4 +1,6 @@
 from utils.web.web_manager import WebManager
+from llm.summarizer import RepoSummarizer
+from utils.patch import parse_patches, validate
 import re
 
 class GitHandler:
@@ -6,6 +8,7 @@ class GitHandler:
         self.llm = llm
         self.web_manager = WebManager()
         self.sysprompts = sysprompts
+        self.summarizer = RepoSummarizer(llm, sysprompts)
         self.execute_file = None
 
     def handle(self, text: str, persistent=False):
@@ -17,13 +20,14 @@ class GitHandler:
             print("[GitHandler] README.md를 가져올 수 없습니다.")
             return 
 
-        # LLM 요약
-        summary = self.llm.run_with_prompt(
-            self.sysprompts["git"],
-            readme_text[:2000],
-            max_new_tokens=512,
-            persistent=persistent
-        )
+        # LLM 요약 (모델 로딩 중이면 건너뛰고 clone부터 진행)
+        if getattr(self.llm, "is_ready", True):
+            summary = self.llm.run_with_prompt(
+                self.sysprompts["git"],
+                readme_text[:2000],
+                max_new_tokens=512,
+                persistent=persistent
+            )
         
         print(f"[GitHandler] Coder에게 git clone 요청 : {url}")
         return url
@@ -34,16 +38,11 @@ class GitHandler:
         match = re.search(url_pattern, prompt)
         return match.group(0) if match else ""
 
-    def summarize_experiment(self, coder_input: dict, persistent: bool = False) -> dict:
+    def summarize_experiment(self, coder_input: dict, persistent: bool = False, on_delta=None) -> dict:
         files = coder_input.get("metadata", {}).get("stdout", [])
-        merged_code = "\n\n".join([f"### {f['path'].split('/')[-1]}\n{f['content']}" for f in files])
 
-        raw_summary = self.llm.run_with_prompt(
-            self.sysprompts["summarize_experiment"],
-            merged_code,
-            max_new_tokens=2048,
-            persistent=persistent
-        )
+        # 파일별 요약(디스크 캐시) → 합치기. 작은 repo는 한 번에 요약
+        raw_summary = self.summarizer.summarize(files, persistent=persistent, on_delta=on_delta)
 
         sys_part, user_part, exec_file = "", "", None
         # System/User Summary 분리
@@ -72,7 +71,7 @@ class GitHandler:
             "execute_file": exec_file or "train.py"   # fallback
         }
 
-    def generate_edit_task(self, user_input: str, experiment: dict, persistent: bool = False) -> dict:
+    def generate_edit_task(self, user_input: str, experiment: dict, persistent: bool = False, on_delta=None) -> dict:
         """
                 {
             "stdout": [
@@ -93,7 +92,8 @@ class GitHandler:
             self.sysprompts["edit"],
             combined_message,
             max_new_tokens=2048,
-            persistent=persistent
+            persistent=persistent,
+            on_delta=on_delta
         )
 
         result, current_file, buffer = {}, None, []
@@ -118,3 +118,44 @@ class GitHandler:
             result[current_file] = "\n".join(buffer).strip()
 
         return list(result.keys()), result
+
+    def generate_patch_task(self, user_input: str, experiment: dict, persistent: bool = False, on_delta=None):
+        """
+        바뀌는 부분만 생성 (SEARCH/REPLACE 블록 또는 unified diff) → apply_patch task
+        원본에 dry-run 해서 적용 안 되는 파일만 generate_edit_task(전체 재작성)로 다시 생성
+        read_py_files 에서 잘린(truncated) 파일은 전체 내용을 모르므로 patch/재작성 대상에서 뺌 (참고용으로만 보여줌)
+        return: (target, {"patches": {path: hunks}, "files": {path: content}})
+        """
+        files = experiment.get("metadata", {}).get("stdout", [])
+        contents = {f["path"]: f["content"] for f in files if not f.get("truncated")}
+        # header는 repo 기준 상대 경로 (basename만 쓰면 a/utils.py, b/utils.py 를 구분 못 함)
+        labels = {f.get("rel") or f["path"]: f["path"] for f in files}
+        messages = [f"User request: {user_input}"]
+        for label, f in zip(labels, files):
+            messages.append(f"### {label}\n{f['content']}")
+        combined_message = "\n\n".join(messages)
+
+        raw_output = self.llm.run_with_prompt(
+            self.sysprompts["edit_patch"],
+            combined_message,
+            max_new_tokens=1024,
+            persistent=persistent,
+            on_delta=on_delta
+        )
+
+        patches, failed = validate(parse_patches(raw_output, labels), contents)
+        skipped = [f["path"] for f in files if f.get("truncated") and f["path"] in failed]
+        if skipped:
+            print(f"[GitHandler] 잘린 파일은 수정하지 않음: {skipped}")
+            failed = {p: reason for p, reason in failed.items() if p not in skipped}
+        rewrites = {}
+        if (failed or not patches) and contents:
+            print(f"[GitHandler] patch 적용 불가 → 전체 재작성 fallback: {failed or 'no patch in output'}")
+            retry = [f for f in files if f["path"] in failed] or [f for f in files if f["path"] in contents]
+            _, rewrites = self.generate_edit_task(
+                user_input, {"metadata": {"stdout": retry}}, persistent=persistent, on_delta=on_delta
+            )
+            rewrites = {p: c for p, c in rewrites.items() if p in contents and p not in patches}
+
+        target = list(patches) + list(rewrites)
+        return target, {"patches": patches, "files": rewrites}
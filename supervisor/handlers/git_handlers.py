@@ -1,5 +1,7 @@
 from utils.message_builder import build_task
-from utils.git_utils import extract_repo_name
+from utils.git_utils import extract_repo_name, apply_scan_delta
+from utils.network.coder_pool import wait_all
+from llm.summarizer import PageCollector
 import os
 
 GREEN = "\033[92m"
@@ -8,6 +10,8 @@ RED = "\033[91m"
 BLUE = "\033[94m"
 RESET = "\033[0m"
 
+TASK_TIMEOUT = 120
+
 def register_git_handlers(supervisor):
     dispatcher = supervisor.dispatcher
     socket = supervisor.socket
@@ -22,7 +26,8 @@ def register_git_handlers(supervisor):
                         f"{msg['action']} 작업 진행 상황\n"
                         f"요청한 repo : {msg['metadata']['stdout']['repo']}\n"
                         f"결과 : {msg['result']}\n"
-                        f"저장 위치 : {msg['metadata']['stdout']['dir_path']}"
+                        f"저장 위치 : {msg['metadata']['stdout']['dir_path']}\n"
+                        f"clone 출처 : {msg['metadata']['stdout'].get('source', 'network')}"
                     )
             
             supervisor._send_to_bridge(web_msg)
@@ -31,9 +36,52 @@ def register_git_handlers(supervisor):
             
             supervisor.last_git_url = git_url
             supervisor.last_dir_name = dir_name
+            supervisor.manifest_version = None
+
+            # 코드 요약을 보는 동안 coder가 requirements wheel을 미리 받아 둠 → create_venv는 offline 설치
+            socket.send_supervisor_response(build_task(
+                "git", "prewarm_wheelhouse", metadata={"dir_path": f"{dir_name}/", "requirements": "requirements.txt"}))
 
-            task = build_task("git", "read_py_files", metadata={"dir_path": f"{dir_name}"})
-            socket.send_supervisor_response(task)
+            # 세 요청을 한 번에 보내고 같이 기다림 (handler는 dispatch worker 스레드 → 수신 스레드를 막지 않음)
+            repo_path = msg["metadata"]["stdout"]["dir_path"]
+            # read_py_files는 페이지 단위로 받음 → 받는 동안 앞 파일들 요약을 미리 시작
+            futures = [
+                supervisor.request("git", "read_py_files", metadata={"dir_path": f"{dir_name}", "stream": True}, timeout=TASK_TIMEOUT),
+                supervisor.request("git", "list_files", metadata={"dir_path": repo_path}, timeout=TASK_TIMEOUT),
+                supervisor.request("git", "git_status", metadata={"repo_path": repo_path}, timeout=TASK_TIMEOUT),
+            ]
+            pages = PageCollector(git_handler.summarizer)
+            try:
+                for frame in futures[0].partials(timeout=TASK_TIMEOUT):
+                    pages.add(frame.get("metadata", {}).get("files") or [])
+                read_msg, files_msg, status_msg = wait_all(futures, timeout=TASK_TIMEOUT)
+            except Exception as e:
+                for f in futures:
+                    f.cancel()
+                supervisor._send_to_bridge(f"repo 정보를 가져오지 못했습니다: {e}")
+                return
+
+            if files_msg.get("result") == "success":
+                files = files_msg["metadata"]["stdout"] or []
+                supervisor._send_to_bridge(f"파일 {len(files)}개: " + ", ".join(f["name"] for f in files[:20]))
+            if status_msg.get("result") == "success":
+                branch = (str(status_msg["metadata"]["stdout"]).splitlines() or [""])[0]
+                supervisor._send_to_bridge(f"git status: {branch}")
+            if read_msg.get("result") != "success":
+                supervisor._send_to_bridge(f"read_py_files 실패: {read_msg.get('metadata', {}).get('stderr')}")
+                return
+            info = read_msg["metadata"]["stdout"] or {}
+            if isinstance(info, list):   # 페이지 없이 한 번에 온 경우 (process pool 등 emit 불가)
+                pages.add(info)
+                info = {}
+            if info.get("skipped") or info.get("truncated"):
+                supervisor._send_to_bridge(
+                    f"py 파일 {info.get('count')}개 ({info.get('pages')} pages), "
+                    f"건너뜀 {len(info.get('skipped') or [])}개 (binary/minified), 잘림 {len(info.get('truncated') or [])}개"
+                )
+            # 이후 handler들은 기존 형식 (stdout = 파일 목록)
+            read_msg["metadata"]["stdout"] = pages.files
+            handle_read_files(read_msg)
 
     @dispatcher.register("git", "read_py_files")
     def handle_read_files(msg):
@@ -44,17 +92,32 @@ def register_git_handlers(supervisor):
         git_url = supervisor.last_git_url
         dir_name = supervisor.last_dir_name
 
-        # sys summary
-        model_summary = git_handler.summarize_experiment(msg, persistent=True)
-        supervisor._send_to_bridge(f"{model_summary["system_summary"]}")
+        # sys summary (생성되는 대로 브릿지에 스트리밍)
+        stream = supervisor.bridge_stream()
+        try:
+            model_summary = git_handler.summarize_experiment(msg, persistent=True, on_delta=stream)
+        finally:
+            stream.close()
         
         # execute file 
         supervisor.execute_file = model_summary.get("execute_file", "train.py")
 
+        # 이후 수정 뒤에는 바뀐 파일만 받도록 coder manifest 기준 버전 확보
+        request_scan_changes(include_content=False)
+
         # pending 등록
         action_id = supervisor.pending_manager.add("read_py_files", msg)
 
 
+    @dispatcher.register("git", "prewarm_wheelhouse")
+    def handle_prewarm_wheelhouse(msg):
+        stdout = msg.get("metadata", {}).get("stdout") or {}
+        if msg.get("result") != "success":
+            print(f"{YELLOW}[Supervisor] wheelhouse prewarm 실패: {msg.get('metadata', {}).get('stderr')}{RESET}")
+        elif not stdout.get("skipped"):
+            print(f"[Supervisor] wheelhouse prewarm: {stdout.get('pins')} pins, "
+                  f"{len(stdout.get('fetched') or [])} fetched, {stdout.get('cached')} cached, {stdout.get('prewarm_ms')}ms")
+
     @dispatcher.register("git", "create_venv")
     def handle_create_venv(msg):
         if msg.get("result") == "success":
@@ -75,15 +138,61 @@ def register_git_handlers(supervisor):
         web_msg = "\n".join(comb)
         supervisor._send_to_bridge(web_msg)
 
+        request_scan_changes()
+
         # input() 대신 pending 등록
         action_id = supervisor.pending_manager.add("git_edit_confirm", msg)
         
+    @dispatcher.register("git", "apply_patch")
+    def handle_apply_patch(msg):
+        metadata = msg.get("metadata", {})
+        stdout = metadata.get("stdout") or {}
+        failed = stdout.get("failed") or {}
+        msg["response"] = "Shall we proceed with training using this modification?"
+
+        print("Code modification applied by the Coder:")
+        supervisor._send_to_bridge(stdout.get("diff") or "(no changes)")
+        if failed or msg.get("result") != "success":
+            supervisor._send_to_bridge(f"{RED}patch 실패{RESET}: {metadata.get('stderr')}")
+
+        # 다음 수정 요청의 dry-run 기준은 coder 디스크 내용 → manifest 이후 바뀐 파일만 받아 py_files 에 반영 (handle_scan_changes)
+        request_scan_changes()
+
+        action_id = supervisor.pending_manager.add("git_edit_confirm", msg)
+
+    def request_scan_changes(include_content: bool = True):
+        """마지막으로 받은 manifest 버전 이후 바뀐 파일 요청 (결과는 handle_scan_changes)"""
+        if not supervisor.last_dir_name:
+            return
+        metadata = {"dir_path": supervisor.last_dir_name, "include_content": include_content}
+        if supervisor.manifest_version is not None:
+            metadata["since"] = supervisor.manifest_version
+        socket.send_supervisor_response(build_task("git", "scan_changes", metadata=metadata))
+
+    @dispatcher.register("git", "scan_changes")
+    def handle_scan_changes(msg):
+        if msg.get("result") != "success":
+            print(f"{YELLOW}[Supervisor] scan_changes 실패: {msg.get('metadata', {}).get('stderr')}{RESET}")
+            return
+        metadata = msg["metadata"]
+        delta = metadata["stdout"]
+        if metadata.get("include_content", True) and supervisor.py_files:
+            files = supervisor.py_files.get("metadata", {}).get("stdout") or []
+            supervisor.py_files["metadata"]["stdout"] = apply_scan_delta(files, delta)
+        supervisor.manifest_version = delta["version"]
+        print(f"[Supervisor] manifest v{delta['version']}: +{len(delta['added'])} ~{len(delta['modified'])} -{len(delta['deleted'])}")
+
     @dispatcher.register("git", "run_in_venv")
     def handle_result(msg):
         # print(f"받은 task :{msg}")
         result = msg.get("result", "fail")
         metadata = msg.get("metadata", {})
 
+        if result == "stream":
+            # 실행 중 출력 청크 → 도착하는 대로 브릿지에 전달
+            supervisor._send_to_bridge(metadata.get("data", ""))
+            return
+
         if result == "success":
             test_acc = metadata.get("stdout", "N/A")
             supervisor._send_to_bridge("\nTraining complete!")
@@ -66,9 +66,13 @@ def register_user_handlers(supervisor):
             supervisor._send_to_bridge(f"your intent : {intent}")
 
             if intent == 'revise':
-                target, metadata = git_handler.generate_edit_task(text, supervisor.py_files, persistent=True)
+                stream = supervisor.bridge_stream()
+                try:
+                    target, metadata = git_handler.generate_patch_task(text, supervisor.py_files, persistent=True, on_delta=stream)
+                finally:
+                    stream.close()
                 
-                task = build_task("git", "edit", target=target, metadata=metadata)
+                task = build_task("git", "apply_patch", target=target, metadata=metadata)
                 socket.send_supervisor_response(task)
             
             elif intent in ("positive", "direct"):   # ← direct와 positive 모두 run_in_venv 실행
@@ -79,6 +83,7 @@ def register_user_handlers(supervisor):
                     metadata={
                         "cwd": f"{dir_name}/",
                         "venv_path": f"{dir_name}/venv",
+                        "stream": True,
                     }
                 )
                 socket.send_supervisor_response(task)
@@ -90,7 +95,8 @@ def register_user_handlers(supervisor):
             if intent in ("positive", "direct"):   # ← 여기서도 direct 허용
                 task = build_task("git", "run_in_venv", target=supervisor.execute_file,
                                 metadata={"cwd": f"{dir_name}/",
-                                            "venv_path": f"{dir_name}/venv"})
+                                            "venv_path": f"{dir_name}/venv",
+                                            "stream": True})
                 socket.send_supervisor_response(task)
             elif intent == "negative":
                 supervisor._send_to_bridge("Modification has been canceled.")
@@ -0,0 +1,110 @@
+# llm/backends.py
+import logging
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BackendConfig:
+    """
+    모델 로드 방식.
+    dtype     → "auto" | "float32" | "bfloat16" (bf16은 CPU가 지원할 때만, 아니면 float32)
+    device    → "auto" (device_map="auto") | "cpu"
+    quantize  → None | "int8" (Linear 레이어 dynamic int8 양자화, CPU 전용)
+    threads   → torch intra-op 스레드 수 (None이면 torch 기본값)
+    compile   → torch.compile(model.forward) 사용
+    """
+    name: str = "auto"
+    dtype: str = "auto"
+    device: str = "auto"
+    quantize: str | None = None
+    threads: int | None = None
+    compile: bool = False
+
+
+# 이름으로 고를 수 있는 preset
+BACKENDS: Dict[str, BackendConfig] = {
+    "auto": BackendConfig(),                                               # 기존 동작 (GPU 있으면 GPU)
+    "cpu-fp32": BackendConfig("cpu-fp32", dtype="float32", device="cpu"),
+    "cpu-bf16": BackendConfig("cpu-bf16", dtype="bfloat16", device="cpu"),
+    "cpu-int8": BackendConfig("cpu-int8", dtype="float32", device="cpu", quantize="int8"),
+    "cpu-bf16-compile": BackendConfig("cpu-bf16-compile", dtype="bfloat16", device="cpu", compile=True),
+}
+
+
+def get_backend(backend: "str | BackendConfig | None", threads: int | None = None) -> BackendConfig:
+    """preset 이름 / BackendConfig → BackendConfig (threads 지정 시 덮어씀)"""
+    if backend is None:
+        backend = "auto"
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown LLM backend: {backend} (choose from {', '.join(BACKENDS)})")
+        backend = BACKENDS[backend]
+    if threads is not None:
+        backend = replace(backend, threads=threads)
+    return backend
+
+
+def cpu_supports_bf16() -> bool:
+    """AVX512-BF16 / AMX 가 있어야 CPU bf16 matmul이 fp32보다 빠름"""
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def load(model_name: str, config: BackendConfig) -> Tuple[Any, Any]:
+    """config대로 (model, tokenizer) 로드"""
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+    if config.threads:
+        torch.set_num_threads(config.threads)
+
+    dtype: Any = "auto"
+    if config.dtype == "float32":
+        dtype = torch.float32
+    elif config.dtype == "bfloat16":
+        if config.device != "cpu" or cpu_supports_bf16():
+            dtype = torch.bfloat16
+        else:
+            logger.warning("[LLM] CPU에 bf16 지원이 없어 float32로 로드 (%s)", config.name)
+            dtype = torch.float32
+
+    kwargs: Dict[str, Any] = {"torch_dtype": dtype}
+    if config.device == "auto":
+        kwargs["device_map"] = "auto"
+    else:
+        kwargs["low_cpu_mem_usage"] = True
+    model = AutoModelForCausalLM.from_pretrained(model_name, **kwargs)
+    if config.device == "cpu":
+        model = model.to("cpu")
+    model.eval()
+
+    if config.quantize == "int8":
+        if config.device != "cpu":
+            raise ValueError("int8 dynamic quantization is CPU only (device='cpu')")
+        model = torch.ao.quantization.quantize_dynamic(model.float(), {torch.nn.Linear}, dtype=torch.qint8)
+    elif config.quantize:
+        raise ValueError(f"Unknown quantize mode: {config.quantize}")
+
+    if config.compile:
+        model.forward = torch.compile(model.forward, dynamic=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    logger.info(
+        "[LLM] backend=%s dtype=%s quantize=%s threads=%s compile=%s",
+        config.name, dtype, config.quantize, torch.get_num_threads(), config.compile,
+    )
+    return model, tokenizer
+
+
+def backend_from_env(default: str = "auto") -> BackendConfig:
+    """LLM_BACKEND / LLM_THREADS 환경변수로 선택"""
+    threads = os.environ.get("LLM_THREADS")
+    return get_backend(os.environ.get("LLM_BACKEND", default), int(threads) if threads else None)
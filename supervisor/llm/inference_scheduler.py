@@ -0,0 +1,155 @@
+# llm/inference_scheduler.py
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# 숫자가 작을수록 먼저 처리
+PRIORITY_HIGH = 0     # 분류 / 짧은 응답
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2      # summarize_experiment 같은 긴 생성
+
+
+def default_priority(max_new_tokens: int) -> int:
+    if max_new_tokens <= 64:
+        return PRIORITY_HIGH
+    if max_new_tokens >= 1024:
+        return PRIORITY_LOW
+    return PRIORITY_NORMAL
+
+
+class _Request:
+    __slots__ = ("kind", "priority", "messages", "max_new_tokens", "use_prefix_cache", "fn", "future", "queued_at")
+
+    def __init__(self, kind: str, priority: int, future: Future, messages=None, max_new_tokens: int = 0,
+                 use_prefix_cache: bool = True, fn: Callable | None = None):
+        self.kind = kind              # "generate" (batch 가능) | "call" (단독 실행)
+        self.priority = priority
+        self.messages = messages
+        self.max_new_tokens = max_new_tokens
+        self.use_prefix_cache = use_prefix_cache
+        self.fn = fn
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class InferenceScheduler:
+    """
+    LLM 호출 전용 스레드.
+    - 요청은 priority 순 (같은 priority는 도착 순)
+    - generate 요청은 window_ms 동안 모아서 같은 priority끼리 left-pad 한 번의 model.generate로 처리
+    - classify 같은 나머지 호출은 단독 실행 ("call")
+    모든 요청은 Future로 결과를 돌려줌
+    """
+
+    def __init__(self, llm, max_batch: int = 8, window_ms: float = 5.0):
+        self.llm = llm
+        self.max_batch = max(1, max_batch)
+        self.window = window_ms / 1000
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="InferenceScheduler", daemon=True)
+        self.stats = {"batches": 0, "requests": 0, "max_batch_seen": 0, "queue_wait_ms": 0.0}
+        self._thread.start()
+
+    def is_worker(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    # ---------- submit ----------
+    def submit_generate(self, messages, max_new_tokens: int = 256, priority: int | None = None,
+                        use_prefix_cache: bool = True) -> Future:
+        future: Future = Future()
+        prio = default_priority(max_new_tokens) if priority is None else priority
+        self._push(_Request("generate", prio, future, messages=messages, max_new_tokens=max_new_tokens,
+                            use_prefix_cache=use_prefix_cache))
+        return future
+
+    def submit_call(self, fn: Callable[[], Any], priority: int = PRIORITY_HIGH) -> Future:
+        """fn()을 scheduler 스레드에서 실행 (모델을 쓰는 다른 호출도 순서/우선순위를 따르도록)"""
+        future: Future = Future()
+        self._push(_Request("call", priority, future, fn=fn))
+        return future
+
+    def _push(self, req: _Request):
+        with self._cond:
+            heapq.heappush(self._heap, (req.priority, next(self._seq), req))
+            self._cond.notify()
+
+    # ---------- worker ----------
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                head = self._heap[0][2]
+                if head.kind == "generate" and self.max_batch > 1:
+                    # 첫 요청이 오면 window 동안 더 모음
+                    deadline = time.monotonic() + self.window
+                    while len(self._heap) < self.max_batch:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                batch = self._take_batch()
+            self._run(batch)
+
+    def _take_batch(self) -> List[_Request]:
+        """(lock 보유) 맨 앞 요청 + 같이 돌릴 수 있는 generate 요청들"""
+        _, _, head = heapq.heappop(self._heap)
+        batch = [head]
+        if head.kind != "generate":
+            return batch
+        skipped = []
+        while self._heap and len(batch) < self.max_batch:
+            item = heapq.heappop(self._heap)
+            req = item[2]
+            if req.kind == "generate" and req.priority == head.priority:
+                batch.append(req)
+            else:
+                skipped.append(item)
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return batch
+
+    def _run(self, batch: List[_Request]):
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        now = time.perf_counter()
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(batch))
+        self.stats["queue_wait_ms"] += sum((now - r.queued_at) * 1000 for r in batch)
+
+        try:
+            if batch[0].kind == "call":
+                results = [batch[0].fn()]
+            elif len(batch) == 1:
+                r = batch[0]
+                results = [self.llm._generate(r.messages, r.max_new_tokens, r.use_prefix_cache)]
+            else:
+                results = self.llm.generate_batch([r.messages for r in batch], [r.max_new_tokens for r in batch])
+        except Exception as e:
+            logger.exception("[InferenceScheduler] batch of %d failed", len(batch))
+            for r in batch:
+                r.future.set_exception(e)
+            return
+        for r, result in zip(batch, results):
+            r.future.set_result(result)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = len(self._heap)
+        done = self.stats["requests"] or 1
+        return {
+            **self.stats,
+            "queued": queued,
+            "avg_batch": round(self.stats["requests"] / (self.stats["batches"] or 1), 2),
+            "avg_queue_wait_ms": round(self.stats["queue_wait_ms"] / done, 2),
+        }
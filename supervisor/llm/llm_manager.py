@@ -1,58 +1,417 @@
-from transformers import AutoModelForCausalLM, AutoTokenizer
+# torch / transformers는 load_model에서 import (import만 수 초 걸려서 서버 기동을 막지 않도록)
+import copy
+import hashlib
 import logging
+import math
+import threading
+import time
 import yaml
+from collections import OrderedDict
+from concurrent.futures import Future
+from llm.inference_scheduler import InferenceScheduler, PRIORITY_HIGH, default_priority
+from llm.memory import ConversationMemory, approx_tokens
+from llm import backends
 
 logging.basicConfig(level=logging.INFO)
 
+# 모델 상태
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+WARMING = "warming_up"
+READY = "ready"
+FAILED = "failed"
+
 class LLMManager:
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, prefix_cache_size: int = 8, max_batch: int = 8, batch_window_ms: float = 5.0,
+                 memory_budget: int = 6144, backend: "str | backends.BackendConfig | None" = None):
         self.model_name = model_name
         self.model = None
         self.tokenizer = None
+        # 로드 방식 (llm.backends.BACKENDS preset 이름 또는 BackendConfig, 기본 "auto")
+        self.backend = backends.get_backend(backend)
+
+        # 모델 호출은 scheduler 스레드 하나에서 (load_model 이후 시작, max_batch=0이면 호출 스레드에서 바로 실행)
+        self.max_batch = max_batch
+        self.batch_window_ms = batch_window_ms
+        self.scheduler: InferenceScheduler | None = None
+
+        self.state = NOT_LOADED
+        self.ready = threading.Event()       # READY 또는 FAILED가 되면 set
+        self._state_listeners = []
+
+        # system prompt prefix → (prefix 토큰, past_key_values) LRU
+        self.prefix_cache_size = prefix_cache_size
+        self._prefix_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._prefix_lock = threading.Lock()
+        self.prefix_stats = {"hits": 0, "misses": 0, "evictions": 0}
         
-        # 기본 메세지 세팅
-        self.message = [{"role": "system", "content": "You are a helpful assistant."}]
+        # persistent 대화 메모리 (memory_budget 토큰 안으로 유지, 넘치면 큰 코드부터 줄이고 오래된 턴은 요약)
+        self.memory = ConversationMemory(
+            count_tokens=self.count_tokens, budget=memory_budget, summarizer=self._summarize_turns
+        )
+
+    @property
+    def message(self) -> list:
+        """현재 persistent 대화 (budget 적용 후)"""
+        return self.memory.messages()
+
+    def count_tokens(self, text: str) -> int:
+        if self.tokenizer is None:
+            return approx_tokens(text)
+        return len(self.tokenizer(text, add_special_tokens=False).input_ids)
+
+    def _summarize_turns(self, turns: list) -> str:
+        """메모리에서 밀려나는 턴 요약 (ConversationMemory summarizer)"""
+        transcript = "\n".join(f"{t['role']}: {t['content'][:4000]}" for t in turns)
+        return self.generate([
+            {"role": "system", "content": "Summarize the conversation below in under 120 words. "
+                                          "Keep repository names, file names, decisions and errors."},
+            {"role": "user", "content": transcript},
+        ], max_new_tokens=200)
     
+    # ---------- 로드 / 상태 ----------
+    @property
+    def is_ready(self) -> bool:
+        return self.state == READY
+
+    def on_state(self, fn) -> None:
+        """상태 변경 콜백 fn(state, info: dict)"""
+        self._state_listeners.append(fn)
+
+    def _set_state(self, state: str, **info) -> None:
+        self.state = state
+        if state in (READY, FAILED):
+            self.ready.set()
+        for fn in list(self._state_listeners):
+            try:
+                fn(state, info)
+            except Exception:
+                logging.warning("state listener 실패", exc_info=True)
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """모델이 준비될 때까지 대기. 로드 실패 시 RuntimeError"""
+        if self.state == NOT_LOADED:
+            raise RuntimeError("model not loaded (load_model / load_model_async 먼저 호출)")
+        self.ready.wait(timeout)
+        if self.state == FAILED:
+            raise RuntimeError(f"model load failed: {self.model_name}")
+        return self.state == READY
+
+    def load_model_async(self, warmup_prompts: dict | None = None) -> threading.Thread:
+        """백그라운드 스레드에서 로드 + warm-up. 준비 전 호출은 wait_ready에서 대기"""
+        self._set_state(LOADING)
+        t = threading.Thread(target=self._load_and_warm, args=(warmup_prompts,), name="LLMLoader", daemon=True)
+        t.start()
+        return t
+
+    def _load_and_warm(self, warmup_prompts: dict | None):
+        t0 = time.perf_counter()
+        if not self._load():
+            self._set_state(FAILED)
+            return
+        load_s = time.perf_counter() - t0
+        if warmup_prompts:
+            self._set_state(WARMING, load_s=round(load_s, 1))
+            self.warm_up(warmup_prompts)
+        self._set_state(READY, load_s=round(load_s, 1), total_s=round(time.perf_counter() - t0, 1))
+
+    def warm_up(self, prompts: dict) -> None:
+        """prompt key마다 1토큰 생성 → 커널 warm-up + system prompt prefix KV 캐시 채우기"""
+        for key, system_prompt in prompts.items():
+            t0 = time.perf_counter()
+            try:
+                self._generate([
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": "hello"},
+                ], max_new_tokens=1)
+                print(f"[LLM] warm-up {key}: {(time.perf_counter() - t0) * 1000:.0f} ms")
+            except Exception:
+                logging.warning("warm-up 실패: %s", key, exc_info=True)
+
     def load_model(self) -> None:
+        """동기 로드 (기존 방식)"""
+        self._set_state(LOADING)
+        self._set_state(READY if self._load() else FAILED)
+
+    def _load(self) -> bool:
         try:
-            print("모델 로드 중:", self.model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(
-                self.model_name, torch_dtype="auto", device_map="auto"
-            )
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            print("모델 로드 중:", self.model_name, f"(backend {self.backend.name})")
+            self.model, self.tokenizer = backends.load(self.model_name, self.backend)
+            self.clear_prefix_cache()   # 모델이 바뀌면 이전 KV는 무효
+            if self.scheduler is None and self.max_batch > 0:
+                self.scheduler = InferenceScheduler(self, self.max_batch, self.batch_window_ms)
             print("Done.")
+            return True
         except Exception:
             logging.error("모델 로드 실패", exc_info=True)
-    
-    def generate(self, messages, max_new_tokens: int = 256) -> str:
+            return False
+
+    # ---------- system prompt prefix KV cache ----------
+    def clear_prefix_cache(self) -> None:
+        with self._prefix_lock:
+            self._prefix_cache.clear()
+
+    def _prefix_key(self, prefix_text: str) -> str:
+        # 모델 이름 + prompt 내용 해시 → prompts.yaml이 바뀌면 자동으로 다른 key
+        return f"{self.model_name}:{hashlib.sha1(prefix_text.encode('utf-8')).hexdigest()}"
+
+    def _prefix_kv(self, prefix_text: str):
+        """prefix의 (토큰, past_key_values). 없으면 prefill 후 LRU에 저장"""
+        key = self._prefix_key(prefix_text)
+        with self._prefix_lock:
+            entry = self._prefix_cache.get(key)
+            if entry is not None:
+                self._prefix_cache.move_to_end(key)
+                self.prefix_stats["hits"] += 1
+                return entry
+
+        import torch
+        from transformers import DynamicCache
+
+        prefix_ids = self.tokenizer([prefix_text], return_tensors="pt").input_ids.to(self.model.device)
+        with torch.no_grad():
+            past = self.model(input_ids=prefix_ids, past_key_values=DynamicCache(), use_cache=True).past_key_values
+        entry = (prefix_ids, past)
+        with self._prefix_lock:
+            self.prefix_stats["misses"] += 1
+            self._prefix_cache[key] = entry
+            while len(self._prefix_cache) > self.prefix_cache_size:
+                self._prefix_cache.popitem(last=False)
+                self.prefix_stats["evictions"] += 1
+        return entry
+
+    def _prepare(self, messages, use_prefix_cache: bool = True):
+        """
+        chat template 적용 → (input_ids, past_key_values | None)
+        첫 메시지가 system이면 그 부분의 KV를 재사용 (generate는 suffix만 prefill)
+        """
+        import torch
+
         text = self.tokenizer.apply_chat_template(
             messages, tokenize=False, add_generation_prompt=True
         )
+        if use_prefix_cache and self.prefix_cache_size > 0 and messages and messages[0].get("role") == "system":
+            prefix_text = self.tokenizer.apply_chat_template(messages[:1], tokenize=False)
+            if text.startswith(prefix_text) and len(text) > len(prefix_text):
+                prefix_ids, past = self._prefix_kv(prefix_text)
+                suffix_ids = self.tokenizer(
+                    [text[len(prefix_text):]], return_tensors="pt", add_special_tokens=False
+                ).input_ids.to(self.model.device)
+                # generate가 cache를 이어서 쓰므로 저장본은 복사해서 넘김
+                return torch.cat([prefix_ids, suffix_ids], dim=1), copy.deepcopy(past)
         inputs = self.tokenizer([text], return_tensors="pt").to(self.model.device)
-        output_ids = self.model.generate(**inputs, max_new_tokens=max_new_tokens)
-        output_ids = [out[len(inp):] for inp, out in zip(inputs.input_ids, output_ids)]
+        return inputs.input_ids, None
+
+    def _direct(self) -> bool:
+        return self.scheduler is None or self.scheduler.is_worker()
+
+    def generate(self, messages, max_new_tokens: int = 256, use_prefix_cache: bool = True, priority: int | None = None) -> str:
+        self.wait_ready()
+        if self._direct():
+            return self._generate(messages, max_new_tokens, use_prefix_cache)
+        return self.generate_async(messages, max_new_tokens, use_prefix_cache, priority).result()
+
+    def generate_async(self, messages, max_new_tokens: int = 256, use_prefix_cache: bool = True, priority: int | None = None) -> Future:
+        """scheduler에 생성 요청 → Future[str] (priority 없으면 max_new_tokens로 결정)"""
+        self.wait_ready()
+        if self.scheduler is None:
+            future: Future = Future()
+            future.set_result(self._generate(messages, max_new_tokens, use_prefix_cache))
+            return future
+        return self.scheduler.submit_generate(messages, max_new_tokens, priority, use_prefix_cache)
+
+    def generate_stream(self, messages, on_delta, max_new_tokens: int = 256, use_prefix_cache: bool = True,
+                        priority: int | None = None) -> str:
+        """
+        토큰이 나오는 대로 on_delta(text) 호출, 끝나면 전체 텍스트 반환 (후처리 파서용)
+        생성은 scheduler 스레드(또는 별도 스레드)에서, delta 전달은 호출 스레드에서
+        """
+        from transformers import TextIteratorStreamer
+
+        self.wait_ready()
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+
+        def job():
+            try:
+                return self._generate(messages, max_new_tokens, use_prefix_cache, streamer=streamer)
+            except Exception:
+                streamer.end()   # 실패해도 아래 iterator가 끝나도록
+                raise
+
+        if self._direct():
+            future: Future = Future()
+
+            def _run():
+                try:
+                    future.set_result(job())
+                except Exception as e:
+                    future.set_exception(e)
+
+            threading.Thread(target=_run, name="LLMStream", daemon=True).start()
+        else:
+            prio = default_priority(max_new_tokens) if priority is None else priority
+            future = self.scheduler.submit_call(job, priority=prio)
+
+        for delta in streamer:
+            if delta:
+                try:
+                    on_delta(delta)
+                except Exception:
+                    logging.warning("stream delta 전달 실패", exc_info=True)
+        return future.result()
+
+    def _generate(self, messages, max_new_tokens: int = 256, use_prefix_cache: bool = True, streamer=None) -> str:
+        import torch
+
+        input_ids, past = self._prepare(messages, use_prefix_cache)
+        output_ids = self.model.generate(
+            input_ids=input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            past_key_values=past,
+            max_new_tokens=max_new_tokens,
+            streamer=streamer,
+        )
+        output_ids = [out[len(inp):] for inp, out in zip(input_ids, output_ids)]
         return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)[0]
-    
-    def run_with_prompt(self, system_prompt: str, user_content: str, max_new_tokens=256, persistent=False) -> str:
+
+    def generate_batch(self, batch_messages, max_new_tokens: int | list[int] = 256) -> list[str]:
+        """여러 대화를 left-pad 해서 한 번의 model.generate로 생성 (요청별 max_new_tokens는 결과에서 잘라냄)"""
+        limits = max_new_tokens if isinstance(max_new_tokens, list) else [max_new_tokens] * len(batch_messages)
+        texts = [
+            self.tokenizer.apply_chat_template(m, tokenize=False, add_generation_prompt=True)
+            for m in batch_messages
+        ]
+        side = self.tokenizer.padding_side
+        self.tokenizer.padding_side = "left"
+        try:
+            inputs = self.tokenizer(texts, return_tensors="pt", padding=True).to(self.model.device)
+        finally:
+            self.tokenizer.padding_side = side
+        pad_id = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else self.tokenizer.eos_token_id
+        output_ids = self.model.generate(**inputs, max_new_tokens=max(limits), pad_token_id=pad_id)
+        new_tokens = output_ids[:, inputs.input_ids.shape[1]:]
+        return [
+            self.tokenizer.decode(tokens[:limit], skip_special_tokens=True)
+            for tokens, limit in zip(new_tokens, limits)
+        ]
+
+    def _forward(self, input_ids, past):
+        """past 이후 토큰만 forward (past 없으면 전체) → (logits [batch, seq, vocab], 이어 쓸 past)"""
+        cached = past.get_seq_length() if past is not None else 0
+        out = self.model(input_ids=input_ids[:, cached:], past_key_values=past, use_cache=True)
+        return out.logits, out.past_key_values
+
+    def _label_logits(self, past, rows: list[list[int]], pad_id: int) -> dict:
+        """
+        prompt past 뒤에 label 토큰열들을 이어 붙여 한 번의 batch forward → {label prefix: 그 다음 토큰 logits}
+        right-pad 는 causal attention 이라 앞 위치 logits에 영향 없음. past(_classify 전용 복사본)는 batch 크기로 늘려서 씀
+        """
+        import torch
+
+        width = max(len(r) for r in rows)
+        ids = torch.tensor([r + [pad_id] * (width - len(r)) for r in rows], device=self.model.device)
+        if hasattr(past, "batch_repeat_interleave"):
+            past.batch_repeat_interleave(len(rows))
+            logits = self.model(input_ids=ids, past_key_values=past, use_cache=True).logits
+        else:
+            # batch 복제를 못 하는 cache 구현 → label마다 복사본에 이어서 (복사는 갈라지는 label 수만큼)
+            logits = [self.model(input_ids=ids[i:i + 1], past_key_values=copy.deepcopy(past), use_cache=True).logits[0]
+                      for i in range(len(rows))]
+        out = {}
+        for row, row_logits in zip(rows, logits):
+            for depth in range(1, len(row) + 1):
+                out.setdefault(tuple(row[:depth]), row_logits[depth - 1])
+        return out
+
+    def classify(self, messages, labels: list[str]) -> tuple[str, dict[str, float]]:
+        """생성 없이 labels 중 하나로 분류 (scheduler에서 긴 생성보다 먼저 처리). 자세한 내용은 _classify"""
+        self.wait_ready()
+        if self._direct():
+            return self._classify(messages, labels)
+        return self.scheduler.submit_call(lambda: self._classify(messages, labels), priority=PRIORITY_HIGH).result()
+
+    def _classify(self, messages, labels: list[str]) -> tuple[str, dict[str, float]]:
+        """
+        생성 없이 labels 중 하나로 분류 (assistant 답이 label 토큰열이 될 확률을 비교)
+        - prompt는 한 번만 forward, label들의 첫 토큰이 서로 다르면 그 logits만으로 결정
+        - label끼리 공통 prefix가 있으면 prompt past 위에 label 토큰열 전체를 batch 한 번으로 forward (_label_logits)
+        return: (최고 확률 label, {label: 확률})  — 확률 합은 1
+        """
+        import torch
+
+        prompt_ids, past = self._prepare(messages)
+        seqs = {}
+        for label in dict.fromkeys(labels):
+            seqs[label] = self.tokenizer.encode(label, add_special_tokens=False)
+        end_id = self.tokenizer.eos_token_id
+
+        logp = {label: 0.0 for label in seqs}
+        with torch.no_grad():
+            logits, past = self._forward(prompt_ids, past)
+            node_logits = {(): logits[0, -1]}
+            stack = [((), list(seqs), node_logits[()])]
+            while stack:
+                prefix, group, logits = stack.pop()
+                depth = len(prefix)
+                branches: dict[int, list[str]] = {}
+                for label in group:
+                    seq = seqs[label]
+                    token = seq[depth] if len(seq) > depth else end_id   # 여기서 끝나는 label은 종료 토큰
+                    branches.setdefault(token, []).append(label)
+
+                if len(branches) == 1:
+                    # 갈림길이 아니면 확률 1 → forward 없이 다음 토큰으로
+                    (token, sub), = branches.items()
+                    if token != end_id:
+                        stack.append((prefix + (token,), sub, None))
+                    continue
+
+                if logits is None:
+                    if prefix not in node_logits:
+                        rows = [seqs[label] for label in seqs if seqs[label]]
+                        node_logits.update(self._label_logits(past, rows, end_id if end_id is not None else 0))
+                    logits = node_logits[prefix]
+                options = list(branches)
+                option_logp = torch.log_softmax(logits[options].float(), dim=-1).tolist()
+                for token, lp in zip(options, option_logp):
+                    for label in branches[token]:
+                        logp[label] += lp
+                    if token != end_id and len(branches[token]) > 1:
+                        stack.append((prefix + (token,), branches[token], None))
+
+        probs = {label: math.exp(v) for label, v in logp.items()}
+        best = max(probs, key=probs.get)
+        return best, probs
+
+    def run_with_prompt(self, system_prompt: str, user_content: str, max_new_tokens=256, persistent=False, on_delta=None) -> str:
         """
         system + user으로 대답 생성
         - persistent=True → 세션 유지
         - persistent=False → 1회성 실행
+        - on_delta → 토큰 스트리밍 (반환값은 동일하게 전체 텍스트)
         """
         if persistent:
-            self.message.append({"role": "system", "content": system_prompt})
-            self.message.append({"role": "user", "content": user_content})
-            result = self.generate(self.message, max_new_tokens=max_new_tokens)
-            self.message.append({"role": "assistant", "content": result})
+            self.memory.append("system", system_prompt)
+            self.memory.append("user", user_content)
+            messages = self.memory.messages(protect=2)   # 이번 system + user는 그대로
+            print(f"[LLM] prompt {self.memory.stats['last_prompt_tokens']} tokens "
+                  f"({len(messages)} messages, budget {self.memory.budget})")
+            result = self._run(messages, max_new_tokens, on_delta)
+            self.memory.append("assistant", result)
         else:
             temp_messages = [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_content},
             ]
-            result = self.generate(temp_messages, max_new_tokens=max_new_tokens)
+            result = self._run(temp_messages, max_new_tokens, on_delta)
         return result
 
+    def _run(self, messages, max_new_tokens: int, on_delta=None) -> str:
+        if on_delta is None:
+            return self.generate(messages, max_new_tokens=max_new_tokens)
+        return self.generate_stream(messages, on_delta, max_new_tokens=max_new_tokens)
+
     def reset_memory(self):
         """메모리 초기화"""
-        self.message = [{"role": "system", "content": "You are a helpful assistant."}]
+        self.memory.reset()
 
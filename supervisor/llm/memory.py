@@ -0,0 +1,178 @@
+# llm/memory.py
+import logging
+import threading
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYSTEM = "You are a helpful assistant."
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def approx_tokens(text: str) -> int:
+    """tokenizer가 없을 때 대략치 (영문 기준 4자 ≈ 1토큰)"""
+    return max(1, len(text) // 4)
+
+
+class _Entry:
+    __slots__ = ("role", "content", "tokens", "bulky")
+
+    def __init__(self, role: str, content: str, tokens: int, bulky: bool):
+        self.role = role
+        self.content = content
+        self.tokens = tokens    # 한 번만 계산해서 캐시
+        self.bulky = bulky      # 코드 덩어리 같은 큰 메시지 (가장 먼저 줄임)
+
+
+class ConversationMemory:
+    """
+    persistent 대화 메모리 (token budget 안으로 유지).
+    budget을 넘으면 오래된 것부터
+      1) 큰 메시지(merged repo source 등) 내용을 한 줄 placeholder로 교체
+      2) 오래된 턴을 summarizer로 요약해 summary 메시지 하나로 합치고 원본은 삭제
+         (summarizer가 없으면 그냥 삭제)
+    맨 앞 system 메시지와 최근 keep_last 개 메시지는 건드리지 않음
+    summarizer(LLM 호출)는 lock 밖에서 실행 → 요약하는 동안에도 다른 스레드의 append/messages 가 막히지 않음
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int] = approx_tokens,
+        budget: int = 6144,
+        bulky_tokens: int = 1024,
+        keep_last: int = 4,
+        summarizer: Callable[[List[Dict[str, str]]], str] | None = None,
+        system_prompt: str = DEFAULT_SYSTEM,
+    ):
+        self.count_tokens = count_tokens
+        self.budget = budget
+        self.bulky_tokens = bulky_tokens
+        self.keep_last = keep_last
+        self.summarizer = summarizer
+        self.system_prompt = system_prompt
+        self._lock = threading.RLock()
+        self._summarizing = threading.Lock()   # 요약은 한 번에 하나 (이어지는 요약이 앞 요약을 입력으로 받도록)
+        self.stats = {"evicted": 0, "stubbed": 0, "summarized": 0, "last_prompt_tokens": 0}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._entries: List[_Entry] = [self._entry("system", self.system_prompt)]
+            self._summary: _Entry | None = None
+
+    def _entry(self, role: str, content: str) -> _Entry:
+        tokens = self.count_tokens(content)
+        return _Entry(role, content, tokens, tokens >= self.bulky_tokens)
+
+    # ---------- public ----------
+    def append(self, role: str, content: str) -> None:
+        with self._lock:
+            self._entries.append(self._entry(role, content))
+
+    @property
+    def total_tokens(self) -> int:
+        with self._lock:
+            extra = self._summary.tokens if self._summary else 0
+            return extra + sum(e.tokens for e in self._entries)
+
+    def messages(self, protect: int | None = None) -> List[Dict[str, str]]:
+        """budget에 맞춘 뒤 chat template용 메시지 목록. protect → 끝에서부터 보호할 메시지 수"""
+        self.fit(protect)   # lock 밖 (요약 LLM 호출 동안 다른 스레드를 막지 않음)
+        with self._lock:
+            out = [{"role": e.role, "content": e.content} for e in self._entries[:1]]
+            if self._summary is not None:
+                out.append({"role": self._summary.role, "content": self._summary.content})
+            out.extend({"role": e.role, "content": e.content} for e in self._entries[1:])
+            self.stats["last_prompt_tokens"] = self.total_tokens
+            return out
+
+    def fit(self, protect: int | None = None) -> None:
+        """
+        budget 이하가 될 때까지 줄임 (보호 구간 밖에서만).
+        뺄 턴은 lock 안에서 떼어 내고, 요약은 lock 밖에서 만든 뒤 다시 lock을 잡고 넣음 → 요약이 budget을 넘기면 한 번 더
+        다른 스레드가 이미 요약 중이면 기다리지 않고 placeholder 교체까지만
+        """
+        protect = self.keep_last if protect is None else max(protect, 0)
+        with self._lock:
+            if self.total_tokens <= self.budget:
+                return
+            self._stub_bulky(protect)
+            if self.total_tokens <= self.budget:
+                return
+        if not self._summarizing.acquire(blocking=False):
+            return
+        try:
+            for _ in range(3):
+                with self._lock:
+                    if self.total_tokens <= self.budget:
+                        return
+                    dropped, previous = self._take_oldest(protect)
+                if not dropped or self.summarizer is None:
+                    break
+                summary = self._summarize(previous, dropped)
+                if summary is None:
+                    continue
+                with self._lock:
+                    self._summary = self._entry("system", SUMMARY_PREFIX + summary.strip())
+                    self.stats["summarized"] += 1
+            with self._lock:
+                self._trim_summary()
+                if self.total_tokens > self.budget:
+                    logger.warning("[Memory] %d tokens > budget %d (최근 메시지만으로 초과)", self.total_tokens, self.budget)
+        finally:
+            self._summarizing.release()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "messages": len(self._entries), "tokens": self.total_tokens, "budget": self.budget}
+
+    # ---------- eviction ----------
+    def _evictable(self, protect: int) -> range:
+        # 0번(system)과 끝의 protect개 제외
+        return range(1, max(1, len(self._entries) - protect))
+
+    def _stub_bulky(self, protect: int) -> None:
+        for i in self._evictable(protect):
+            if self.total_tokens <= self.budget:
+                return
+            e = self._entries[i]
+            if not e.bulky:
+                continue
+            stub = f"[{e.role} message omitted from memory: ~{e.tokens} tokens of code/data]"
+            self._entries[i] = self._entry(e.role, stub)
+            self.stats["stubbed"] += 1
+
+    def _take_oldest(self, protect: int):
+        """(lock 보유 상태) budget 안에 들어올 만큼 오래된 턴을 떼어 냄 → (떼어 낸 턴, 지금까지의 요약)"""
+        evictable = self._evictable(protect)
+        dropped: List[_Entry] = []
+        # 오래된 것부터 budget 안에 들어올 때까지
+        over = self.total_tokens - self.budget
+        for i in evictable:
+            if over <= 0:
+                break
+            dropped.append(self._entries[i])
+            over -= self._entries[i].tokens
+        if dropped:
+            del self._entries[1:1 + len(dropped)]
+            self.stats["evicted"] += len(dropped)
+        return dropped, self._summary
+
+    def _summarize(self, previous: _Entry | None, dropped: List[_Entry]) -> str | None:
+        """(lock 없이) 이전 요약 + 떼어 낸 턴 → 새 요약. 실패하면 None (턴은 그냥 삭제된 상태)"""
+        head = [{"role": "system", "content": previous.content}] if previous else []
+        try:
+            return self.summarizer(head + [{"role": e.role, "content": e.content} for e in dropped])
+        except Exception:
+            logger.warning("[Memory] 요약 실패, 오래된 턴은 그냥 삭제", exc_info=True)
+            return None
+
+    def _trim_summary(self) -> None:
+        """(lock 보유 상태) 더 뺄 턴이 없는데 요약 때문에 budget을 넘으면 요약 뒷부분을 잘라 맞춤"""
+        if self._summary is None or self.total_tokens <= self.budget:
+            return
+        allowed = self.budget - (self.total_tokens - self._summary.tokens)
+        content = self._summary.content
+        while content and self.count_tokens(content) > allowed:
+            content = content[:int(len(content) * 0.9)]
+        self._summary = self._entry("system", content) if content.strip() else None
@@ -0,0 +1,195 @@
+# llm/summarizer.py
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("SUMMARY_CACHE_DIR", Path.home() / ".cache" / "ai_agent" / "file_summaries"))
+MAP_PROMPT_KEY = "summarize_file"
+REDUCE_PROMPT_KEY = "summarize_reduce"
+
+
+class SummaryCache:
+    """파일(청크) 요약 디스크 캐시. key = hash(모델, map prompt, 파일명, 내용)"""
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                summary = json.load(f)["summary"]
+            self.hits += 1
+            return summary
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+    def put(self, key: str, path: str, summary: str) -> None:
+        p = self._path(key)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"path": path, "summary": summary, "created": time.time()}, f, ensure_ascii=False)
+            os.replace(tmp, p)
+        except OSError:
+            logger.warning("[SummaryCache] 저장 실패: %s", p, exc_info=True)
+
+
+class RepoSummarizer:
+    """
+    map-reduce repo 요약.
+    map    : 파일(큰 파일은 줄 단위 청크)마다 summarize_file prompt로 짧게 요약 → 캐시에 없는 것만 한꺼번에 생성 요청 (scheduler가 batch)
+    reduce : 파일 요약들을 summarize_reduce prompt로 [System Summary]/[User Summary]/[Execution] 형식으로 합침
+    전체 코드가 single_pass_tokens 이하면 기존처럼 summarize_experiment 한 번으로 처리
+    """
+
+    def __init__(self, llm, sysprompts: dict, cache: SummaryCache | None = None,
+                 chunk_tokens: int = 1500, single_pass_tokens: int = 3000, map_tokens: int = 160):
+        self.llm = llm
+        self.sysprompts = sysprompts
+        self.cache = cache or SummaryCache()
+        self.chunk_tokens = chunk_tokens
+        self.single_pass_tokens = single_pass_tokens
+        self.map_tokens = map_tokens
+        self._inflight: Dict[str, object] = {}   # prefetch로 미리 요청한 map 요약 {key: Future}
+
+    def summarize(self, files: List[Dict[str, str]], persistent: bool = False, on_delta=None) -> str:
+        """files: read_py_files stdout [{"path", "content"}] → summarize_experiment 와 같은 형식의 텍스트"""
+        merged_code = "\n\n".join([f"### {f['path'].split('/')[-1]}\n{f['content']}" for f in files])
+        if self.llm.count_tokens(merged_code) <= self.single_pass_tokens:
+            return self.llm.run_with_prompt(
+                self.sysprompts["summarize_experiment"], merged_code,
+                max_new_tokens=2048, persistent=persistent, on_delta=on_delta,
+            )
+
+        file_summaries = self.map_files(files)
+        reduce_input = "\n\n".join(f"### {path}\n{summary}" for path, summary in file_summaries.items())
+        return self.llm.run_with_prompt(
+            self.sysprompts[REDUCE_PROMPT_KEY], reduce_input,
+            max_new_tokens=1024, persistent=persistent, on_delta=on_delta,
+        )
+
+    def prefetch(self, files: List[Dict[str, str]]) -> int:
+        """파일이 다 모이기 전에 map 요약을 미리 요청 (map_files가 이어받음). 반환: 새로 요청한 청크 수"""
+        n = 0
+        for path, i, key, chunk in self._jobs(files):
+            if key in self._inflight or self.cache.get(key) is not None:
+                continue
+            future = self._submit(path, i, chunk)
+            self._inflight[key] = future
+            future.add_done_callback(lambda f, key=key, path=path: self._prefetched(key, path, f))
+            n += 1
+        return n
+
+    def _prefetched(self, key: str, path: str, future) -> None:
+        # map_files까지 안 가도(요청 취소 등) 결과는 캐시에 남김
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, path, future.result().strip())
+        self._inflight.pop(key, None)
+
+    def map_files(self, files: List[Dict[str, str]]) -> Dict[str, str]:
+        """파일별 요약 {path: summary} (캐시 hit은 바로, miss는 한 번에 요청 후 모아서 저장)"""
+        jobs = self._jobs(files)
+        results: Dict[tuple, str] = {}
+        pending = []
+        for path, i, key, chunk in jobs:
+            future = self._inflight.pop(key, None)
+            if future is None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[(path, i)] = cached
+                    continue
+                future = self._submit(path, i, chunk)
+            pending.append((path, i, key, future))
+
+        for path, i, key, future in pending:
+            summary = future.result().strip()
+            self.cache.put(key, path, summary)
+            results[(path, i)] = summary
+        logger.info("[RepoSummarizer] %d chunks, cache hit %d / generated %d", len(jobs), len(jobs) - len(pending), len(pending))
+
+        out: Dict[str, str] = {}
+        for path, i, _, _ in jobs:
+            out[path] = (out[path] + "\n" if path in out else "") + results[(path, i)]
+        return out
+
+    def _jobs(self, files: List[Dict[str, str]]) -> List[tuple]:
+        """[(path, chunk index, cache key, chunk)]"""
+        map_prompt = self.sysprompts[MAP_PROMPT_KEY]
+        jobs = []
+        for f in files:
+            name = f["path"].split("/")[-1]
+            for i, chunk in enumerate(self._chunks(f["content"])):
+                jobs.append((f["path"], i, self._key(map_prompt, name, chunk), chunk))
+        return jobs
+
+    def _submit(self, path: str, i: int, chunk: str):
+        name = path.split("/")[-1]
+        return self.llm.generate_async([
+            {"role": "system", "content": self.sysprompts[MAP_PROMPT_KEY]},
+            {"role": "user", "content": f"### {name} (part {i + 1})\n{chunk}"},
+        ], max_new_tokens=self.map_tokens)
+
+    def _key(self, map_prompt: str, name: str, chunk: str) -> str:
+        h = hashlib.sha256()
+        for part in (self.llm.model_name, map_prompt, name, chunk):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _chunks(self, content: str) -> List[str]:
+        """chunk_tokens 근처에서 줄 단위로 자름 (def/class 경계 우선)"""
+        if self.llm.count_tokens(content) <= self.chunk_tokens:
+            return [content]
+        chunks, current, size = [], [], 0
+        for line in content.splitlines(keepends=True):
+            n = self.llm.count_tokens(line)
+            boundary = line.startswith(("def ", "class ", "async def ", "@"))
+            if current and (size + n > self.chunk_tokens or (boundary and size > self.chunk_tokens // 2)):
+                chunks.append("".join(current))
+                current, size = [], 0
+            current.append(line)
+            size += n
+        if current:
+            chunks.append("".join(current))
+        return chunks
+
+
+class PageCollector:
+    """
+    read_py_files 페이지(stream 프레임)를 모음.
+    모인 코드가 한 번에 요약할 크기(single_pass_tokens)를 넘는 순간부터 map 요약을 미리 요청해서
+    나머지 파일을 읽는 동안 앞 파일 요약이 진행되게 함
+    """
+
+    def __init__(self, summarizer: RepoSummarizer):
+        self.summarizer = summarizer
+        self.files: List[Dict[str, str]] = []
+        self.tokens = 0
+        self.prefetching = False
+
+    def add(self, files: List[Dict[str, str]]) -> None:
+        self.files.extend(files)
+        llm = self.summarizer.llm
+        if not getattr(llm, "is_ready", True):
+            return
+        if self.prefetching:
+            self.summarizer.prefetch(files)
+            return
+        self.tokens += sum(llm.count_tokens(f["content"]) for f in files)
+        if self.tokens > self.summarizer.single_pass_tokens:
+            self.prefetching = True
+            n = self.summarizer.prefetch(self.files)
+            logger.info("[PageCollector] %d files read, map 요약 %d청크 미리 요청", len(self.files), n)
@@ -1,13 +1,20 @@
 import logging
 from core.supervisor_base import Supervisor
+from llm.backends import backend_from_env
 from handlers.user_handlers import register_user_handlers
 from handlers.git_handlers import register_git_handlers
 from handlers.bridge_handlers import register_bridge_handler
 
 logging.basicConfig(level=logging.INFO)
 
+MODEL_NAME = "Qwen/Qwen2.5-1.5B-Instruct"
+
 if __name__ == "__main__":
-    supervisor = Supervisor("Qwen/Qwen2.5-1.5B-Instruct", "0.0.0.0", 9002)
+    supervisor = Supervisor(
+        MODEL_NAME, "0.0.0.0", 9002,
+        server_mode="asyncio",
+        llm_backend=backend_from_env(),   # CPU 호스트: LLM_BACKEND=cpu-int8 LLM_THREADS=8
+    )
     register_git_handlers(supervisor)
     register_user_handlers(supervisor)
     register_bridge_handler(supervisor)   # 브릿지 핸들러 추가
@@ -6,3 +6,23 @@ def extract_repo_name(git_url: str) -> str:
     if name.endswith(".git"):
         name = name[:-4]
     return name
+
+
+def apply_scan_delta(files: list, delta: dict) -> list:
+    """
+    read_py_files 결과 [{"path", "rel", "content"}] 에 scan_changes 결과를 반영한 새 목록
+    (content가 있는 .py 항목만 추가/교체, deleted는 제거, 잘린 파일은 "truncated" 유지)
+    """
+    if delta.get("full"):
+        by_path = {}
+    else:
+        deleted = set(delta.get("deleted") or [])
+        by_path = {f["path"]: f for f in files if f.get("rel") not in deleted}
+    for item in (delta.get("added") or []) + (delta.get("modified") or []):
+        if "content" in item:
+            by_path[item["path"]] = {"path": item["path"], "rel": item["rel"], "content": item["content"]}
+            if item.get("truncated"):
+                by_path[item["path"]]["truncated"] = True
+        elif item.get("skipped"):
+            by_path.pop(item["path"], None)
+    return sorted(by_path.values(), key=lambda f: f.get("rel") or f["path"])
@@ -1,15 +1,35 @@
 import re
 
+# 모델 준비 전 fallback 규칙 (순서대로 검사, prompts.yaml intent_classifier 정의 기준)
+# negative 먼저: "no, don't add" 처럼 거절 + 수정 단어가 같이 오면 진행하지 않음
+_RULES = [
+    ("negative", re.compile(r"\b(no|nope|cancel|stop|don'?t)\b|취소|하지\s*마|아니|싫어|중단", re.I)),
+    ("revise", re.compile(r"\b(change|fix|modify|add|edit|layer)\b|수정|추가|변경|고쳐|바꿔", re.I)),
+    ("direct", re.compile(r"\b(run|start|go)\b|바로|실행|시작", re.I)),
+    ("positive", re.compile(r"\b(yes|yep|ok|okay|sure|proceed)\b|\b(네|예|응)\b|그래|좋아|좋습니다|진행", re.I)),
+]
+
+
 class IntentClassifier:
-    def __init__(self, llm, sysprompts: dict):
+    LABELS = ["positive", "negative", "revise", "direct"]
+
+    def __init__(self, llm, sysprompts: dict, min_confidence: float = 0.0):
         self.llm = llm
         self.sysprompts = sysprompts
+        self.min_confidence = min_confidence   # 이보다 낮으면 negative(진행 안 함)로 처리
+        self.last_scores: dict[str, float] = {}
 
     def get_intent(self, answer: str, question: str | None = None) -> str:
         """
         사용자 입력의 의도 판별.
         return: "positive", "negative", "revise", "direct"
         """
+        if not getattr(self.llm, "is_ready", True):
+            cand = self.rule_based(answer)
+            self.last_scores = {cand: 1.0}
+            print(f"[Intent] {cand} (rule-based, model {self.llm.state})")
+            return cand
+
         system_prompt = self.sysprompts["intent_classifier"]
 
         # 질문이 있으면 Q/A 형태로 묶어주기
@@ -23,11 +43,18 @@ class IntentClassifier:
             {"role": "user", "content": content},            
         ]
 
-        raw = self.llm.generate(messages, max_new_tokens=8)
-        norm = re.sub(r"[^a-z]", "", raw.lower())
+        cand, scores = self.llm.classify(messages, self.LABELS)
+        self.last_scores = scores
+        print(f"[Intent] {cand} ({scores[cand]:.2f})")
+
+        if scores[cand] < self.min_confidence:
+            return "negative"
+        return cand
 
-        # 후보 집합 (direct까지 포함)
-        for cand in ["positive", "negative", "revise", "direct"]:
-            if cand in norm:
-                return cand
+    @staticmethod
+    def rule_based(answer: str) -> str:
+        """모델 없이 키워드로 판별 (모델 로딩 중 fallback). 애매하면 negative"""
+        for label, pattern in _RULES:
+            if pattern.search(answer):
+                return label
         return "negative"
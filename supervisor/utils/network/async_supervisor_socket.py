@@ -0,0 +1,191 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .event_emitter import EventEmitter
+from .framing import HEADER, DEFAULT_MAX_FRAME, FrameError, pack_header
+from .coder_pool import CoderConnection, CoderPool
+
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+
+
+class AsyncCoderConnection(CoderConnection):
+    """
+    asyncio stream 기반 coder 연결.
+    send()는 어느 스레드에서 불러도 block되지 않고, 연결별 write queue에 넣기만 함
+    (실제 write/drain은 이벤트 루프의 writer task가 처리)
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop):
+        super().__init__(writer.get_extra_info("socket"), writer.get_extra_info("peername") or ("?", 0))
+        self.writer = writer
+        self.loop = loop
+        self.out_q: "asyncio.Queue[bytes | None]" = asyncio.Queue()
+
+    def send(self, obj) -> None:
+        data = obj if isinstance(obj, (bytes, bytearray)) else self.codec.encode(obj)
+        frame = pack_header(len(data)) + bytes(data)
+        self.loop.call_soon_threadsafe(self.out_q.put_nowait, frame)
+
+    def accept_hello(self, hello):
+        ack = self.codec.negotiate(hello)
+        self.send(ack)          # ack는 협상 전 형식으로 큐에 먼저 넣고
+        self.codec.accept(ack)  # 그 다음 프레임부터 전환
+        return ack
+
+    async def writer_loop(self):
+        while True:
+            frame = await self.out_q.get()
+            if frame is None:
+                break
+            self.writer.write(frame)
+            await self.writer.drain()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.out_q.put_nowait, None)
+        self.loop.call_soon_threadsafe(self.writer.close)
+
+
+class AsyncSupervisorServer:
+    """
+    asyncio.start_server 기반 SupervisorServer (인터페이스 동일: emitter / pool / send_supervisor_response / run_main)
+    - 프레임 파싱은 이벤트 루프에서
+    - coder_message 핸들러(LLM 호출 등)는 bounded executor에서 바로 실행 (emitter 큐를 한 번 더 거치지 않음)
+      → 핸들러가 오래 걸려도 소켓은 계속 읽고, 느린 핸들러 하나가 다른 coder를 막지 않음
+    - 연결별 dispatch 큐로 같은 coder의 메시지 순서는 유지
+    """
+
+    def __init__(
+        self,
+        host="0.0.0.0",
+        port=9001,
+        max_inflight_per_coder: int | None = None,
+        dispatch_workers: int = 4,
+        inbox_size: int = 1024,
+        dispatch_batch: int = 64,
+        max_frame: int = DEFAULT_MAX_FRAME,
+    ):
+        self.host = host
+        self.port = port
+        self.emitter = EventEmitter()
+        self.pool = CoderPool(max_inflight=max_inflight_per_coder)
+        self.executor = ThreadPoolExecutor(max_workers=dispatch_workers, thread_name_prefix="coder-dispatch")
+        self.inbox_size = inbox_size
+        self.dispatch_batch = dispatch_batch
+        self.max_frame = max_frame
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._ready = threading.Event()
+
+    async def _serve(self):
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        print(f"{RED}[Supervisor] Listening on {self.host}:{self.port} (asyncio){RESET}")
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        conn = AsyncCoderConnection(writer, self.loop)
+        codec = conn.codec
+        print(f"{RED}[Supervisor] Connected by {conn.addr}{RESET}")
+        inbox: asyncio.Queue = asyncio.Queue(maxsize=self.inbox_size)
+        tasks = [
+            asyncio.create_task(conn.writer_loop()),
+            asyncio.create_task(self._dispatch_loop(inbox)),
+        ]
+        self.pool.add(conn)
+
+        try:
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                (length,) = HEADER.unpack(header)
+                if length > self.max_frame:
+                    raise FrameError(f"frame too large: {length} > {self.max_frame}")
+                payload = await reader.readexactly(length)
+                try:
+                    task_data = codec.decode(payload)
+                except ValueError:
+                    print("[Supervisor] Invalid frame received:", payload[:200])
+                    continue
+                if codec.is_hello(task_data):
+                    conn.accept_hello(task_data)
+                    self.pool.register(conn, task_data.get("coder_id"), task_data.get("capabilities"))
+                    print(f"[Supervisor] coder 등록: {conn.coder_id} (codec {codec.codec}/{codec.compression})")
+                    continue
+                if isinstance(task_data, dict):
+                    task = self.pool.complete(task_data, conn)
+                    if not self.pool.should_dispatch(task):
+                        continue   # 응답을 future로 기다리는 task (또는 취소된 task)
+                    task_data.setdefault("coder_id", conn.coder_id)
+                await inbox.put(task_data)   # inbox가 차면 여기서 읽기를 멈춤 (backpressure)
+        except asyncio.IncompleteReadError:
+            pass
+        except Exception as e:
+            print(f"[Supervisor] Error: {e}")
+        finally:
+            self.pool.remove(conn)
+            await inbox.join()
+            conn.close()
+            for t in tasks:
+                t.cancel()
+        print(f"{YELLOW}[Supervisor] Disconnected {conn.coder_id}, wire stats: {codec.stats.snapshot()}{RESET}")
+
+    async def _dispatch_loop(self, inbox: asyncio.Queue):
+        """이미 도착해 있는 메시지는 한 번에 묶어서 executor로 넘김 (프레임마다 스레드 전환하지 않도록)"""
+        while True:
+            batch = [await inbox.get()]
+            while len(batch) < self.dispatch_batch and not inbox.empty():
+                batch.append(inbox.get_nowait())
+            try:
+                await self.loop.run_in_executor(self.executor, self._emit_batch, batch)
+            finally:
+                for _ in batch:
+                    inbox.task_done()
+
+    def _emit_batch(self, batch: list):
+        for msg in batch:
+            try:
+                self.emitter.emit_sync("coder_message", msg)
+            except Exception as e:
+                print(f"[Supervisor] handler error: {e}")
+
+    def dispatch(self, msg) -> None:
+        """소켓 밖(브릿지/입력 루프)에서 온 coder_message 도 같은 executor에서 처리"""
+        self.executor.submit(self._emit_batch, [msg])
+
+    def wire_stats(self) -> dict:
+        return {c.coder_id: c.codec.stats.snapshot() for c in self.pool.coders()}
+
+    def send_supervisor_response(
+        self,
+        response,
+        coder_id: str | None = None,
+        timeout: float | None = None,
+        dispatch: bool = True,
+    ):
+        """SupervisorServer.send_supervisor_response 와 동일 (어느 스레드에서든 호출 가능)"""
+        try:
+            if isinstance(response, dict):
+                return self.pool.submit(dict(response), coder_id=coder_id, timeout=timeout, dispatch=dispatch)
+            conn = self.pool.get(coder_id) if coder_id else min(self.pool.coders(), key=lambda c: c.load, default=None)
+            if conn is None:
+                print("[Supervisor] 응답 전송 오류: 연결된 coder 없음")
+                return None
+            conn.send(response)
+        except Exception as e:
+            print(f"[Supervisor] 응답 전송 오류: {e}")
+        return None
+
+    def start(self):
+        """서버 시작 (block)"""
+        asyncio.run(self._serve())
+
+    def run_main(self):
+        """별도 스레드에서 이벤트 루프 실행"""
+        server_thread = threading.Thread(target=self.start, name="SupervisorServerLoop", daemon=True)
+        server_thread.start()
+        self._ready.wait(timeout=5)
@@ -0,0 +1,437 @@
+# coder_pool.py
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from utils.git_utils import extract_repo_name
+from .framing import send_frame
+from .wire_codec import WireCodec
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_PREFIX = "/workspace/"
+# 실행 중에 오는 부분 결과 (task 완료가 아님)
+PARTIAL_RESULTS = {"stream"}
+CANCEL_ACTION = "cancel_task"
+# 다시 보내도 결과/부작용이 같은 action (읽기 전용). coder가 끊기면 이것만 같은 coder로 재전송
+IDEMPOTENT_ACTIONS = {
+    "read_py_files", "list_files", "scan_changes", "git_status", "git_current_branch", "git_list_branches",
+    "venv_cache_stats", "warm_pool_stats", "wheelhouse_stats",
+}
+RECONNECT_GRACE = 60.0   # 끊긴 coder가 이 시간 안에 다시 붙지 않으면 기다리던 task 실패 + affinity 해제
+
+# coder 소켓을 읽는 스레드 표시 (이 스레드에서 응답을 기다리면 응답을 못 읽어 deadlock)
+_reader = threading.local()
+
+
+def mark_reader_thread() -> None:
+    _reader.active = True
+
+
+def in_reader_thread() -> bool:
+    return getattr(_reader, "active", False)
+
+
+_END = object()
+
+
+class TaskFuture(Future):
+    """supervisor → coder task의 응답 future. result() → coder 응답 dict (result가 "fail"이어도 그대로)"""
+
+    def __init__(self, task_id: str):
+        super().__init__()
+        self.task_id = task_id
+        self._timer: threading.Timer | None = None
+        self._partials: queue.SimpleQueue = queue.SimpleQueue()
+        self.add_done_callback(lambda f: f._partials.put(_END))
+
+    def partials(self, timeout: float | None = None) -> Iterator[Dict[str, Any]]:
+        """
+        최종 응답 전에 온 부분 프레임(result="stream")을 도착 순서대로 (dispatch=False task만 쌓임).
+        최종 응답이 오면 끝남 → 이어서 result() 로 최종 응답
+        """
+        if in_reader_thread():
+            raise RuntimeError("coder 수신 스레드에서는 task 응답을 기다릴 수 없음 (asyncio 서버 모드에서 사용)")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"task {self.task_id}: no response within {timeout}s")
+            try:
+                msg = self._partials.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if msg is _END:
+                return
+            yield msg
+
+    def result(self, timeout=None):
+        if not self.done() and in_reader_thread():
+            raise RuntimeError("coder 수신 스레드에서는 task 응답을 기다릴 수 없음 (asyncio 서버 모드에서 사용)")
+        return super().result(timeout)
+
+
+def wait_all(futures: Iterable[Future], timeout: float | None = None) -> List[Any]:
+    """여러 task 응답을 한꺼번에 기다림. 반환 순서 = 인자 순서, timeout은 전체 기준"""
+    futures = list(futures)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    results = []
+    for f in futures:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        results.append(f.result(timeout=remaining))
+    return results
+
+
+def task_repo_key(task: Dict[str, Any]) -> Optional[str]:
+    """task가 다루는 repo 이름 (affinity 라우팅 키). 알 수 없으면 None"""
+    metadata = task.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        return None
+    if metadata.get("git_url"):
+        return extract_repo_name(metadata["git_url"])
+
+    candidates = [metadata.get(k) for k in ("dir_path", "cwd", "venv_path", "repo_path")]
+    target = task.get("target")
+    if isinstance(target, list) and target:
+        candidates.append(target[0])
+    for value in candidates:
+        if not isinstance(value, str) or not value.strip("/"):
+            continue
+        if value.startswith(WORKSPACE_PREFIX):
+            value = value[len(WORKSPACE_PREFIX):]
+        return value.strip("/").split("/")[0]
+    return None
+
+
+class CoderConnection:
+    """coder 소켓 하나의 상태 (id, capability, 코덱, 진행 중 task)"""
+
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.coder_id = f"{addr[0]}:{addr[1]}"   # hello 전까지 임시 id
+        self.capabilities: set[str] = set()       # 비어 있으면 모든 action 허용 (구버전 coder)
+        self.codec = WireCodec()
+        self.inflight: Dict[str, Dict[str, Any]] = {}
+        self.cancelled: Dict[str, Dict[str, Any]] = {}   # 취소 요청을 보냈지만 아직 응답이 안 온 task
+        self._send_lock = threading.Lock()
+
+    @property
+    def load(self) -> int:
+        return len(self.inflight)
+
+    def supports(self, action: str | None) -> bool:
+        return not self.capabilities or action in self.capabilities
+
+    def send(self, obj: Any) -> None:
+        data = obj if isinstance(obj, (bytes, bytearray)) else self.codec.encode(obj)
+        with self._send_lock:
+            send_frame(self.sock, data)
+
+    def accept_hello(self, hello: Dict[str, Any]) -> Dict[str, Any]:
+        """코덱 선택 후 ack 전송 (ack는 협상 전 형식으로 보내고 그 다음부터 전환)"""
+        ack = self.codec.negotiate(hello)
+        with self._send_lock:
+            send_frame(self.sock, self.codec.encode(ack))
+            self.codec.accept(ack)
+        return ack
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class CoderPool:
+    """
+    연결된 coder 레지스트리 + task 스케줄러.
+    - repo affinity: 어떤 repo의 task가 처음 배정된 coder에 이후 task도 고정 (clone한 곳에서 실행)
+    - 그 외에는 해당 action을 지원하는 coder 중 least-loaded 선택
+    - 보낼 coder가 없으면 backlog에 쌓았다가 coder 연결/작업 완료 시 재배정
+    - coder 연결이 끊기면 진행 중 task 중 IDEMPOTENT_ACTIONS 만 같은 coder_id 에 고정해서 backlog로 (재연결 대기),
+      나머지(apply_patch, run_in_venv ...)는 future를 ConnectionError 로 실패 (다른 coder에서 몰래 다시 실행하지 않음)
+      RECONNECT_GRACE 안에 돌아오지 않으면 기다리던 task도 실패, repo affinity 해제
+    - task마다 TaskFuture를 돌려주고 응답이 오면 완료 (timeout / cancel 시 coder에 cancel_task 전송)
+    """
+
+    def __init__(self, max_inflight: int | None = None):
+        self.max_inflight = max_inflight
+        self._coders: Dict[str, CoderConnection] = {}
+        self._affinity: Dict[str, str] = {}
+        self._backlog: deque = deque()
+        self._futures: Dict[str, TaskFuture] = {}
+        self._lock = threading.RLock()
+
+    # ---------- registry ----------
+    def add(self, conn: CoderConnection) -> None:
+        with self._lock:
+            self._coders[conn.coder_id] = conn
+        self.flush()
+
+    def register(self, conn: CoderConnection, coder_id: str | None, capabilities: List[str] | None) -> None:
+        """hello 수신 시 id/capability 갱신"""
+        stale = None
+        with self._lock:
+            if coder_id and coder_id != conn.coder_id:
+                self._coders.pop(conn.coder_id, None)
+                for repo, cid in self._affinity.items():
+                    if cid == conn.coder_id:
+                        self._affinity[repo] = coder_id
+                stale = self._coders.get(coder_id)
+                conn.coder_id = coder_id
+                self._coders[coder_id] = conn
+            conn.capabilities = set(capabilities or [])
+        if stale is not None and stale is not conn:
+            # 같은 coder가 재연결 → 이전 소켓의 task는 새 연결로 재배정
+            logger.info("[CoderPool] %s reconnected, replacing old connection", coder_id)
+            self._release(stale)
+            stale.close()
+        self.flush()
+
+    def remove(self, conn: CoderConnection) -> None:
+        with self._lock:
+            if self._coders.get(conn.coder_id) is not conn:
+                return
+            del self._coders[conn.coder_id]
+        self._release(conn)
+        # affinity는 유지 → 그 repo의 task는 다른 coder(clone 없음)로 가지 않고 재연결을 기다림
+        timer = threading.Timer(RECONNECT_GRACE, self._give_up, args=(conn.coder_id,))
+        timer.daemon = True
+        timer.start()
+        self.flush()
+
+    def _release(self, conn: CoderConnection) -> None:
+        """끊긴 연결의 진행 중 task 정리: idempotent → 같은 coder_id 로 고정해서 backlog 앞쪽, 나머지 → 실패"""
+        with self._lock:
+            tasks = list(conn.inflight.values())
+            conn.inflight.clear()
+            conn.cancelled.clear()
+            retry = [t for t in tasks if t.get("action") in IDEMPOTENT_ACTIONS]
+            for task in retry:
+                task["_coder_id"] = conn.coder_id
+                task["_orphan_of"] = conn.coder_id
+            # 원래 순서대로 backlog 앞쪽에
+            self._backlog.extendleft(reversed(retry))
+            failed = [(t, self._futures.pop(t["task_id"], None)) for t in tasks if t not in retry]
+        if retry:
+            logger.warning("[CoderPool] %d idempotent task(s) wait for %s to reconnect", len(retry), conn.coder_id)
+        for task, future in failed:
+            logger.warning("[CoderPool] %s disconnected while running %s (%s)", conn.coder_id, task.get("action"), task["task_id"])
+            if future is not None:
+                self._fail(future, ConnectionError(
+                    f"coder {conn.coder_id} disconnected while running {task.get('action')} ({task['task_id']})"))
+
+    def _give_up(self, coder_id: str) -> None:
+        """RECONNECT_GRACE 가 지나도 coder가 돌아오지 않음 → 기다리던 task 실패, affinity 해제"""
+        with self._lock:
+            if coder_id in self._coders:
+                return
+            orphans = [t for t in self._backlog if t.get("_orphan_of") == coder_id]
+            for task in orphans:
+                self._backlog.remove(task)
+            failed = [(t, self._futures.pop(t["task_id"], None)) for t in orphans]
+            for repo in [r for r, cid in self._affinity.items() if cid == coder_id]:
+                del self._affinity[repo]
+        for task, future in failed:
+            if future is not None:
+                self._fail(future, ConnectionError(f"coder {coder_id} did not reconnect within {RECONNECT_GRACE}s"))
+        self.flush()
+
+    def get(self, coder_id: str) -> Optional[CoderConnection]:
+        with self._lock:
+            return self._coders.get(coder_id)
+
+    def coders(self) -> List[CoderConnection]:
+        with self._lock:
+            return list(self._coders.values())
+
+    # ---------- scheduling ----------
+    def submit(
+        self,
+        task: Dict[str, Any],
+        coder_id: str | None = None,
+        timeout: float | None = None,
+        dispatch: bool = True,
+    ) -> TaskFuture:
+        """
+        task 배정 (task_id가 없으면 생성). 반환: 응답 TaskFuture (future.task_id)
+        timeout    → 그 시간 안에 응답이 없으면 TimeoutError + coder에 취소 요청
+        dispatch   → False면 응답은 future로만 전달 (coder_message 이벤트로 흘리지 않음)
+        """
+        task.setdefault("task_id", uuid.uuid4().hex)
+        if coder_id:
+            task["_coder_id"] = coder_id
+        if not dispatch:
+            task["_dispatch"] = False
+        task_id = task["task_id"]
+
+        future = TaskFuture(task_id)
+        with self._lock:
+            self._futures[task_id] = future
+            self._backlog.append(task)
+        if timeout is not None:
+            future._timer = threading.Timer(timeout, self._expire, args=(task_id, timeout))
+            future._timer.daemon = True
+            future._timer.start()
+        future.add_done_callback(self._on_future_done)
+        self.flush()
+        return future
+
+    def complete(self, msg: Dict[str, Any], conn: CoderConnection) -> Optional[Dict[str, Any]]:
+        """coder 응답 수신 → 해당 task를 in-flight에서 제거하고 future 완료. 반환: 원래 task (모르면 None)"""
+        task_id = msg.get("task_id") if isinstance(msg, dict) else None
+        if not task_id:
+            return None
+        if msg.get("result") in PARTIAL_RESULTS:
+            with self._lock:
+                task = conn.inflight.get(task_id) or conn.cancelled.get(task_id)
+                future = self._futures.get(task_id)
+            if future is not None and task is not None and not task.get("_dispatch", True):
+                future._partials.put(msg)
+            return task
+        with self._lock:
+            task = conn.inflight.pop(task_id, None)
+            if task is None:
+                task = conn.cancelled.pop(task_id, None)
+            future = self._futures.pop(task_id, None)
+        if future is not None:
+            self._resolve(future, msg)
+        if task is not None:
+            self.flush()
+        return task
+
+    @staticmethod
+    def should_dispatch(task: Optional[Dict[str, Any]]) -> bool:
+        """complete()가 돌려준 task의 응답을 coder_message 이벤트로 흘릴지"""
+        if task is None:
+            return True
+        return task.get("_dispatch", True) and not task.get("_cancelled")
+
+    def cancel(self, task_id: str) -> bool:
+        """task 취소 (backlog면 제거, coder에 가 있으면 cancel_task 전송). 이미 끝났으면 False"""
+        with self._lock:
+            future = self._futures.get(task_id)
+        if future is None:
+            return False
+        return future.cancel()
+
+    def _on_future_done(self, future: TaskFuture) -> None:
+        if future._timer is not None:
+            future._timer.cancel()
+        if future.cancelled():
+            self._abort(future.task_id)
+
+    def _expire(self, task_id: str, timeout: float) -> None:
+        with self._lock:
+            future = self._futures.get(task_id)
+        if future is None or future.done():
+            return
+        self._abort(task_id)
+        try:
+            future.set_exception(TimeoutError(f"task {task_id} timed out after {timeout}s"))
+        except Exception:
+            pass   # 그 사이 응답이 옴
+
+    def _abort(self, task_id: str) -> None:
+        """future 쪽에서 포기한 task 정리 (backlog 제거 또는 coder에 취소 요청)"""
+        target = None
+        with self._lock:
+            self._futures.pop(task_id, None)
+            for i, task in enumerate(self._backlog):
+                if task.get("task_id") == task_id:
+                    del self._backlog[i]
+                    return
+            for conn in self._coders.values():
+                task = conn.inflight.pop(task_id, None)
+                if task is not None:
+                    task["_cancelled"] = True
+                    conn.cancelled[task_id] = task
+                    target = conn
+                    break
+        if target is None:
+            return
+        try:
+            target.send({"command": "control", "action": CANCEL_ACTION, "metadata": {"task_id": task_id}})
+        except Exception as e:
+            logger.warning("[CoderPool] cancel to %s failed: %s", target.coder_id, e)
+        self.flush()
+
+    @staticmethod
+    def _resolve(future: TaskFuture, msg: Dict[str, Any]) -> None:
+        try:
+            future.set_result(msg)
+        except Exception:
+            pass   # 이미 취소/timeout 처리됨
+
+    @staticmethod
+    def _fail(future: TaskFuture, exc: Exception) -> None:
+        try:
+            future.set_exception(exc)
+        except Exception:
+            pass   # 이미 취소/timeout 처리됨
+
+    def flush(self) -> None:
+        """backlog에서 보낼 수 있는 task를 모두 배정"""
+        while True:
+            with self._lock:
+                picked = None
+                for i, task in enumerate(self._backlog):
+                    conn = self._choose(task)
+                    if conn is not None:
+                        picked = (i, task, conn)
+                        break
+                if picked is None:
+                    return
+                i, task, conn = picked
+                del self._backlog[i]
+                conn.inflight[task["task_id"]] = task
+                repo = task_repo_key(task)
+                if repo and repo not in self._affinity:
+                    self._affinity[repo] = conn.coder_id
+
+            wire_task = {k: v for k, v in task.items() if not k.startswith("_")}
+            try:
+                conn.send(wire_task)
+            except Exception as e:
+                logger.warning("[CoderPool] send to %s failed: %s", conn.coder_id, e)
+                self.remove(conn)
+                conn.close()
+
+    def _choose(self, task: Dict[str, Any]) -> Optional[CoderConnection]:
+        """(lock 보유 상태) task를 보낼 coder. 지금 보낼 수 없으면 None"""
+        pinned = task.get("_coder_id")
+        if not pinned:
+            repo = task_repo_key(task)
+            pinned = self._affinity.get(repo) if repo else None
+        if pinned:
+            conn = self._coders.get(pinned)
+            if conn is not None:
+                return conn if self._has_capacity(conn) else None
+            if task.get("_coder_id"):
+                return None   # 명시적으로 지정된 coder가 돌아올 때까지 대기
+
+        candidates = [c for c in self._coders.values() if c.supports(task.get("action")) and self._has_capacity(c)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda c: c.load)
+
+    def _has_capacity(self, conn: CoderConnection) -> bool:
+        return self.max_inflight is None or conn.load < self.max_inflight
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "coders": {
+                    cid: {"addr": f"{c.addr[0]}:{c.addr[1]}", "inflight": c.load, "capabilities": sorted(c.capabilities)}
+                    for cid, c in self._coders.items()
+                },
+                "affinity": dict(self._affinity),
+                "backlog": len(self._backlog),
+                "pending_futures": len(self._futures),
+            }
@@ -1,11 +1,85 @@
 # event_emitter.py
+import itertools
+import threading
+import time
+from collections import deque
 from threading import RLock
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List
+
+# 큐가 가득 찼을 때 정책
+BLOCK = "block"              # 자리가 날 때까지 emit 호출자가 대기
+DROP_OLDEST = "drop_oldest"  # 가장 오래된 이벤트를 버리고 넣음
+REJECT = "reject"            # 넣지 않고 emit이 False 반환
+POLICIES = (BLOCK, DROP_OLDEST, REJECT)
+
+_LATENCY_SAMPLES = 256
+
+
+class _Lane:
+    """worker 하나가 처리하는 큐 (같은 key는 항상 같은 lane → 순서 보장). maxsize 0 → 무제한"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.items: deque = deque()
+        self.cond = threading.Condition()
+
+
+class _AsyncEvent:
+    """이벤트 하나의 lane/worker/지표"""
+
+    def __init__(self, name: str, workers: int, maxsize: int, policy: str, key: Callable | None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        self.name = name
+        self.policy = policy
+        self.key = key
+        per_lane = max(1, maxsize // workers) if maxsize > 0 else 0
+        self.lanes = [_Lane(per_lane) for _ in range(workers)]
+        self._rr = itertools.count()
+
+        self.lock = threading.Lock()
+        self.emitted = 0
+        self.handled = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.wait_ms: deque = deque(maxlen=_LATENCY_SAMPLES)
+        self.handler_ms: deque = deque(maxlen=_LATENCY_SAMPLES)
+
+    def lane_for(self, args, kw) -> _Lane:
+        k = None
+        if self.key is not None:
+            try:
+                k = self.key(*args, **kw)
+            except Exception:
+                k = None
+        if k is None:
+            return self.lanes[next(self._rr) % len(self.lanes)]
+        return self.lanes[hash(k) % len(self.lanes)]
+
+    def depth(self) -> int:
+        return sum(len(lane.items) for lane in self.lanes)
+
+
+def _percentile(samples, q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
 
 class EventEmitter:
+    """
+    이벤트 리스너 관리.
+    - 기본은 동기 호출 (emit을 부른 스레드에서 리스너 실행)
+    - configure()로 지정한 이벤트는 bounded 큐 + worker에서 실행 → emit은 넣기만 하고 바로 반환
+    """
+
     def __init__(self):
         self._ls: Dict[str, List[Callable]] = {}
         self._lock = RLock()
+        self._async: Dict[str, _AsyncEvent] = {}
 
     def on(self, event: str, fn: Callable):
         with self._lock:
@@ -16,11 +90,112 @@ class EventEmitter:
             if event in self._ls:
                 self._ls[event] = [f for f in self._ls[event] if f != fn]
 
-    def emit(self, event: str, *args, **kw):
+    def configure(
+        self,
+        event: str,
+        workers: int = 1,
+        maxsize: int = 1000,
+        policy: str = BLOCK,
+        key: Callable[..., Any] | None = None,
+    ):
+        """
+        event를 비동기 모드로 전환.
+        workers  → lane(큐+worker 스레드) 개수, maxsize → 전체 큐 크기 (lane마다 maxsize // workers, 0이면 무제한)
+        policy   → 큐가 가득 찼을 때: "block" | "drop_oldest" | "reject"
+        key      → emit 인자로 순서 key 계산 (예: session id). 같은 key는 같은 lane에서 순서대로 처리
+        """
+        with self._lock:
+            if event in self._async:
+                raise ValueError(f"event '{event}' already configured")
+            state = _AsyncEvent(event, max(1, workers), maxsize, policy, key)
+            self._async[event] = state
+        for i, lane in enumerate(state.lanes):
+            threading.Thread(
+                target=self._worker, args=(state, lane), name=f"emit-{event}-{i}", daemon=True
+            ).start()
+
+    def emit(self, event: str, *args, **kw) -> bool:
+        """비동기 이벤트면 큐에 넣고, 아니면 바로 실행. 큐에서 거절되면 False"""
+        state = self._async.get(event)
+        if state is None:
+            self.emit_sync(event, *args, **kw)
+            return True
+
+        lane = state.lane_for(args, kw)
+        with lane.cond:
+            while lane.maxsize and len(lane.items) >= lane.maxsize:
+                if state.policy == REJECT:
+                    with state.lock:
+                        state.rejected += 1
+                    return False
+                if state.policy == DROP_OLDEST:
+                    lane.items.popleft()
+                    with state.lock:
+                        state.dropped += 1
+                    break
+                lane.cond.wait()
+            lane.items.append((time.perf_counter(), args, kw))
+            lane.cond.notify_all()
+        with state.lock:
+            state.emitted += 1
+            state.max_depth = max(state.max_depth, state.depth())
+        return True
+
+    def emit_sync(self, event: str, *args, **kw):
+        """호출 스레드에서 바로 리스너 실행 (가벼운 리스너용 fast path)"""
         with self._lock:
             listeners = list(self._ls.get(event, []))
         for fn in listeners:
             try:
                 fn(*args, **kw)
             except Exception as e:
-                print(f"[Emitter] '{event}' listener error: {e}")
\ No newline at end of file
+                print(f"[Emitter] '{event}' listener error: {e}")
+
+    def _worker(self, state: _AsyncEvent, lane: _Lane):
+        while True:
+            with lane.cond:
+                while not lane.items:
+                    lane.cond.wait()
+                queued_at, args, kw = lane.items.popleft()
+                lane.cond.notify_all()   # BLOCK 정책으로 기다리는 emit 깨우기
+
+            started = time.perf_counter()
+            with self._lock:
+                listeners = list(self._ls.get(state.name, []))
+            failed = 0
+            for fn in listeners:
+                try:
+                    fn(*args, **kw)
+                except Exception as e:
+                    failed += 1
+                    print(f"[Emitter] '{state.name}' listener error: {e}")
+            finished = time.perf_counter()
+
+            with state.lock:
+                state.handled += 1
+                state.errors += failed
+                state.wait_ms.append((started - queued_at) * 1000)
+                state.handler_ms.append((finished - started) * 1000)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """비동기 이벤트별 큐 깊이 / 처리 수 / 대기·핸들러 지연 (ms, 최근 256건 기준)"""
+        out = {}
+        for name, state in list(self._async.items()):
+            with state.lock:
+                out[name] = {
+                    "policy": state.policy,
+                    "workers": len(state.lanes),
+                    "depth": state.depth(),
+                    "max_depth": state.max_depth,
+                    "emitted": state.emitted,
+                    "handled": state.handled,
+                    "dropped": state.dropped,
+                    "rejected": state.rejected,
+                    "errors": state.errors,
+                    "wait_ms_p50": _percentile(state.wait_ms, 0.5),
+                    "wait_ms_p95": _percentile(state.wait_ms, 0.95),
+                    "handler_ms_p50": _percentile(state.handler_ms, 0.5),
+                    "handler_ms_p95": _percentile(state.handler_ms, 0.95),
+                    "handler_ms_max": round(max(state.handler_ms), 2) if state.handler_ms else None,
+                }
+        return out
@@ -0,0 +1,99 @@
+# framing.py
+# Supervisor ↔ Coder 공통 length-prefix 프레이밍 (4byte big-endian 길이 + payload)
+# coder/utils/framing.py 와 동일한 내용을 유지해야 함
+import socket
+import struct
+
+HEADER = struct.Struct("!I")
+DEFAULT_MAX_FRAME = 256 * 1024 * 1024   # 256MB
+_SMALL_FRAME = 64 * 1024                # 이하면 header+payload를 한 번에 전송
+
+
+class FrameError(Exception):
+    """잘못된 프레임 (최대 크기 초과 등)"""
+
+
+def _recv_exact_into(sock: socket.socket, view: memoryview) -> bool:
+    """view 길이만큼 정확히 수신. 연결이 끊기면 False"""
+    got = 0
+    total = len(view)
+    while got < total:
+        n = sock.recv_into(view[got:], total - got)
+        if n == 0:
+            return False
+        got += n
+    return True
+
+
+class FrameReader:
+    """
+    소켓에서 프레임 단위로 읽기.
+    - 미리 할당한 bytearray 수신 버퍼에 recv_into → 작은 프레임 여러 개를 syscall 한 번으로 처리
+    - 프레임 payload는 정확한 크기의 bytearray를 한 번만 할당하고, 버퍼에 없는 나머지는 recv_into로 직접 채움
+    (bytes 이어붙이기/재슬라이싱 없음 → payload 크기에 선형)
+    """
+
+    def __init__(self, sock: socket.socket, max_frame: int = DEFAULT_MAX_FRAME, bufsize: int = 256 * 1024):
+        self.sock = sock
+        self.max_frame = max_frame
+        self._buf = bytearray(bufsize)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+
+    def _fill(self) -> bool:
+        """수신 버퍼에 데이터 추가. 연결이 끊기면 False"""
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._end == len(self._buf):
+            # 남은 데이터를 앞으로 당김 (header 크기 미만이라 비용 미미)
+            pending = self._end - self._start
+            self._buf[:pending] = self._view[self._start:self._end]
+            self._start, self._end = 0, pending
+        n = self.sock.recv_into(self._view[self._end:])
+        if n == 0:
+            return False
+        self._end += n
+        return True
+
+    def read_frame(self) -> bytearray | None:
+        """다음 프레임 payload 반환. 연결 종료 시 None"""
+        while self._end - self._start < HEADER.size:
+            if not self._fill():
+                return None
+        (length,) = HEADER.unpack_from(self._buf, self._start)
+        if length > self.max_frame:
+            raise FrameError(f"frame too large: {length} > {self.max_frame}")
+        self._start += HEADER.size
+
+        payload = bytearray(length)
+        avail = min(self._end - self._start, length)
+        if avail:
+            payload[:avail] = self._view[self._start:self._start + avail]
+            self._start += avail
+        if avail < length and not _recv_exact_into(self.sock, memoryview(payload)[avail:]):
+            return None
+        return payload
+
+    def __iter__(self):
+        while True:
+            frame = self.read_frame()
+            if frame is None:
+                return
+            yield frame
+
+
+def pack_header(length: int, max_frame: int = DEFAULT_MAX_FRAME) -> bytes:
+    if length > max_frame:
+        raise FrameError(f"frame too large: {length} > {max_frame}")
+    return HEADER.pack(length)
+
+
+def send_frame(sock: socket.socket, payload: bytes | bytearray | memoryview, max_frame: int = DEFAULT_MAX_FRAME) -> None:
+    """length prefix + payload 전송 (큰 payload는 복사 없이 그대로 sendall)"""
+    header = pack_header(len(payload), max_frame)
+    if len(payload) <= _SMALL_FRAME:
+        sock.sendall(header + bytes(payload))
+    else:
+        sock.sendall(header)
+        sock.sendall(payload)
@@ -1,8 +1,8 @@
 import socket
-import json
 import threading 
 from .event_emitter import EventEmitter
-import struct
+from .framing import FrameReader
+from .coder_pool import CoderConnection, CoderPool, mark_reader_thread
 
 GREEN = "\033[92m"
 YELLOW = "\033[93m"
@@ -11,14 +11,13 @@ BLUE = "\033[94m"
 RESET = "\033[0m"
 
 class SupervisorServer:
-    def __init__(self, host="0.0.0.0", port=9001):
+    def __init__(self, host="0.0.0.0", port=9001, max_inflight_per_coder: int | None = None):
         self.host = host
         self.port = port
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.conn=None
-        self.addr=None
         self.emitter = EventEmitter()
+        self.pool = CoderPool(max_inflight=max_inflight_per_coder)
 
     def start(self):
         """서버 시작"""
@@ -27,59 +26,78 @@ class SupervisorServer:
         print(f"{RED}[Supervisor] Listening on {self.host}:{self.port}{RESET}")
 
         while True:
-            self.conn, self.addr = self.server_socket.accept()
+            sock, addr = self.server_socket.accept()
+            conn = CoderConnection(sock, addr)
             threading.Thread(
                 target=self.handle_client,
+                args=(conn,),
                 daemon=True
             ).start()
 
-    def handle_client(self):
-        """클라이언트 연결 처리"""
-        print(f"{RED}[Supervisor] Connected by {self.addr}{RESET}")
-        buffer = b""
-        expected_len = None
+    def handle_client(self, conn: CoderConnection):
+        """클라이언트 연결 처리 (연결마다 자기 소켓만 읽음)"""
+        print(f"{RED}[Supervisor] Connected by {conn.addr}{RESET}")
+        mark_reader_thread()
+        reader = FrameReader(conn.sock)
+        codec = conn.codec
+        self.pool.add(conn)
 
         try:
-            while True:
-                chunk = self.conn.recv(4096)
-                if not chunk:
-                    break
-                buffer += chunk
-
-                # 메시지 처리 루프
-                while True:
-                    if expected_len is None:
-                        if len(buffer) >= 4:
-                            expected_len = struct.unpack("!I", buffer[:4])[0]
-                            buffer = buffer[4:]
-                        else:
-                            break
-
-                    if expected_len is not None and len(buffer) >= expected_len:
-                        msg = buffer[:expected_len]
-                        buffer = buffer[expected_len:]
-                        expected_len = None
-
-                        try:
-                            task_data = json.loads(msg.decode("utf-8"))
-                            self.emitter.emit("coder_message", task_data)
-                        except json.JSONDecodeError:
-                            print("[Supervisor] Invalid JSON received:", msg.decode())
-                    else:
-                        break
+            for msg in reader:
+                try:
+                    task_data = codec.decode(msg)
+                except ValueError:
+                    print("[Supervisor] Invalid frame received:", bytes(msg[:200]))
+                    continue
+                if codec.is_hello(task_data):
+                    conn.accept_hello(task_data)
+                    self.pool.register(conn, task_data.get("coder_id"), task_data.get("capabilities"))
+                    print(f"[Supervisor] coder 등록: {conn.coder_id} (codec {codec.codec}/{codec.compression})")
+                    continue
+                if isinstance(task_data, dict):
+                    task = self.pool.complete(task_data, conn)
+                    if not self.pool.should_dispatch(task):
+                        continue   # 응답을 future로 기다리는 task (또는 취소된 task)
+                    task_data.setdefault("coder_id", conn.coder_id)
+                self.dispatch(task_data)
 
         except Exception as e:
             print(f"[Supervisor] Error: {e}")
+        finally:
+            self.pool.remove(conn)
+            conn.close()
+        print(f"{YELLOW}[Supervisor] Disconnected {conn.coder_id}, wire stats: {codec.stats.snapshot()}{RESET}")
+
+    def dispatch(self, msg) -> None:
+        """coder_message 처리 요청 (emitter의 coder_message 큐/worker로)"""
+        self.emitter.emit("coder_message", msg)
+
+    def wire_stats(self) -> dict:
+        return {c.coder_id: c.codec.stats.snapshot() for c in self.pool.coders()}
 
-    def send_supervisor_response(self, response):
-        """supervisor 처리 결과 전송"""
+    def send_supervisor_response(
+        self,
+        response,
+        coder_id: str | None = None,
+        timeout: float | None = None,
+        dispatch: bool = True,
+    ):
+        """
+        supervisor 처리 결과 전송.
+        dict task는 CoderPool이 coder를 골라 보냄 (연결된 coder가 없으면 대기열) → 응답 TaskFuture 반환
+        dispatch=False → 응답을 coder_message 이벤트로 흘리지 않고 future로만 받음
+        """
         try:
-            if isinstance(response, (dict, str)):
-                response = json.dumps(response).encode("utf-8")
-            length_prefix = struct.pack("!I", len(response))
-            self.conn.sendall(length_prefix + response)
+            if isinstance(response, dict):
+                return self.pool.submit(dict(response), coder_id=coder_id, timeout=timeout, dispatch=dispatch)
+            conn = self.pool.get(coder_id) if coder_id else min(self.pool.coders(), key=lambda c: c.load, default=None)
+            if conn is None:
+                print("[Supervisor] 응답 전송 오류: 연결된 coder 없음")
+                return None
+            conn.send(response)
         except Exception as e:
             print(f"[Supervisor] 응답 전송 오류: {e}")
+        return None
 
     def run_main(self):
         """메인 스레드 실행"""
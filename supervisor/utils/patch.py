@@ -0,0 +1,140 @@
+# utils/patch.py
+import importlib.util
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# 매칭/적용 구현은 coder/utils/patching.py 하나만 씀 (supervisor는 보내기 전에 같은 코드로 dry-run 검증)
+# coder 쪽 utils 패키지와 이름이 겹치므로 파일 경로로 별도 모듈로 로드
+_PATCHING = Path(__file__).resolve().parents[2] / "coder" / "utils" / "patching.py"
+_spec = importlib.util.spec_from_file_location("coder_patching", _PATCHING)
+_patching = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_patching)
+
+PatchError = _patching.PatchError
+apply_hunks = _patching.apply_hunks
+locate = _patching.locate
+_strip_blank_edges = _patching._strip_blank_edges
+
+
+# ---------- LLM 출력 파싱 ----------
+_SEARCH = re.compile(r"^<{5,}\s*SEARCH\s*$")
+_DIVIDER = re.compile(r"^={5,}\s*$")
+_REPLACE = re.compile(r"^>{5,}\s*REPLACE\s*$")
+_HUNK = re.compile(r"^@@.*@@")
+
+
+def _resolve(name: str, paths: Dict[str, str]) -> str:
+    """
+    LLM이 쓴 파일명(### src/train.py, +++ b/src/train.py) → read_py_files 의 전체 path
+    paths: {repo 기준 상대 경로(prompt의 header): 전체 path}
+    상대 경로가 정확히 같으면 그 파일, 아니면 경로 끝이 맞는 파일이 하나뿐일 때만.
+    같은 이름의 파일이 여러 개면(a/utils.py, b/utils.py) 추측하지 않고 그대로 반환 → validate 에서 실패
+    """
+    name = name.strip().strip("`").strip()
+    for prefix in ("a/", "b/"):
+        if name.startswith(prefix) and name not in paths:
+            name = name[2:]
+    if name in paths:
+        return paths[name]
+    if name in paths.values():
+        return name
+    hits = [p for rel, p in paths.items() if rel.endswith("/" + name) or name.endswith("/" + rel)]
+    if len(hits) == 1:
+        return hits[0]
+    if hits:
+        print(f"[patch] ambiguous file name {name!r}: {sorted(hits)}")
+    return name
+
+
+def parse_patches(raw: str, paths: Dict[str, str]) -> Dict[str, List[Dict[str, str]]]:
+    """
+    LLM 출력 → {path: [{"search", "replace"}]}. paths: {상대 경로(header): 전체 path}
+    지원 형식
+      1) "### file.py" 뒤의 <<<<<<< SEARCH / ======= / >>>>>>> REPLACE 블록
+      2) unified diff (--- a/file.py, +++ b/file.py, @@ ... @@). 줄 번호는 무시하고 context로 위치를 찾음
+         context/"-" 줄 없이 "+" 줄만 있는 hunk 는 "context": False 로 표시 → validate 에서 실패 (전체 재작성 fallback)
+    """
+    out: Dict[str, List[Dict[str, str]]] = {}
+    current = None
+    state, search, replace = None, [], []        # state: None | "search" | "replace" | "diff"
+
+    def flush_diff():
+        if current and (search or replace):
+            hunk = {"search": "\n".join(search), "replace": "\n".join(replace)}
+            if not _strip_blank_edges(search):
+                hunk["context"] = False   # 빈 search 는 append 로 처리되므로 diff 에서는 거부
+            out.setdefault(current, []).append(hunk)
+
+    for line in raw.splitlines():
+        if line.strip().startswith("```"):
+            continue
+        if state == "search":
+            if _DIVIDER.match(line):
+                state = "replace"
+            else:
+                search.append(line)
+            continue
+        if state == "replace":
+            if _REPLACE.match(line):
+                if current:
+                    out.setdefault(current, []).append({"search": "\n".join(search), "replace": "\n".join(replace)})
+                state, search, replace = None, [], []
+            else:
+                replace.append(line)
+            continue
+
+        if line.startswith("### "):
+            if state == "diff":
+                flush_diff()
+            current, state, search, replace = _resolve(line[4:], paths), None, [], []
+        elif _SEARCH.match(line):
+            if state == "diff":
+                flush_diff()
+            state, search, replace = "search", [], []
+        elif line.startswith("+++ "):
+            current = _resolve(line[4:].split("\t")[0], paths)
+        elif line.startswith("--- "):
+            if state == "diff":
+                flush_diff()
+            state, search, replace = None, [], []
+        elif _HUNK.match(line):
+            if state == "diff":
+                flush_diff()
+            state, search, replace = "diff", [], []
+        elif state == "diff":
+            if line.startswith("-"):
+                search.append(line[1:])
+            elif line.startswith("+"):
+                replace.append(line[1:])
+            elif line.startswith(" ") or line == "":
+                search.append(line[1:]); replace.append(line[1:])
+            elif line.startswith("\\"):            # \ No newline at end of file
+                continue
+            else:
+                flush_diff()
+                state, search, replace = None, [], []
+    if state == "diff":
+        flush_diff()
+    return out
+
+
+def validate(patches: Dict[str, List[Dict[str, str]]], contents: Dict[str, str]) -> Tuple[Dict[str, List[Dict[str, str]]], Dict[str, str]]:
+    """
+    supervisor가 가진 원본(read_py_files)에 dry-run 적용.
+    return: (적용 가능한 patches, {path: 실패 이유})
+    """
+    ok: Dict[str, List[Dict[str, str]]] = {}
+    failed: Dict[str, str] = {}
+    for path, hunks in patches.items():
+        if path not in contents:
+            failed[path] = "unknown or ambiguous file"
+            continue
+        try:
+            new, _ = apply_hunks(contents[path], hunks)
+        except PatchError as e:
+            failed[path] = str(e)
+            continue
+        if new != contents[path]:
+            ok[path] = hunks
+    return ok, failed
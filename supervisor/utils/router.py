@@ -1,28 +1,51 @@
 import re
 
+# 모델 준비 전 fallback 규칙 (순서대로 검사)
+_RULES = [
+    ("git", re.compile(r"https?://(www\.)?(github|gitlab)\.com/|git clone", re.I)),
+    ("train", re.compile(r"\b(train|training|fine-?tune|epoch)\b|학습|훈련", re.I)),
+    ("code", re.compile(r"\b(code|function|class|bug|error|refactor|implement)\b|코드|함수|구현|에러|버그", re.I)),
+]
+
 
 class CommandRouter:
-    def __init__(self, llm, sysprompts: dict):
+    LABELS = ["git", "code", "train", "conversation"]
+
+    def __init__(self, llm, sysprompts: dict, min_confidence: float = 0.0):
         self.llm = llm
         self.sysprompts = sysprompts
+        self.min_confidence = min_confidence   # 이보다 낮으면 conversation으로 처리
+        self.last_scores: dict[str, float] = {}
 
     def get_command(self, user_text: str) -> tuple[str, bool]:
         """
         사용자 입력, router_prompt로 작업 분류
         return (command, persistent flag)
         """
+        if not getattr(self.llm, "is_ready", True):
+            cand = self.rule_based(user_text)
+            self.last_scores = {cand: 1.0}
+            print(f"[Router] {cand} (rule-based, model {self.llm.state})")
+            return cand, cand in ["conversation"]
+
         system_prompt = self.sysprompts["classifier"]
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_text},            
         ]
-        raw = self.llm.generate(messages, max_new_tokens=8)
-        norm = re.sub(r"[^a-z]", "", raw.lower())
+        cand, scores = self.llm.classify(messages, self.LABELS)
+        self.last_scores = scores
+        print(f"[Router] {cand} ({scores[cand]:.2f})")
 
-        for cand in ["git", "code", "train", "conversation"]:
-            if cand in norm:
+        if scores[cand] < self.min_confidence:
+            return "conversation", True
+        persistent = cand in ["conversation"]
+        return cand, persistent
 
-                persistent = cand in ["conversation"]
-                return cand, persistent
-        return "conversation", True
-    
+    @staticmethod
+    def rule_based(user_text: str) -> str:
+        """모델 없이 키워드로 분류 (모델 로딩 중 fallback)"""
+        for label, pattern in _RULES:
+            if pattern.search(user_text):
+                return label
+        return "conversation"
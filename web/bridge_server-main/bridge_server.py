@@ -38,6 +38,25 @@ async def broadcast(msg: Dict[str, Any]):
             clients.remove(d)
 
 
+STREAM_TYPES = {"stream", "stream_end"}
+PASSTHROUGH_TYPES = STREAM_TYPES | {"status"}
+
+
+def _passthrough_frame(data: str) -> Dict[str, Any] | None:
+    """그대로 전달할 프레임 ({"type": "stream" | "stream_end", "id", ...} / {"type": "status", ...}) 이면 dict"""
+    if not data.startswith("{"):
+        return None
+    try:
+        msg = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(msg, dict) or msg.get("type") not in PASSTHROUGH_TYPES:
+        return None
+    if msg["type"] in STREAM_TYPES and "id" not in msg:
+        return None
+    return msg
+
+
 @app.websocket("/ws/supervisor")
 async def ws_supervisor(ws: WebSocket):
     """Supervisor → FastAPI 연결"""
@@ -48,6 +67,11 @@ async def ws_supervisor(ws: WebSocket):
     try:
         while True:
             data = await ws.receive_text()
+            # 토큰 스트림 프레임은 그대로 전달 (React가 id별로 이어붙임)
+            frame = _passthrough_frame(data)
+            if frame is not None:
+                await broadcast(frame)
+                continue
             # Supervisor가 보낸 메시지를 React로 브로드캐스트
             await broadcast({"type": "supervisor", "text": data})
     except WebSocketDisconnect:
@@ -12,6 +12,7 @@ export default function App() {
   const [messages, setMessages] = useState<Msg[]>([]);
   const [input, setInput] = useState("");
   const [connected, setConnected] = useState(false);
+  const [llmState, setLlmState] = useState<string>("unknown");
   const wsRef = useRef<WebSocket | null>(null);
 
   const bottomRef = useRef<HTMLDivElement | null>(null);
@@ -34,6 +35,22 @@ export default function App() {
     ws.onmessage = (ev) => {
       try {
         const msg: Msg = JSON.parse(ev.data);
+        if (msg.type === "status") {
+          setLlmState(msg.llm ?? "unknown");
+          return;
+        }
+        if (msg.type === "stream_end") return;
+        if (msg.type === "stream") {
+          // 같은 id의 delta는 하나의 말풍선에 이어붙임
+          setMessages((prev) => {
+            const i = prev.findIndex((m) => m.type === "supervisor" && m.streamId === msg.id);
+            if (i < 0) return [...prev, { type: "supervisor", streamId: msg.id, text: msg.delta ?? "" }];
+            const next = prev.slice();
+            next[i] = { ...next[i], text: (next[i].text ?? "") + (msg.delta ?? "") };
+            return next;
+          });
+          return;
+        }
         setMessages((prev) => [...prev, msg]);
       } catch {
         // ignore
@@ -72,6 +89,13 @@ export default function App() {
           >
             {connected ? "🟢 WS Connected" : "🔴 WS Disconnected"}
           </span>
+          <span
+            className={`px-3 py-1 rounded-full text-sm font-medium ${
+              llmState === "ready" ? "bg-green-100 text-green-700" : "bg-yellow-100 text-yellow-700"
+            }`}
+          >
+            LLM: {llmState}
+          </span>
         </div>
 
         {/* 본문 */}